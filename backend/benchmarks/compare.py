@@ -0,0 +1,58 @@
+"""Compare two benchmark result files; exits non-zero when something got slower than the threshold.
+
+    python -m benchmarks.compare results/old.json results/new.json [--threshold 0.1]
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+# Metric compared per suite and whether a larger value is better
+SUITE_METRICS = {
+    "service": [("median_s", False)],
+    "api": [("throughput_rps", True), ("p99_ms", False)]
+}
+
+
+def load(path: str) -> Tuple[Dict, Dict]:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return report["meta"], {(r["suite"], r["size"], r["name"]): r for r in report["results"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two CineIntel benchmark runs")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change reported as a regression")
+    args = parser.parse_args()
+
+    base_meta, baseline = load(args.baseline)
+    new_meta, candidate = load(args.candidate)
+    print(f"baseline  {base_meta.get('commit') or '?'}{' (dirty)' if base_meta.get('dirty') else ''}")
+    print(f"candidate {new_meta.get('commit') or '?'}{' (dirty)' if new_meta.get('dirty') else ''}")
+
+    regressions = 0
+    for key in sorted(baseline.keys() & candidate.keys(), key=lambda k: (k[0], k[1], k[2])):
+        suite, size, name = key
+        for metric, higher_is_better in SUITE_METRICS.get(suite, []):
+            old, new = baseline[key][metric], candidate[key][metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > args.threshold:
+                flag = "❌ slower"
+                regressions += 1
+            elif worse < -args.threshold:
+                flag = "✅ faster"
+            print(f"{suite:<8}{size:>9}  {name:<58} {metric:<15} {old:12.4f} -> {new:12.4f} {change:+8.1%} {flag}")
+
+    for key in sorted(baseline.keys() ^ candidate.keys()):
+        print(f"⚠️ Only in {'baseline' if key in baseline else 'candidate'}: {' '.join(map(str, key))}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Benchmark the backend on synthetic catalogs and write the results as JSON (run from backend/).
+
+    python -m benchmarks.run --sizes 5k,100k [--suites service,api] [--output results.json]
+    python -m benchmarks.compare old.json new.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from benchmarks.synthetic import write_catalog
+from services.data_service import DataService
+from services.ml_service import MLService, sweep_values
+from services.model_store import ModelStore
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = Path(__file__).resolve().parent / ".data"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Steady-state requests per endpoint; responses of cached endpoints are served from the response cache
+API_ENDPOINTS = [
+    ("GET", "/api/dashboard/summary", None),
+    ("GET", "/api/dashboard/bootstrap", None),
+    ("GET", "/api/genre/revenue", None),
+    ("GET", "/api/combinations?mode=pairs", None),
+    ("GET", "/api/risk/genre", None),
+    ("GET", "/api/movies/explore?page=3&search=dil&sort_by=title", None),
+    ("POST", "/api/predict", {"genre": "Action", "budget": 50000000, "year": 2024, "imdb_rating": 7.0, "runtime": 140}),
+    ("POST", "/api/predict/simulator", {"genre": "Drama", "budget": 30000000, "runtime": 130, "release_month": 11}),
+]
+
+
+def parse_size(value: str) -> int:
+    """'5k' / '100k' / '1m' / '2500' -> number of movies"""
+    value = value.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    return int(float(value.rstrip("km")) * multiplier)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Keep the services' startup output out of the benchmark report"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def measure(fn: Callable, repeat: int, warmup: int = 1) -> Dict:
+    """Wall-clock statistics of repeated calls; the first (cold) call is reported separately"""
+    first = None
+    for _ in range(warmup):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        first = elapsed if first is None else first
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    samples = np.array(times)
+    return {
+        "runs": repeat,
+        "first_s": first,
+        "min_s": float(samples.min()),
+        "median_s": float(np.median(samples)),
+        "mean_s": float(samples.mean()),
+        "p95_s": float(np.percentile(samples, 95)),
+        "max_s": float(samples.max())
+    }
+
+
+def service_cases(data_dir: Path, store_dir: Path, repeat: int) -> List[Dict]:
+    """Time the DataService/MLService methods in-process"""
+    heavy = max(1, min(repeat, 3))
+    results = []
+
+    def record(name: str, fn: Callable, runs: int = repeat, warmup: int = 1):
+        with quiet():
+            stats = measure(fn, runs, warmup)
+        print(f"  {name:<40} median {stats['median_s'] * 1000:10.2f} ms")
+        results.append({"name": name, **stats})
+
+    record("load_data[csv]", lambda: DataService(str(data_dir), use_snapshot=False), heavy, warmup=0)
+    # The first snapshot load compiles it; the timed ones memory-map it
+    record("load_data[snapshot]", lambda: DataService(str(data_dir)), heavy)
+
+    with quiet():
+        data_service = DataService(str(data_dir), use_snapshot=False)
+        ml_service = MLService(data_service, ModelStore(str(store_dir)))
+    record("train_model", ml_service.train_model, heavy, warmup=0)
+
+    record("predict", lambda: ml_service.predict("Action", 50_000_000, 2024, 7.0, 140))
+    record("predict_simulator", lambda: ml_service.predict_simulator("Drama", 30_000_000, 130, 11))
+    plans = [{"genre": "Action", "budget": 10_000_000 * (1 + i % 20), "year": 2000 + i % 25, "imdb_rating": 6.5,
+              "runtime": 120 + i % 40} for i in range(500)]
+    record("predict_batch[500]", lambda: ml_service.predict_batch(plans))
+    record("predict_simulator_sweep[12x10x12]", lambda: ml_service.predict_simulator_sweep(
+        "Drama", 30_000_000, 130, 11, sweep_values(1e6, 3e8, 12, log=True),
+        sweep_values(90, 180, 10, integer=True), list(range(1, 13))
+    ))
+    record("get_filtered_movies[default]", lambda: data_service.get_filtered_movies())
+    record("get_filtered_movies[search+genre]",
+           lambda: data_service.get_filtered_movies(page=2, search="dil", genre="Drama", sort_by="year"))
+    record("get_filtered_movies[sort_title]",
+           lambda: data_service.get_filtered_movies(page=50, sort_by="title", sort_order="asc"))
+    # Combination tables are built on first use; first_s is the cold build
+    record("get_genre_combinations[exact]", lambda: data_service.get_genre_combinations())
+    record("get_genre_combinations[pairs]", lambda: data_service.get_genre_combinations(mode="pairs"))
+    record("get_risk_analysis", data_service.get_risk_analysis)
+    return results
+
+
+async def drive(client, method: str, path: str, body, requests: int, concurrency: int) -> Dict:
+    """Send requests over concurrent connections and summarize throughput and latency"""
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    samples = np.array(latencies) * 1000
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": requests / wall,
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "p99_ms": float(np.percentile(samples, 99)),
+        "max_ms": float(samples.max())
+    }
+
+
+def api_cases(data_dir: Path, store_dir: Path, requests: int, concurrency: int) -> List[Dict]:
+    """Drive the FastAPI app end to end through an in-process ASGI client"""
+    import httpx
+    import main
+
+    with quiet():
+        data_service = DataService(str(data_dir))
+        main.install_services(data_service, MLService(data_service, ModelStore(str(store_dir))))
+
+    async def run_all() -> List[Dict]:
+        results = []
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            for method, path, body in API_ENDPOINTS:
+                # Warm caches and lazily built tables before measuring
+                await drive(client, method, path, body, concurrency, concurrency)
+                stats = await drive(client, method, path, body, requests, concurrency)
+                print(f"  {method:<4} {path:<58} {stats['throughput_rps']:9.1f} req/s  "
+                      f"p99 {stats['p99_ms']:8.2f} ms  errors {stats['errors']}")
+                results.append({"name": f"{method} {path}", **stats})
+        return results
+
+    return asyncio.run(run_all())
+
+
+def environment() -> Dict:
+    """Commit and library versions the results were measured on"""
+    def git(*args) -> str:
+        try:
+            return subprocess.run(["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+    return {
+        "commit": git("rev-parse", "HEAD") or None,
+        "dirty": bool(git("status", "--porcelain", "--", ".")),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CineIntel backend on synthetic catalogs")
+    parser.add_argument("--sizes", default="5k,100k", help="catalog sizes, e.g. 5k,100k,1m")
+    parser.add_argument("--suites", default="service,api", help="service and/or api")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per service method")
+    parser.add_argument("--requests", type=int, default=500, help="requests per API endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", default=None, help="results file (default: results/<time>-<commit>.json)")
+    args = parser.parse_args()
+    suites = {s.strip() for s in args.suites.split(",")}
+
+    meta = environment()
+    report = {"meta": {**meta, "started_at": time.time(), "seed": args.seed, "repeat": args.repeat,
+                       "requests": args.requests, "concurrency": args.concurrency}, "results": []}
+
+    with tempfile.TemporaryDirectory(prefix="cineintel-bench-models-") as store_dir:
+        for size in (parse_size(s) for s in args.sizes.split(",")):
+            print(f"🚀 Catalog of {size} movies")
+            data_dir = write_catalog(DATA_DIR / f"{size}-{args.seed}", size, args.seed)
+            if "service" in suites:
+                for result in service_cases(data_dir, Path(store_dir), args.repeat):
+                    report["results"].append({"suite": "service", "size": size, **result})
+            if "api" in suites:
+                for result in api_cases(data_dir, Path(store_dir), args.requests, args.concurrency):
+                    report["results"].append({"suite": "api", "size": size, **result})
+
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"{time.strftime('%Y%m%d-%H%M%S')}-{(meta['commit'] or 'nogit')[:10]}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"✅ Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import json
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from services.data_service import clean_movies, success_labels
+from services.genre_stats import GenreStatsEngine
+from services.ingest import MASTER_COLUMNS, POSTER_BASE_URL
+
+
+# Genres of the real catalog with roughly their share of movies
+GENRE_WEIGHTS = {
+    'Drama': 30, 'Romance': 12, 'Comedy': 12, 'Action': 10, 'Thriller': 6, 'Crime': 5, 'Family': 4,
+    'Music': 3, 'Fantasy': 2, 'Horror': 2, 'Adventure': 2, 'Mystery': 2, 'History': 2, 'Documentary': 2,
+    'War': 1, 'Animation': 1, 'Science Fiction': 1, 'TV Movie': 1, 'Western': 1
+}
+
+TITLE_WORDS = [
+    'dil', 'pyaar', 'ishq', 'raja', 'rani', 'zindagi', 'kahani', 'safar', 'dost', 'dushman', 'mera', 'tera',
+    'naya', 'ghar', 'sapna', 'raat', 'din', 'aag', 'toofan', 'khel', 'jung', 'sher', 'badshah', 'kismat',
+    'mohabbat', 'sitara', 'chand', 'suraj', 'gali', 'shehar', 'bandhan', 'vaada', 'insaaf', 'izzat'
+]
+
+COMPANIES = [
+    'Yash Raj Films', 'Dharma Productions', 'T-Series', 'Excel Entertainment', 'Red Chillies Entertainment',
+    'Eros International', 'Balaji Motion Pictures', 'Rajshri Productions', 'Nadiadwala Grandson', 'Viacom18'
+]
+
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September',
+          'October', 'November', 'December']
+
+CATALOG_FILE = "catalog.json"
+
+
+def generate_catalog(size: int, seed: int = 0, budget_share: float = 0.1) -> pd.DataFrame:
+    """Synthetic movies with the schema and missing-value pattern of master_movies_dataset.csv"""
+    rng = np.random.default_rng(seed)
+    genres = np.array(list(GENRE_WEIGHTS))
+    weights = np.array(list(GENRE_WEIGHTS.values()), dtype=np.float64)
+    weights /= weights.sum()
+
+    # More releases in recent years, as in the real catalog
+    years = np.arange(1950, 2026)
+    year = rng.choice(years, size=size, p=np.linspace(1, 4, len(years)) / np.linspace(1, 4, len(years)).sum())
+    month = rng.integers(1, 13, size=size)
+
+    # One to three distinct genres per movie
+    picks = np.argsort(rng.random((size, len(genres))) / weights, axis=1)[:, :3]
+    n_genres = rng.choice([1, 2, 3], size=size, p=[0.45, 0.35, 0.2])
+    genre_lists = [genres[row[:k]] for row, k in zip(picks, n_genres)]
+    genres_column = pd.Series([', '.join(g) for g in genre_lists], dtype=object)
+    genres_column[rng.random(size) < 0.17] = np.nan
+
+    has_budget = rng.random(size) < budget_share
+    budget = np.where(has_budget, np.round(rng.lognormal(17.3, 1.1, size), -4), 0.0)
+    box_office = np.where(has_budget, np.round(budget * rng.lognormal(-0.1, 1.0, size)), 0.0)
+    roi = pd.Series(np.where(has_budget, box_office / np.where(has_budget, budget, 1), np.nan))
+
+    # The IMDb-enriched columns are filled for a small subset only
+    enriched = rng.random(size) < 0.007
+    day = rng.integers(1, 29, size=size)
+    release_date = pd.Series(
+        [f"{d} {MONTHS[m - 1]} {y} (India)" for d, m, y in zip(day, month, year)], dtype=object
+    ).where(enriched)
+    sparse_genre = pd.Series(['|'.join(g) for g in genre_lists], dtype=object).where(enriched)
+
+    first_word = rng.choice(TITLE_WORDS, size=size)
+    second_word = rng.choice(TITLE_WORDS, size=size)
+    title = pd.Series(first_word, dtype=object) + ' ' + pd.Series(second_word, dtype=object)
+    sequel = rng.random(size) < 0.2
+    title[sequel] = title[sequel] + ' ' + rng.integers(2, 5, size=int(sequel.sum())).astype(str)
+
+    movies = pd.DataFrame({
+        'title': title,
+        'year': year,
+        'genres': genres_column,
+        'budget': budget,
+        'box_office': box_office,
+        'vote_count': np.where(rng.random(size) < 0.007, np.nan, np.floor(rng.lognormal(2.0, 1.5, size))),
+        'runtime': np.where(rng.random(size) < 0.1, 0, rng.normal(135, 20, size).clip(60, 240).astype(np.int64)),
+        'production_companies': pd.Series(rng.choice(COMPANIES, size=size), dtype=object).where(rng.random(size) < 0.5),
+        'release_month': np.where(rng.random(size) < 0.007, np.nan, month.astype(np.float64)),
+        'poster_url': pd.Series(
+            [f"{POSTER_BASE_URL}/{value:012x}.jpg" for value in rng.integers(0, 1 << 48, size=size)], dtype=object
+        ).where(rng.random(size) >= 0.08),
+        'original_language': 'hi',
+        'roi': roi,
+        'success_label': success_labels(roi),
+        'genre': sparse_genre,
+        'imdb_rating': np.where(enriched, np.round(rng.uniform(3, 9, size), 1), np.nan),
+        'imdb_votes': np.where(enriched, np.floor(rng.lognormal(8, 1.5, size)), np.nan),
+        'release_date': release_date,
+        'language': pd.Series('hi', index=range(size), dtype=object).where(enriched)
+    })
+    return movies[MASTER_COLUMNS]
+
+
+def write_catalog(directory: Path, size: int, seed: int = 0, budget_share: float = 0.1) -> Path:
+    """Write a synthetic dataset directory (movies plus both statistics files), reusing an identical one"""
+    directory = Path(directory)
+    params: Dict = {"size": size, "seed": seed, "budget_share": budget_share}
+    marker = directory / CATALOG_FILE
+    if marker.exists() and json.loads(marker.read_text()) == params:
+        return directory
+
+    directory.mkdir(parents=True, exist_ok=True)
+    movies = generate_catalog(size, seed, budget_share)
+    movies.to_csv(directory / "master_movies_dataset.csv", index=False)
+
+    # Statistics files as the offline pipeline would produce them for this catalog
+    stats = GenreStatsEngine.from_movies(clean_movies(movies.copy()))
+    stats.yearly_frame().to_csv(directory / "genre_year_statistics.csv", index=False)
+    stats.overall_frame().to_csv(directory / "genre_overall_statistics.csv", index=False)
+    marker.write_text(json.dumps(params))
+    return directory
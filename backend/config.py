@@ -0,0 +1,60 @@
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment"""
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+# Response cache for the static analytics endpoints
+RESPONSE_CACHE_MAX_ENTRIES = _env_int("CINEINTEL_CACHE_MAX_ENTRIES", 512)
+RESPONSE_CACHE_TTL_SECONDS = _env_float("CINEINTEL_CACHE_TTL_SECONDS", 3600.0)
+
+# HTTP caching of analytics responses: max-age (0 = always revalidate with the ETag) and compression
+HTTP_MAX_AGE_SECONDS = _env_int("CINEINTEL_HTTP_MAX_AGE_SECONDS", 0)
+COMPRESS_MIN_BYTES = _env_int("CINEINTEL_COMPRESS_MIN_BYTES", 1024)
+GZIP_LEVEL = _env_int("CINEINTEL_GZIP_LEVEL", 9)
+BROTLI_QUALITY = _env_int("CINEINTEL_BROTLI_QUALITY", 9)
+
+# Worker pools for CPU-bound service calls. Requests beyond workers + queue are shed with 503.
+DATA_POOL_WORKERS = _env_int("CINEINTEL_DATA_POOL_WORKERS", 4)
+DATA_POOL_QUEUE = _env_int("CINEINTEL_DATA_POOL_QUEUE", 64)
+ML_POOL_WORKERS = _env_int("CINEINTEL_ML_POOL_WORKERS", 2)
+ML_POOL_QUEUE = _env_int("CINEINTEL_ML_POOL_QUEUE", 32)
+# Worker processes for Monte Carlo simulations (0 = one per core); the queue counts whole simulations
+SIMULATION_POOL_WORKERS = _env_int("CINEINTEL_SIMULATION_POOL_WORKERS", 0)
+SIMULATION_POOL_QUEUE = _env_int("CINEINTEL_SIMULATION_POOL_QUEUE", 4)
+SIMULATION_MAX_PATHS = _env_int("CINEINTEL_SIMULATION_MAX_PATHS", 2_000_000)
+
+# Default cap on any one genre's share of an optimized portfolio
+PORTFOLIO_MAX_WEIGHT = _env_float("CINEINTEL_PORTFOLIO_MAX_WEIGHT", 0.35)
+
+# Shared dataset for multi-worker deployments (set by serve.py); unset means each process loads its own
+SHARED_DATASET_DIR = os.getenv("CINEINTEL_SHARED_DIR")
+SHARED_POLL_SECONDS = _env_float("CINEINTEL_SHARED_POLL_SECONDS", 2.0)
+
+# Admin API: token required by every /api/admin route (disabled when unset), and CSV polling interval for hot reload (0 disables)
+ADMIN_TOKEN = os.getenv("CINEINTEL_ADMIN_TOKEN")
+RELOAD_WATCH_SECONDS = _env_float("CINEINTEL_RELOAD_WATCH_SECONDS", 0.0)
+
+# Sampling profiler: requests slower than PROFILE_SLOW_MS are sampled (0 disables), or any request sent with "X-Profile: 1"
+PROFILE_SLOW_MS = _env_float("CINEINTEL_PROFILE_SLOW_MS", 0.0)
+PROFILE_INTERVAL_MS = _env_float("CINEINTEL_PROFILE_INTERVAL_MS", 5.0)
+PROFILE_MAX_ACTIVE = _env_int("CINEINTEL_PROFILE_MAX_ACTIVE", 4)
+PROFILE_KEEP = _env_int("CINEINTEL_PROFILE_KEEP", 20)
+
+# Model training: cores used to fit the forest and by the offline search (-1 = all)
+TRAIN_JOBS = _env_int("CINEINTEL_TRAIN_JOBS", -1)
+
+# Warm derived analytics in the background after every dataset install (0 disables)
+PRECOMPUTE_ENABLED = _env_int("CINEINTEL_PRECOMPUTE", 1)
+
+# Largest budget x runtime x release month grid scored by one simulator sweep
+SWEEP_MAX_CELLS = _env_int("CINEINTEL_SWEEP_MAX_CELLS", 20_000)
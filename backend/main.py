@@ -1,28 +1,38 @@
-from fastapi import FastAPI
+import asyncio
+import hmac
+from typing import Optional
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 
+import config
 from services.data_service import DataService
 from services.ml_service import MLService
-from routes import dashboard, genre, risk, combinations, predict, movies
+from services.executor import PoolSaturatedError, data_pool, ml_pool, simulation_pool
+from services.instrumentation import InstrumentationMiddleware, profile_store
+from services.metrics import gauge_lines, metrics
+from services.response_cache import response_cache, cached_json
+from services.http_cache import read_conditional_headers
+from services.serialization import FastJSONResponse, negotiate_format, response_format
+from services.precompute import PrecomputeTask, precompute_scheduler
+from services.reloader import DatasetReloader, ReloadInProgressError
+from services.shared_dataset import SharedDataset
+from routes import dashboard, genre, risk, combinations, predict, movies, portfolio
 
 # Global services
 data_service = None
 ml_service = None
+reloader = None
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Initialize services on startup"""
+def install_services(new_data_service: DataService, new_ml_service: MLService):
+    """Point the app and every route module at a DataService/MLService pair"""
     global data_service, ml_service
     
-    print("🚀 Starting CineIntel Backend...")
-    
-    # Load data
-    data_service = DataService()
-    
-    # Train ML model
-    ml_service = MLService(data_service)
+    data_service = new_data_service
+    ml_service = new_ml_service
     
     # Inject services into routes
     dashboard.set_data_service(data_service)
@@ -30,13 +40,96 @@ async def lifespan(app: FastAPI):
     risk.set_data_service(data_service)
     combinations.set_data_service(data_service)
     movies.set_data_service(data_service)
+    portfolio.set_data_service(data_service)
     predict.set_ml_service(ml_service)
     
+    # Responses cached for a previous dataset must never be served
+    response_cache.invalidate()
+    
+    # Recompute the derived analytics of the new pair before users ask for them
+    if config.PRECOMPUTE_ENABLED:
+        precompute_scheduler.start(data_service.version, precompute_tasks())
+
+
+async def warm(handler, *args, columnar: bool = False):
+    """Call an endpoint handler outside any request so its result lands in the caches"""
+    token = response_format.set("columnar") if columnar else None
+    try:
+        await handler(*args)
+    except HTTPException as e:
+        raise RuntimeError(e.detail)
+    finally:
+        if token is not None:
+            response_format.reset(token)
+
+
+def precompute_tasks():
+    """Derived analytics warmed after an install, with the arguments the frontend requests them with"""
+    tasks = [
+        # The Executive Dashboard is the landing page; readiness waits for it
+        PrecomputeTask("dashboard_bootstrap", 0, lambda: warm(dashboard.get_dashboard_bootstrap, 12), gating=True),
+        PrecomputeTask("strategic_insight", 0, lambda: warm(get_strategic_insight), gating=True),
+        PrecomputeTask("capital_allocation", 0, lambda: warm(get_capital_allocation), gating=True),
+        PrecomputeTask("genre_overall", 1, lambda: warm(genre.get_genre_overall, columnar=True)),
+        PrecomputeTask("genre_yearly", 1, lambda: warm(genre.get_genre_yearly, columnar=True)),
+        PrecomputeTask("risk_genre", 1, lambda: warm(risk.get_genre_risk, columnar=True)),
+        PrecomputeTask("risk_analysis", 1, lambda: warm(risk.get_risk_analysis)),
+        PrecomputeTask("model_transparency", 1, lambda: warm(get_model_transparency)),
+        PrecomputeTask("genre_combinations", 2, lambda: warm(
+            combinations.get_genre_combinations, "exact", 0, 1, "avg_roi", "desc"
+        )),
+        PrecomputeTask("efficient_frontier", 2, lambda: warm(
+            portfolio.get_efficient_frontier, portfolio.FrontierRequest(points=21)
+        )),
+    ]
+    # Release timing is requested per genre
+    for name in data_service.get_all_genres():
+        tasks.append(PrecomputeTask(f"release_timing:{name}", 3, lambda name=name: warm(dashboard.get_release_timing, name)))
+    return tasks
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize services on startup"""
+    global reloader
+    
+    print("🚀 Starting CineIntel Backend...")
+    
+    background_tasks = []
+    shared = SharedDataset(config.SHARED_DATASET_DIR) if config.SHARED_DATASET_DIR else None
+    current = shared.read_current() if shared else None
+    if current is not None:
+        # Attach to the dataset and model published by the launcher
+        install_services(*shared.attach(current))
+        background_tasks.append(asyncio.create_task(
+            shared.watch(current["generation"], install_services, config.SHARED_POLL_SECONDS)
+        ))
+        reloader = DatasetReloader(install_services, shared)
+    else:
+        # Load data
+        new_data_service = DataService()
+        
+        # Train ML model
+        install_services(new_data_service, MLService(new_data_service))
+        reloader = DatasetReloader(install_services)
+        
+        # With a shared dataset the launcher watches the files instead of every worker
+        if config.RELOAD_WATCH_SECONDS > 0:
+            background_tasks.append(asyncio.create_task(
+                reloader.watch(str(data_service.data_dir), config.RELOAD_WATCH_SECONDS)
+            ))
+    
     print("✅ CineIntel Backend Ready!")
     
     yield
     
     print("🛑 Shutting down CineIntel Backend...")
+    for task in background_tasks:
+        task.cancel()
+    precompute_scheduler.cancel()
+    data_pool.shutdown()
+    ml_pool.shutdown()
+    simulation_pool.shutdown()
 
 
 # Create FastAPI app
@@ -44,7 +137,11 @@ app = FastAPI(
     title="CineIntel API",
     description="Bollywood Investment Intelligence Platform API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson-backed JSON for every route; Accept may ask for columnar tables,
+    # If-None-Match and Accept-Encoding drive 304s and compression of cached responses
+    default_response_class=FastJSONResponse,
+    dependencies=[Depends(negotiate_format), Depends(read_conditional_headers)]
 )
 
 # CORS middleware for Next.js frontend
@@ -56,6 +153,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency/size metrics and opt-in sampling profiles
+app.add_middleware(InstrumentationMiddleware)
+
+
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    """A full worker pool is a temporary condition: 503 with a retry hint, from any endpoint"""
+    return FastJSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+@app.exception_handler(Exception)
+async def unhandled_error_handler(request: Request, exc: Exception):
+    """Any other error is a 500 carrying its message"""
+    return FastJSONResponse(status_code=500, content={"detail": str(exc)})
+
 # Include routers
 app.include_router(dashboard.router)
 app.include_router(genre.router)
@@ -63,6 +175,7 @@ app.include_router(risk.router)
 app.include_router(combinations.router)
 app.include_router(predict.router)
 app.include_router(movies.router)
+app.include_router(portfolio.router)
 
 
 @app.get("/")
@@ -93,9 +206,118 @@ async def health_check():
             "data_service": data_service is not None,
             "ml_service": ml_service is not None,
             "model_accuracy": round(ml_service.model_accuracy, 4) if ml_service else 0
-        }
+        },
+        "pools": {
+            "data": data_pool.stats(),
+            "ml": ml_pool.stats(),
+            "simulation": simulation_pool.stats()
+        },
+        "precompute": {"enabled": bool(config.PRECOMPUTE_ENABLED), **precompute_scheduler.status()}
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 200 once the data is loaded and the gating artifacts are warm"""
+    ready = data_service is not None and (not config.PRECOMPUTE_ENABLED or precompute_scheduler.ready)
+    status = precompute_scheduler.status()
+    return FastJSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "warmed": status["warmed"], "total": status["total"]}
+    )
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """Response cache hit/miss counters"""
+    return response_cache.stats()
+
+def collect_runtime_metrics():
+    """Pool occupancy and response cache counters, read at scrape time"""
+    pools = [(pool.name, pool.stats()) for pool in (data_pool, ml_pool, simulation_pool)]
+    cache = response_cache.stats()
+    lines = []
+    for key, kind, documentation in (
+        ("in_flight", "gauge", "Calls running or queued on a compute pool"),
+        ("completed", "counter", "Calls finished by a compute pool"),
+        ("rejected", "counter", "Calls shed by a saturated compute pool")
+    ):
+        suffix = "_total" if kind == "counter" else ""
+        lines += gauge_lines(f"cineintel_pool_{key}{suffix}", documentation, ("pool",),
+                             [((name,), stats[key]) for name, stats in pools], kind)
+    for key, kind, documentation in (
+        ("entries", "gauge", "Entries in the response cache"),
+        ("hits", "counter", "Response cache hits"),
+        ("misses", "counter", "Response cache misses"),
+        ("evictions", "counter", "Response cache LRU evictions")
+    ):
+        suffix = "_total" if kind == "counter" else ""
+        lines += gauge_lines(f"cineintel_response_cache_{key}{suffix}", documentation, (), [((), cache[key])], kind)
+    return lines
+
+metrics.add_collector(collect_runtime_metrics)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text exposition of this process's metrics"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+def verify_admin_token(token: Optional[str]):
+    """Reject admin calls without the configured token; without a token the admin API is disabled"""
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set CINEINTEL_ADMIN_TOKEN to enable them")
+    if not hmac.compare_digest(token or "", config.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@app.post("/api/admin/reload")
+async def reload_dataset(x_admin_token: Optional[str] = Header(None)):
+    """Rebuild the dataset and model from the CSV files and swap them in without downtime"""
+    verify_admin_token(x_admin_token)
+    if not data_service or not reloader:
+        raise HTTPException(status_code=503, detail="Data Service not initialized")
+    try:
+        return await reloader.reload(str(data_service.data_dir))
+    except ReloadInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/admin/genre-stats")
+async def update_genre_stats(changes: dict, x_admin_token: Optional[str] = Header(None)):
+    """Append or retract movies in the genre statistics: { "append": [...], "retract": [...] }"""
+    verify_admin_token(x_admin_token)
+    if not data_service:
+        raise HTTPException(status_code=503, detail="Data Service not initialized")
+    if data_service.pinned_snapshot:
+        # Each worker holds its own statistics; shared builds are changed by publishing
+        raise HTTPException(status_code=409, detail="Statistics of a shared dataset are updated by publishing a new build")
+    try:
+        # Patching the tables and rebuilding the cube is CPU work; the lock is taken on the pool thread
+        result = await data_pool.run(
+            data_service.update_genre_stats, changes.get("append", []), changes.get("retract", [])
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if config.PRECOMPUTE_ENABLED:
+        precompute_scheduler.start(data_service.version, precompute_tasks())
+    return result
+
+@app.get("/api/admin/profiles")
+async def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    """Recent sampling profiles of slow or explicitly profiled requests"""
+    verify_admin_token(x_admin_token)
+    return {"profiles": profile_store.list()}
+
+@app.get("/api/admin/profiles/{profile_id}")
+async def get_profile(profile_id: int, format: str = Query("json", pattern="^(json|folded)$"),
+                      x_admin_token: Optional[str] = Header(None)):
+    """Hot stacks of one profile, as JSON or in the folded flame graph format"""
+    verify_admin_token(x_admin_token)
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No profile {profile_id}")
+    if format == "folded":
+        return PlainTextResponse(profile.folded())
+    return profile.report()
+
 # --- New SaaS Endpoints ---
 
 @app.get("/api/model/transparency")
@@ -103,7 +325,7 @@ async def get_model_transparency():
     """Get model transparency metrics"""
     if not ml_service:
         return {"error": "ML Service not initialized"}
-    return ml_service.get_model_transparency()
+    return await ml_pool.run(ml_service.get_model_transparency)
 
 @app.post("/api/predict/compare")
 async def compare_plans(plans: dict):
@@ -112,21 +334,21 @@ async def compare_plans(plans: dict):
         return {"error": "ML Service not initialized"}
     
     # Expecting { "plan_a": {...}, "plan_b": {...} }
-    return ml_service.compare_investment_plans(plans.get('plan_a'), plans.get('plan_b'))
+    return await ml_pool.run(ml_service.compare_investment_plans, plans.get('plan_a'), plans.get('plan_b'))
 
 @app.get("/api/dashboard/strategic-insight")
 async def get_strategic_insight():
     """Get AI strategic insight"""
     if not data_service:
         return {"error": "Data Service not initialized"}
-    return data_service.get_strategic_insight()
+    return await cached_json("get_strategic_insight", data_service.version, data_service.get_strategic_insight)
 
 @app.get("/api/dashboard/capital-allocation")
 async def get_capital_allocation():
     """Get capital allocation strategy"""
     if not data_service:
         return {"error": "Data Service not initialized"}
-    return data_service.get_capital_allocation_strategy()
+    return await cached_json("get_capital_allocation_strategy", data_service.version, data_service.get_capital_allocation_strategy)
 
 @app.post("/api/report/export")
 async def export_report(data: dict):
@@ -1,4 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from services.response_cache import cached_json
 
 router = APIRouter(prefix="/api/combinations", tags=["combinations"])
 
@@ -12,9 +16,16 @@ def set_data_service(ds):
 
 
 @router.get("")
-async def get_genre_combinations():
+async def get_genre_combinations(
+    mode: str = Query("exact", pattern="^(exact|canonical|pairs|triples)$"),
+    limit: Optional[int] = Query(None, ge=0),
+    min_support: int = Query(1, ge=1),
+    sort_by: str = Query("avg_roi", pattern="^(avg_roi|success_rate|total_movies|total_revenue)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$")
+):
     """Get genre combination analysis"""
-    try:
-        return data_service.get_genre_combinations()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_json(
+        "get_genre_combinations", data_service.version,
+        lambda: data_service.get_genre_combinations(mode, min_support, sort_by, order, limit),
+        mode=mode, limit=limit, min_support=min_support, sort_by=sort_by, order=order
+    )
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
 from typing import Optional
 
+from services.executor import data_pool
+from services.response_cache import cached_json
+
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 # Data service will be injected
@@ -15,52 +18,49 @@ def set_data_service(ds):
 @router.get("/summary")
 async def get_dashboard_summary():
     """Get dashboard KPI summary"""
-    try:
-        return data_service.get_dashboard_summary()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_json("get_dashboard_summary", data_service.version, data_service.get_dashboard_summary)
+
+
+@router.get("/bootstrap")
+async def get_dashboard_bootstrap(limit: int = 12):
+    """Get every Executive Dashboard panel in one response"""
+    return await cached_json(
+        "get_dashboard_bootstrap", data_service.version,
+        lambda: data_service.get_dashboard_bootstrap(limit), limit=limit
+    )
 
 
 @router.get("/ai-recommendation")
 async def get_ai_recommendation():
     """Get AI-generated recommendation"""
-    try:
-        return data_service.get_ai_recommendation()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_json("get_ai_recommendation", data_service.version, data_service.get_ai_recommendation)
 
 
 @router.get("/budget-optimization")
 async def get_budget_optimization(genre: str, budget: float):
     """Get budget optimization suggestion"""
-    try:
-        return data_service.get_budget_optimization(genre, budget)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await data_pool.run(data_service.get_budget_optimization, genre, budget)
 
 
 @router.get("/release-timing")
 async def get_release_timing(genre: str):
     """Get release timing suggestions"""
-    try:
-        return data_service.get_release_timing(genre)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_json(
+        "get_release_timing", data_service.version,
+        lambda: data_service.get_release_timing(genre), genre=genre
+    )
 
 
 @router.get("/market-pulse")
 async def get_market_pulse():
     """Get AI Market Pulse"""
-    try:
-        return data_service.get_market_pulse()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_json("get_market_pulse", data_service.version, data_service.get_market_pulse)
 
 
 @router.get("/top-performers")
 async def get_top_performers(limit: int = 12):
     """Get top performing movies"""
-    try:
-        return data_service.get_top_performing_movies(limit)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_json(
+        "get_top_performing_movies", data_service.version,
+        lambda: data_service.get_top_performing_movies(limit), limit=limit
+    )
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List
 
+from services.response_cache import cached_json
+
 router = APIRouter(prefix="/api/genre", tags=["genre"])
 
 # Data service will be injected
@@ -19,22 +21,25 @@ async def get_genre_popularity(
     genres: Optional[str] = Query(None)
 ):
     """Get genre popularity over time"""
-    try:
-        year_range = [year_start, year_end] if year_start and year_end else None
-        genre_list = genres.split(',') if genres else None
-        
-        return data_service.get_genre_popularity_over_time(year_range, genre_list)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    year_range = [year_start, year_end] if year_start and year_end else None
+    genre_list = genres.split(',') if genres else None
+    
+    return await cached_json(
+        "get_genre_popularity_over_time", data_service.version,
+        lambda: data_service.get_genre_popularity_over_time(year_range, genre_list),
+        year_start=year_range[0] if year_range else None,
+        year_end=year_range[1] if year_range else None,
+        genres=genre_list
+    )
 
 
 @router.get("/top-by-year")
 async def get_top_genres_by_year(year: int = Query(...)):
     """Get top 3 genres for a specific year"""
-    try:
-        return data_service.get_top_genres_by_year(year)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_json(
+        "get_top_genres_by_year", data_service.version,
+        lambda: data_service.get_top_genres_by_year(year), year=year
+    )
 
 
 @router.get("/revenue")
@@ -43,31 +48,51 @@ async def get_highest_grossing(
     year_end: Optional[int] = Query(None)
 ):
     """Get highest grossing genre per year"""
-    try:
-        year_range = [year_start, year_end] if year_start and year_end else None
-        return data_service.get_highest_grossing_per_year(year_range)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    year_range = [year_start, year_end] if year_start and year_end else None
+    return await cached_json(
+        "get_highest_grossing_per_year", data_service.version,
+        lambda: data_service.get_highest_grossing_per_year(year_range),
+        year_start=year_range[0] if year_range else None,
+        year_end=year_range[1] if year_range else None
+    )
 
 
 @router.get("/success-rate")
-async def get_success_rate(genres: Optional[str] = Query(None)):
-    """Get success rate by genre"""
-    try:
-        genre_list = genres.split(',') if genres else None
-        return data_service.get_success_rate_by_genre(genre_list)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_success_rate(
+    genres: Optional[str] = Query(None),
+    year_start: Optional[int] = Query(None),
+    year_end: Optional[int] = Query(None)
+):
+    """Get success rate by genre, over all years or a year window"""
+    genre_list = genres.split(',') if genres else None
+    year_range = [year_start, year_end] if year_start and year_end else None
+    return await cached_json(
+        "get_success_rate_by_genre", data_service.version,
+        lambda: data_service.get_success_rate_by_genre(genre_list, year_range),
+        columnar=True,
+        genres=genre_list,
+        year_start=year_range[0] if year_range else None,
+        year_end=year_range[1] if year_range else None
+    )
 
 
 @router.get("/roi")
-async def get_roi(genres: Optional[str] = Query(None)):
-    """Get average ROI by genre"""
-    try:
-        genre_list = genres.split(',') if genres else None
-        return data_service.get_roi_by_genre(genre_list)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_roi(
+    genres: Optional[str] = Query(None),
+    year_start: Optional[int] = Query(None),
+    year_end: Optional[int] = Query(None)
+):
+    """Get average ROI by genre, over all years or a year window"""
+    genre_list = genres.split(',') if genres else None
+    year_range = [year_start, year_end] if year_start and year_end else None
+    return await cached_json(
+        "get_roi_by_genre", data_service.version,
+        lambda: data_service.get_roi_by_genre(genre_list, year_range),
+        columnar=True,
+        genres=genre_list,
+        year_start=year_range[0] if year_range else None,
+        year_end=year_range[1] if year_range else None
+    )
 
 
 @router.get("/list")
@@ -91,25 +116,20 @@ async def get_year_range():
 @router.get("/yearly")
 async def get_genre_yearly():
     """Get yearly genre statistics"""
-    try:
-        return data_service.load_genre_yearly()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_json("load_genre_yearly", data_service.version, data_service.load_genre_yearly, columnar=True)
 
 
 @router.get("/overall")
 async def get_genre_overall():
     """Get overall genre statistics"""
-    try:
-        return data_service.load_genre_overall()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_json("load_genre_overall", data_service.version, data_service.load_genre_overall, columnar=True)
 
 
 @router.get("/benchmark")
 async def get_benchmark(genre_a: str = Query(...), genre_b: str = Query(...)):
     """Compare two genres for benchmarking"""
-    try:
-        return data_service.get_benchmark_data(genre_a, genre_b)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_json(
+        "get_benchmark_data", data_service.version,
+        lambda: data_service.get_benchmark_data(genre_a, genre_b),
+        genre_a=genre_a, genre_b=genre_b
+    )
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 
+from services.executor import data_pool
+
 router = APIRouter(prefix="/api/movies", tags=["movies"])
 
 # Data service will be injected
@@ -21,17 +23,15 @@ async def explore_movies(
     sort_order: str = "desc"
 ):
     """Explore movies with filtering, searching, and pagination"""
-    try:
-        if not data_service:
-            raise HTTPException(status_code=500, detail="Data Service not initialized")
-        return await data_service.get_filtered_movies(
-            page=page,
-            limit=limit,
-            search=search,
-            genre=genre,
-            success_label=success_label,
-            sort_by=sort_by,
-            sort_order=sort_order
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    if not data_service:
+        raise HTTPException(status_code=500, detail="Data Service not initialized")
+    return await data_pool.run(
+        data_service.get_filtered_movies,
+        page=page,
+        limit=limit,
+        search=search,
+        genre=genre,
+        success_label=success_label,
+        sort_by=sort_by,
+        sort_order=sort_order
+    )
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from typing import Dict, List, Literal, Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+import config
+from services.executor import simulation_pool
+from services.monte_carlo import SimulationPlan, simulate_chunk
+from services.response_cache import cached_json
+from services.serialization import encode_json
+
+router = APIRouter(prefix="/api/portfolio", tags=["portfolio"])
+
+# Data service will be injected
+data_service = None
+
+# Minimum seconds between progress lines of a streamed simulation
+PROGRESS_INTERVAL_SECONDS = 0.25
+
+
+def set_data_service(ds):
+    global data_service
+    data_service = ds
+
+
+class SimulationRequest(BaseModel):
+    allocation: Dict[str, float] = Field(..., min_length=1)
+    films: int = Field(10, ge=1, le=200)
+    paths: int = Field(100_000, ge=1_000)
+    seed: Optional[int] = Field(None, ge=0, lt=2 ** 63)
+    budget: Optional[float] = Field(None, gt=0)
+    confidence: float = Field(0.95, ge=0.5, lt=1)
+
+
+class AllocationConstraints(BaseModel):
+    max_weight: float = Field(config.PORTFOLIO_MAX_WEIGHT, gt=0, le=1)
+    caps: Optional[Dict[str, float]] = None
+    genres: Optional[List[str]] = None
+
+
+class OptimizationRequest(AllocationConstraints):
+    objective: Literal["max_sharpe", "mean_variance", "min_variance", "min_cvar"] = "max_sharpe"
+    risk_aversion: float = Field(1.0, gt=0)
+    confidence: float = Field(0.95, ge=0.5, lt=1)
+    budget: Optional[float] = Field(None, gt=0)
+
+
+class FrontierRequest(AllocationConstraints):
+    points: int = Field(50, ge=2, le=200)
+
+
+async def stream_simulation(plan: SimulationPlan, results):
+    """NDJSON lines: the plan, progress summaries as chunks finish, then the final result"""
+    started = time.perf_counter()
+    chunks = [None] * len(plan.chunks)
+    completed = 0
+    last_progress = started
+    yield encode_json({"type": "plan", **plan.describe()}) + b"\n"
+    try:
+        async for index, multiples in results:
+            chunks[index] = multiples
+            completed += len(multiples)
+            now = time.perf_counter()
+            if completed == plan.paths or now - last_progress < PROGRESS_INTERVAL_SECONDS:
+                continue
+            partial = np.concatenate([chunk for chunk in chunks if chunk is not None])
+            # Summaries run off the event loop; pool admission already bounds concurrent simulations
+            summary = await asyncio.to_thread(plan.summarize, partial)
+            last_progress = time.perf_counter()
+            yield encode_json({
+                "type": "progress",
+                "completed_paths": completed,
+                "total_paths": plan.paths,
+                "elapsed_s": round(last_progress - started, 3),
+                "summary": summary
+            }) + b"\n"
+
+        # Chunk order, not completion order, so a seed always gives the same result
+        summary = await asyncio.to_thread(plan.summarize, np.concatenate(chunks), True)
+        yield encode_json({
+            "type": "result",
+            "completed_paths": completed,
+            "total_paths": plan.paths,
+            "elapsed_s": round(time.perf_counter() - started, 3),
+            "summary": summary
+        }) + b"\n"
+    except Exception as e:
+        yield encode_json({"type": "error", "detail": str(e)}) + b"\n"
+    finally:
+        # Frees the pool slot and cancels queued chunks when the client goes away
+        await results.aclose()
+
+
+@router.post("/simulate")
+async def simulate_portfolio(request: SimulationRequest, stream: bool = True):
+    """Monte Carlo ROI distribution of a slate allocation, streamed as NDJSON progress"""
+    if request.paths > config.SIMULATION_MAX_PATHS:
+        raise HTTPException(status_code=400, detail=f"At most {config.SIMULATION_MAX_PATHS} paths per simulation")
+    try:
+        plan = data_service.monte_carlo.plan(
+            request.allocation, request.films, request.paths, request.seed, request.budget, request.confidence
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    results = simulation_pool.map(simulate_chunk, plan.chunks)
+
+    if stream:
+        return StreamingResponse(stream_simulation(plan, results), media_type="application/x-ndjson")
+    try:
+        chunks = [None] * len(plan.chunks)
+        async for index, multiples in results:
+            chunks[index] = multiples
+        summary = await asyncio.to_thread(plan.summarize, np.concatenate(chunks), True)
+        return {**plan.describe(), "summary": summary}
+    finally:
+        await results.aclose()
+
+
+@router.get("/inputs")
+async def get_portfolio_inputs():
+    """Expected ROI, volatility and correlation of the genres the optimizer allocates to"""
+    return await cached_json("get_portfolio_inputs", data_service.version, data_service.get_portfolio_inputs)
+
+
+@router.post("/optimize")
+async def optimize_portfolio(request: OptimizationRequest):
+    """Genre allocation maximizing Sharpe or mean-variance utility, or minimizing variance or CVaR"""
+    params = request.model_dump()
+    try:
+        # Validate up front so bad caps are a 400 rather than a cached failure
+        data_service.portfolio.caps(request.max_weight, request.caps, request.genres)
+        return await cached_json(
+            "optimize_portfolio", data_service.version, lambda: data_service.optimize_portfolio(**params), **params
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/frontier")
+async def get_efficient_frontier(request: FrontierRequest):
+    """Whole mean-variance efficient frontier from one batched solve"""
+    params = request.model_dump()
+    try:
+        data_service.portfolio.caps(request.max_weight, request.caps, request.genres)
+        return await cached_json(
+            "get_efficient_frontier", data_service.version, lambda: data_service.get_efficient_frontier(**params), **params
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,5 +1,11 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+import config
+from services.executor import ml_pool
+from services.ml_service import sweep_values
+from services.response_cache import cached_json
 
 router = APIRouter(prefix="/api/predict", tags=["predict"])
 
@@ -18,22 +24,32 @@ class PredictionRequest(BaseModel):
     year: int
     imdb_rating: float
     runtime: int
+    top_n: int = Field(5, ge=1, le=50)
 
 
 @router.post("")
 async def predict_movie_success(request: PredictionRequest):
     """Predict movie success and provide investment insights"""
-    try:
-        result = ml_service.predict(
-            genre=request.genre,
-            budget=request.budget,
-            year=request.year,
-            imdb_rating=request.imdb_rating,
-            runtime=request.runtime
-        )
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await ml_pool.run(
+        ml_service.predict,
+        genre=request.genre,
+        budget=request.budget,
+        year=request.year,
+        imdb_rating=request.imdb_rating,
+        runtime=request.runtime,
+        top_n=request.top_n
+    )
+    return result
+
+
+class BatchPredictionRequest(BaseModel):
+    plans: List[PredictionRequest] = Field(..., min_length=1, max_length=5000)
+
+
+@router.post("/batch")
+async def predict_batch(request: BatchPredictionRequest):
+    """Score many investment plans in one vectorized pass"""
+    return await ml_pool.run(ml_service.predict_batch, [plan.model_dump() for plan in request.plans])
 
 
 class SimulatorRequest(BaseModel):
@@ -41,18 +57,60 @@ class SimulatorRequest(BaseModel):
     budget: float
     runtime: int
     release_month: int
+    top_n: int = Field(10, ge=1, le=50)
 
 
 @router.post("/simulator")
 async def predict_simulator(request: SimulatorRequest):
     """Data-driven simulator prediction"""
-    try:
-        result = ml_service.predict_simulator(
-            genre=request.genre,
-            budget=request.budget,
-            runtime=request.runtime,
-            release_month=request.release_month
-        )
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await ml_pool.run(
+        ml_service.predict_simulator,
+        genre=request.genre,
+        budget=request.budget,
+        runtime=request.runtime,
+        release_month=request.release_month,
+        top_n=request.top_n
+    )
+    return result
+
+
+class SweepRange(BaseModel):
+    min: float
+    max: float
+    steps: int = Field(10, ge=1, le=200)
+    log: bool = False
+
+
+class SweepRequest(SimulatorRequest):
+    budget_range: Optional[SweepRange] = None
+    runtime_range: Optional[SweepRange] = None
+    release_month_range: Optional[SweepRange] = None
+
+
+@router.post("/simulator/sweep")
+async def predict_simulator_sweep(request: SweepRequest):
+    """Simulator success probability, risk and expected ROI over a grid of budgets, runtimes and release months"""
+    axes = {}
+    for name, sweep, integer in [("budget", request.budget_range, False), ("runtime", request.runtime_range, True),
+                                 ("release_month", request.release_month_range, True)]:
+        if sweep is None:
+            continue
+        if sweep.min > sweep.max or (sweep.log and sweep.min <= 0):
+            raise HTTPException(status_code=400, detail=f"Invalid {name} range")
+        axes[name] = sweep_values(sweep.min, sweep.max, sweep.steps, sweep.log, integer)
+    if any(not 1 <= month <= 12 for month in axes.get("release_month", [])):
+        raise HTTPException(status_code=400, detail="Release months must be between 1 and 12")
+    cells = len(axes.get("budget", [0])) * len(axes.get("runtime", [0])) * len(axes.get("release_month", [0]))
+    if cells > config.SWEEP_MAX_CELLS:
+        raise HTTPException(status_code=400, detail=f"At most {config.SWEEP_MAX_CELLS} grid cells per sweep")
+
+    params = {
+        "genre": request.genre, "budget": request.budget, "runtime": request.runtime,
+        "release_month": request.release_month, "budgets": axes.get("budget"), "runtimes": axes.get("runtime"),
+        "release_months": axes.get("release_month"), "top_n": request.top_n
+    }
+    # Scores depend on the dataset and on the serving model
+    return await cached_json(
+        "predict_simulator_sweep", f"{ml_service.data_service.version}:{ml_service.model_key}",
+        lambda: ml_service.predict_simulator_sweep(**params), pool=ml_pool, **params
+    )
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
+
+from services.response_cache import cached_json
 
 router = APIRouter(prefix="/api/risk", tags=["risk"])
 
@@ -14,25 +16,12 @@ def set_data_service(ds):
 @router.get("/genre")
 async def get_genre_risk():
     """Get risk analysis for all genres from statistics"""
-    try:
-        df = data_service.load_risk_data()
-        return df.to_dict('records')
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_json(
+        "load_risk_data", data_service.version, data_service.load_risk_data, columnar=True
+    )
 
 
 @router.get("/analysis")
 async def get_risk_analysis():
     """Get risk analysis for all genres"""
-    try:
-        risk_data = data_service.get_risk_analysis()
-        
-        # Calculate industry risk index (average risk score)
-        avg_risk = sum(item['risk_score'] for item in risk_data) / len(risk_data)
-        
-        return {
-            "genres": risk_data,
-            "industry_risk_index": round(avg_risk, 2)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_json("get_risk_overview", data_service.version, data_service.get_risk_overview)
@@ -0,0 +1,64 @@
+"""Multi-worker launcher: builds the dataset and model once, then starts uvicorn workers that share them.
+
+    python serve.py --workers 4 [--data-dir ../movie-data-pipeline] [--shared-dir shared_dataset] [--watch 5]
+"""
+import argparse
+import os
+import threading
+import time
+from pathlib import Path
+
+import uvicorn
+
+from services.data_service import DEFAULT_DATA_DIR, DataService
+from services.ml_service import MLService
+from services.reloader import SourceWatcher
+from services.shared_dataset import SharedDataset
+
+
+DEFAULT_SHARED_DIR = Path(__file__).resolve().parent / "shared_dataset"
+
+
+def publish(data_dir: str, shared_dir: str):
+    """Build the dataset and model in this process and publish them for the workers"""
+    data_service = DataService(data_dir)
+    ml_service = MLService(data_service)
+    SharedDataset(shared_dir).publish(data_service, ml_service)
+
+
+def watch_and_publish(data_dir: str, shared_dir: str, interval: float):
+    """Republish whenever the CSV files change; workers pick the new build up themselves"""
+    watcher = SourceWatcher(data_dir)
+    while True:
+        time.sleep(interval)
+        try:
+            if watcher.poll():
+                publish(data_dir, shared_dir)
+        except Exception as e:
+            print(f"⚠️ Could not publish rebuilt dataset: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run CineIntel with a dataset shared across workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="movie-data-pipeline directory")
+    parser.add_argument("--shared-dir", default=str(DEFAULT_SHARED_DIR), help="where published builds live")
+    parser.add_argument("--watch", type=float, default=0, help="poll the CSV files every N seconds and republish")
+    args = parser.parse_args()
+
+    print("🚀 Building shared dataset...")
+    publish(args.data_dir, args.shared_dir)
+    if args.watch > 0:
+        threading.Thread(
+            target=watch_and_publish, args=(args.data_dir, args.shared_dir, args.watch), daemon=True
+        ).start()
+
+    # Workers inherit the environment and attach instead of loading their own copies
+    os.environ["CINEINTEL_SHARED_DIR"] = str(Path(args.shared_dir).resolve())
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
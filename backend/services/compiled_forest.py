@@ -0,0 +1,141 @@
+import numpy as np
+import sklearn
+from sklearn.utils.fixes import parse_version
+from typing import Optional
+
+
+# sklearn 1.4+ stores leaf values as class fractions and returns them as they are;
+# older versions store weighted counts and normalize them on every call
+LEAF_VALUES_NORMALIZED = parse_version(sklearn.__version__) >= parse_version("1.4")
+
+
+# Rows walked together; keeps the per-level arrays of a block cache-resident
+ROW_BLOCK = 1024
+
+
+def _float32_floor(threshold: np.ndarray) -> np.ndarray:
+    """Largest float32 not above each threshold: for float32 x, x <= t exactly when x <= floor32(t)"""
+    rounded = threshold.astype(np.float32)
+    above = rounded.astype(np.float64) > threshold
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+class CompiledForest:
+    """Flattened decision forest for fast batch inference.
+
+    The nodes of every tree are concatenated into contiguous arrays
+    (feature, threshold, children, missing-value direction) and each leaf
+    carries its class distribution. Leaves point to themselves, so a batch
+    is scored by walking all trees for all rows together for max-depth
+    steps, a few NumPy gathers per level, instead of one Python call per
+    tree. Large batches are walked in blocks of ROW_BLOCK rows.
+
+    Probabilities are identical to sklearn's predict_proba: inputs are
+    compared as float32 like sklearn's trees do (against thresholds rounded
+    down to float32, which gives the same decisions), leaf distributions
+    are taken as sklearn returns them, and tree outputs are summed in tree
+    order before dividing by the number of trees.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children: np.ndarray,
+                 missing_left: np.ndarray, leaf_proba: np.ndarray, roots: np.ndarray, depth: int,
+                 classes: np.ndarray, n_features: int):
+        self.feature = feature
+        self.threshold = threshold
+        # children[2 * node + went_left]: right child first, then left
+        self.children = children
+        self.missing_left = missing_left
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.depth = depth
+        self.classes_ = classes
+        self.n_features = n_features
+
+    @classmethod
+    def from_estimator(cls, model) -> Optional["CompiledForest"]:
+        """Compile a fitted random forest or extra-trees classifier; None for other models"""
+        estimators = getattr(model, 'estimators_', None)
+        if not estimators or not all(hasattr(e, 'tree_') for e in estimators) or model.n_outputs_ != 1:
+            return None
+
+        features, thresholds, children, missing, probas, roots = [], [], [], [], [], []
+        offset, depth = 0, 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left < 0
+
+            # Leaves loop onto themselves whichever way the split test goes
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            children.append(np.column_stack([
+                np.where(is_leaf, nodes, tree.children_right + offset),
+                np.where(is_leaf, nodes, tree.children_left + offset)
+            ]).ravel())
+            missing_go_to_left = getattr(tree, 'missing_go_to_left', None)
+            missing.append(
+                np.asarray(missing_go_to_left, dtype=bool) if missing_go_to_left is not None
+                else np.zeros(tree.node_count, dtype=bool)
+            )
+
+            # Leaf outputs exactly as DecisionTreeClassifier.predict_proba returns them
+            proba = tree.value[:, 0, :estimator.n_classes_].astype(np.float64)
+            if not LEAF_VALUES_NORMALIZED:
+                normalizer = proba.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                proba = proba / normalizer
+            probas.append(proba)
+
+            roots.append(offset)
+            offset += tree.node_count
+            depth = max(depth, tree.max_depth)
+
+        return cls(
+            np.concatenate(features).astype(np.intp), _float32_floor(np.concatenate(thresholds)),
+            np.concatenate(children).astype(np.intp), np.concatenate(missing), np.concatenate(probas),
+            np.array(roots, dtype=np.intp), depth, np.asarray(model.classes_), model.n_features_in_
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def _walk(self, X: np.ndarray) -> np.ndarray:
+        """Leaves reached by one block of float32 rows, tree-major"""
+        n_rows = X.shape[0]
+        values = X.ravel()
+        has_missing = np.isnan(values).any()
+        # Offset of each (tree, row) pair's feature vector in the flattened input
+        row_base = np.tile(np.arange(n_rows, dtype=np.intp) * self.n_features, self.n_trees)
+        node = np.repeat(self.roots, n_rows)
+        for _ in range(self.depth):
+            value = values[row_base + self.feature[node]]
+            went_left = value <= self.threshold[node]
+            if has_missing:
+                went_left |= np.isnan(value) & self.missing_left[node]
+            node = self.children[2 * node + went_left]
+        return node
+
+    def apply(self, X) -> np.ndarray:
+        """Leaf reached in every tree by every row, shape (n_trees, n_rows)"""
+        # sklearn's trees compare float32 inputs against their thresholds
+        X = np.ascontiguousarray(np.asarray(X, dtype=np.float32).reshape(-1, self.n_features))
+        if len(X) <= ROW_BLOCK:
+            return self._walk(X).reshape(self.n_trees, len(X))
+        leaves = np.empty((self.n_trees, len(X)), dtype=np.intp)
+        for start in range(0, len(X), ROW_BLOCK):
+            block = X[start:start + ROW_BLOCK]
+            leaves[:, start:start + len(block)] = self._walk(block).reshape(self.n_trees, len(block))
+        return leaves
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities of each row, equal to the forest's predict_proba"""
+        # Reducing over the leading axis adds the trees one after another, as sklearn does
+        proba = np.add.reduce(self.leaf_proba[self.apply(X)], axis=0)
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        """Class of each row with the highest probability"""
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
@@ -1,17 +1,113 @@
+import hashlib
+import threading
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 
+import config
+from services.feature_store import FeatureStore
+from services.genre_combinations import GenreCombinationEngine
+from services.genre_cube import GenreYearCube
+from services.monte_carlo import MonteCarloEngine
+from services.portfolio_optimizer import PortfolioOptimizer
+from services.genre_stats import GenreStatsEngine
+from services.metrics import instrumented
+from services.movie_query import MovieQueryEngine
+from services.model_store import file_digest
+from services.similarity_index import SimilarityIndex
+from services.snapshot import SNAPSHOT_DIRNAME, load_snapshot, write_snapshot
 
+
+DEFAULT_DATA_DIR = "../movie-data-pipeline."
+
+
+def dataset_sources(data_dir: Path) -> Dict[str, Path]:
+    """CSV files the dataset is built from"""
+    data_dir = Path(data_dir)
+    # Use master_movies_dataset.csv for more comprehensive data
+    movies_path = data_dir / "master_movies_dataset.csv"
+    if not movies_path.exists():
+        movies_path = data_dir / "merged_bollywood_movies.csv"
+    return {
+        "movies": movies_path,
+        "genre_year_stats": data_dir / "genre_year_statistics.csv",
+        "genre_overall_stats": data_dir / "genre_overall_statistics.csv"
+    }
+
+
+def success_labels(roi: pd.Series) -> pd.Series:
+    """Success label of each movie from its ROI: Hit at 2x or more, Average from 1x, otherwise Flop"""
+    labels = np.where(roi >= 2, 'Hit', np.where(roi >= 1, 'Average', 'Flop'))
+    return pd.Series(labels, index=roi.index)
+
+
+def parse_release_dates(values: pd.Series) -> pd.Series:
+    """Parse dates such as '2 August 2012 (India)', dropping the parenthesized region"""
+    # Regex instead of split('('), which breaks on a column that is entirely missing
+    dates = values.astype(str).str.replace(r'\(.*$', '', regex=True).str.strip()
+    return pd.to_datetime(dates, errors='coerce')
+
+
+def clean_movies(movies: pd.DataFrame) -> pd.DataFrame:
+    """Cleaning rules applied to every movie table, at load time and during ingestion"""
+    # ROI and success label are derived when a raw dump does not carry them
+    if 'roi' not in movies.columns and {'budget', 'box_office'} <= set(movies.columns):
+        movies['roi'] = (movies['box_office'] / movies['budget']).where(movies['budget'] > 0)
+    if 'success_label' not in movies.columns and 'roi' in movies.columns:
+        movies['success_label'] = success_labels(movies['roi'])
+    
+    # Use 'genres' primarily if available
+    if 'genres' in movies.columns and 'genre' not in movies.columns:
+        movies['genre'] = movies['genres']
+    elif 'genre' in movies.columns and 'genres' not in movies.columns:
+        movies['genres'] = movies['genre']
+    
+    # Clean data
+    movies['release_date'] = parse_release_dates(movies['release_date'])
+    
+    # Normalize genre separator to '|' (used by existing logic)
+    if 'genre' in movies.columns:
+        movies['genre'] = movies['genre'].str.replace(', ', '|').str.replace(',', '|')
+    
+    # Fill missing ROI with 0
+    if 'roi' in movies.columns:
+        movies['roi'] = movies['roi'].fillna(0.0)
+    
+    return movies
+
+
+@instrumented("data_service")
 class DataService:
     """Service for loading and managing CSV data"""
     
-    def __init__(self, data_dir: str = "../movie-data-pipeline."):
+    def __init__(self, data_dir: str = DEFAULT_DATA_DIR, use_snapshot: bool = True,
+                 snapshot_dir: Optional[str] = None):
         self.data_dir = Path(data_dir)
+        # An explicit snapshot is a published build: attach to it as-is, never re-parse the CSVs
+        self.pinned_snapshot = snapshot_dir is not None
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else self.data_dir / SNAPSHOT_DIRNAME
+        self.use_snapshot = use_snapshot or self.pinned_snapshot
+        self.movies_path: Path = None
+        self.source_digests: Dict[str, str] = {}
+        self.version: str = None
         self.movies: pd.DataFrame = None
         self.genre_year_stats: pd.DataFrame = None
         self.genre_overall_stats: pd.DataFrame = None
+        self.feature_store: FeatureStore = None
+        self.similarity_index: SimilarityIndex = None
+        self.movie_query: MovieQueryEngine = None
+        self.combinations: GenreCombinationEngine = None
+        self.genre_stats: GenreStatsEngine = None
+        self.genre_cube: GenreYearCube = None
+        self.monte_carlo: MonteCarloEngine = None
+        self.portfolio: PortfolioOptimizer = None
+        self.stats_revision = 0
+        self._stats_lock = threading.Lock()
+        # (version, strategic insight) shared by the summary, market pulse and bootstrap
+        self._insight_memo: Optional[Tuple[str, Dict]] = None
+        # (version, max-Sharpe weights) behind the capital allocation and the insight text
+        self._allocation_memo: Optional[Tuple[str, np.ndarray]] = None
         self.load_data()
     
     def _calculate_confidence(self, sample_size: int) -> str:
@@ -21,80 +117,156 @@ class DataService:
         return "Low"
 
     def _recalculate_genre_stats(self):
-        """Recalculate genre statistics to ensure accurate volatility"""
-        # Explode genres to handle movies with multiple genres
-        # We already normalized separator to '|' in load_data
-        movies_exploded = self.movies.assign(genre_split=self.movies['genre'].str.split('|')).explode('genre_split')
-        
-        # Group by genre
-        genre_groups = movies_exploded.groupby('genre_split')
-        
-        # Calculate stats
-        stats = []
-        for genre, group in genre_groups:
-            # ROI Volatility (Standard Deviation)
-            # Use ddof=1 for sample standard deviation
-            roi_volatility = group['roi'].std() if len(group) > 1 else 0.0
-            
-            stats.append({
-                'genre': genre,
-                'roi_volatility_recalc': roi_volatility
-            })
-            
-        # Merge back into genre_overall_stats
-        recalc_df = pd.DataFrame(stats)
+        """Seed the incremental genre statistics and recalculate ROI volatility from the movies"""
+        self.genre_stats = GenreStatsEngine.from_movies(self.movies)
+        
+        # ROI volatility over the '|'-split 'genre' column (missing ROI as 0); the engine keeps its moments
         if self.genre_overall_stats is not None:
-            # First drop old if exists
-            if 'roi_volatility' in self.genre_overall_stats.columns:
-                self.genre_overall_stats.drop('roi_volatility', axis=1, inplace=True)
-                
-            self.genre_overall_stats = pd.merge(self.genre_overall_stats, recalc_df, on='genre', how='left')
-            # Update the main column with recalculated value
-            self.genre_overall_stats['roi_volatility'] = self.genre_overall_stats['roi_volatility_recalc'].fillna(0.0)
-            self.genre_overall_stats.drop('roi_volatility_recalc', axis=1, inplace=True)
+            volatility = {genre: moments.std() for genre, moments in self.genre_stats.volatility.items()}
+            recalculated = self.genre_overall_stats['genre'].map(volatility).fillna(0.0)
+            # The recalculated column goes last
+            self.genre_overall_stats = self.genre_overall_stats.drop(columns='roi_volatility', errors='ignore')
+            self.genre_overall_stats['roi_volatility'] = recalculated
             print("✅ Recalculated ROI volatility for all genres")
 
     def load_data(self):
-        """Load all CSV files into memory"""
+        """Load the dataset from its binary snapshot, falling back to the CSV files"""
         try:
-            # Use master_movies_dataset.csv for more comprehensive data
-            movies_path = self.data_dir / "master_movies_dataset.csv"
-            if not movies_path.exists():
-                movies_path = self.data_dir / "merged_bollywood_movies.csv"
-                
-            self.movies = pd.read_csv(movies_path)
-            self.genre_year_stats = pd.read_csv(self.data_dir / "genre_year_statistics.csv")
-            self.genre_overall_stats = pd.read_csv(self.data_dir / "genre_overall_statistics.csv")
-            
-            # Use 'genres' primarily if available
-            if 'genres' in self.movies.columns and 'genre' not in self.movies.columns:
-                self.movies['genre'] = self.movies['genres']
-            elif 'genre' in self.movies.columns and 'genres' not in self.movies.columns:
-                self.movies['genres'] = self.movies['genre']
-                
-            # Clean data
-            if 'release_date' in self.movies.columns:
-                self.movies['release_date'] = self.movies['release_date'].astype(str).str.split('(').str[0].str.strip()
-            self.movies['release_date'] = pd.to_datetime(self.movies['release_date'], errors='coerce')
+            sources = dataset_sources(self.data_dir)
+            self.movies_path = sources["movies"]
             
-            # Normalize genre separator to '|' (used by existing logic)
-            if 'genre' in self.movies.columns:
-                self.movies['genre'] = self.movies['genre'].str.replace(', ', '|').str.replace(',', '|')
+            snapshot = None
+            if self.use_snapshot:
+                snapshot = load_snapshot(self.snapshot_dir, sources, verify_sources=not self.pinned_snapshot)
+                if snapshot is None and self.pinned_snapshot:
+                    raise FileNotFoundError(f"No dataset snapshot at {self.snapshot_dir}")
+            if snapshot is not None:
+                # Cleaned, typed tables and recalculated stats, memory-mapped from disk
+                self.movies = snapshot["tables"]["movies"]
+                self.genre_year_stats = snapshot["tables"]["genre_year_stats"]
+                self.genre_overall_stats = snapshot["tables"]["genre_overall_stats"]
+                self.source_digests = snapshot["digests"]
+                self.version = snapshot["version"]
+                self.genre_stats = GenreStatsEngine.from_movies(self.movies)
+                loaded_from = f"snapshot {self.snapshot_dir}"
+            else:
+                self._load_csv(sources)
+                loaded_from = self.movies_path.name
+                if self.use_snapshot:
+                    try:
+                        self.write_snapshot()
+                        print(f"✅ Compiled dataset snapshot {self.version}")
+                    except Exception as e:
+                        print(f"⚠️ Could not write dataset snapshot: {e}")
             
-            # Fill missing ROI with 0
-            if 'roi' in self.movies.columns:
-                self.movies['roi'] = self.movies['roi'].fillna(0.0)
+            # Array-backed catalog for request-time similarity and aggregation
+            self.feature_store = FeatureStore(self.movies)
+            self.similarity_index = SimilarityIndex(self.feature_store)
+            self.combinations = GenreCombinationEngine(self.feature_store, self.movies, self._calculate_confidence)
+            self.genre_cube = GenreYearCube(self.genre_year_stats, self.genre_stats, self.movies)
+            self._check_genre_cube()
+            self.monte_carlo = MonteCarloEngine(self.movies)
+            self.portfolio = PortfolioOptimizer(self.genre_year_stats)
             
-            # Recalculate stats for accuracy
-            self._recalculate_genre_stats()
+            # Pre-built rows, sort orders and title/genre indexes for the explorer
+            self.movie_query = MovieQueryEngine(self.movies)
             
-            print(f"✅ Loaded {len(self.movies)} movies from {movies_path.name}")
+            print(f"✅ Loaded {len(self.movies)} movies from {loaded_from}")
             print(f"✅ Loaded {len(self.genre_year_stats)} genre-year statistics")
             print(f"✅ Loaded {len(self.genre_overall_stats)} genre overall statistics")
         except Exception as e:
             print(f"❌ Error loading data: {e}")
             raise
     
+    def _load_csv(self, sources: Dict[str, Path]):
+        """Parse and clean the CSV files"""
+        self.movies = pd.read_csv(sources["movies"])
+        self.genre_year_stats = pd.read_csv(sources["genre_year_stats"])
+        self.genre_overall_stats = pd.read_csv(sources["genre_overall_stats"])
+        
+        # Version token of the loaded files; cached responses are keyed by it
+        self.source_digests = {key: file_digest(path) for key, path in sources.items()}
+        self.version = hashlib.sha256(
+            "".join(self.source_digests[key] for key in ["movies", "genre_year_stats", "genre_overall_stats"]).encode()
+        ).hexdigest()[:16]
+        
+        self.movies = clean_movies(self.movies)
+        
+        # Recalculate stats for accuracy
+        self._recalculate_genre_stats()
+    
+    def write_snapshot(self, snapshot_dir: Optional[Path] = None) -> Path:
+        """Compile the loaded tables into the columnar snapshot"""
+        return write_snapshot(
+            snapshot_dir or self.snapshot_dir,
+            {
+                "movies": self.movies,
+                "genre_year_stats": self.genre_year_stats,
+                "genre_overall_stats": self.genre_overall_stats
+            },
+            dataset_sources(self.data_dir),
+            self.source_digests,
+            self.version
+        )
+    
+    @staticmethod
+    def _patch_stats(table: pd.DataFrame, keys: List[str], rows: Dict[tuple, Optional[Dict]]) -> pd.DataFrame:
+        """Copy of a statistics table with the given rows replaced, added or (None) removed"""
+        # Loaded tables may be read-only memory maps, and readers may hold the old one
+        table = table.copy()
+        positions = {key: i for i, key in enumerate(zip(*(table[k] for k in keys)))}
+        dropped, added = [], []
+        for key, row in rows.items():
+            position = positions.get(key)
+            if row is None:
+                if position is not None:
+                    dropped.append(position)
+            elif position is None:
+                added.append(row)
+            else:
+                for column, value in row.items():
+                    if column in table.columns:
+                        table.iat[position, table.columns.get_loc(column)] = value
+        if dropped:
+            table = table.drop(table.index[dropped])
+        if added:
+            table = pd.concat([table, pd.DataFrame(added)], ignore_index=True).sort_values(keys, kind='stable')
+        return table.reset_index(drop=True)
+    
+    def _check_genre_cube(self):
+        """Warn when the year-window totals over all years stop matching the overall statistics"""
+        mismatched = self.genre_cube.full_range_mismatches(self.genre_overall_stats)
+        if mismatched:
+            print(f"⚠️ Genre year-window totals disagree with the overall statistics for: {', '.join(mismatched)}")
+    
+    def update_genre_stats(self, append: List[Dict] = (), retract: List[Dict] = ()) -> Dict:
+        """Append or retract movies in the genre statistics without recomputing them"""
+        with self._stats_lock:
+            touched_overall, touched_yearly = self.genre_stats.apply(append, retract)
+            self.genre_overall_stats = self._patch_stats(
+                self.genre_overall_stats, ['genre'],
+                {(genre,): self.genre_stats.overall_row(genre) for genre in touched_overall}
+            )
+            self.genre_year_stats = self._patch_stats(
+                self.genre_year_stats, ['year', 'genre'],
+                {key: self.genre_stats.yearly_row(*key) for key in touched_yearly}
+            )
+            self.genre_cube = self.genre_cube.rebuild(self.genre_year_stats, self.genre_stats, self.movies)
+            self._check_genre_cube()
+            self.portfolio = PortfolioOptimizer(self.genre_year_stats)
+            
+            # New version token so cached analytics are not served for the old statistics
+            self.stats_revision += 1
+            self.version = hashlib.sha256(f"{self.version}:{self.stats_revision}".encode()).hexdigest()[:16]
+        
+        return {
+            "appended": len(append),
+            "retracted": len(retract),
+            "genres_updated": sorted(touched_overall),
+            "genre_years_updated": len(touched_yearly),
+            "version": self.version
+        }
+    
     def get_dashboard_summary(self) -> Dict:
         """Get summary statistics for dashboard KPIs"""
         total_movies = len(self.movies)
@@ -121,7 +293,7 @@ class DataService:
             top_latest_genre = None
             
         # AI Strategic Insight
-        strategic_insight = self.get_strategic_insight()
+        strategic_insight = self._shared_strategic_insight()
         
         # Capital Allocation
         capital_allocation = self.get_capital_allocation_strategy()
@@ -143,6 +315,14 @@ class DataService:
             "capital_allocation": capital_allocation
         }
     
+    def _shared_strategic_insight(self) -> Dict:
+        """Strategic insight computed once per dataset version"""
+        memo = self._insight_memo
+        if memo is None or memo[0] != self.version:
+            memo = (self.version, self.get_strategic_insight())
+            self._insight_memo = memo
+        return memo[1]
+
     def get_strategic_insight(self) -> Dict:
         """Generate dynamic strategic AI insight"""
         # Filter for genres with enough data
@@ -170,10 +350,21 @@ class DataService:
             merged['growth'] = (merged['total_box_office_2019'] - merged['total_box_office_2018']) / merged['total_box_office_2018'].replace(0, 1)
             rising_star = merged.nlargest(1, 'growth').iloc[0]['genre']
         
+        # Strategy from the two largest positions of the max-Sharpe portfolio
+        weights = self._recommended_weights()
+        if len(weights):
+            first, second = np.argsort(-weights, kind='stable')[:2].tolist()
+            strategy = (
+                f"Allocate {weights[first]:.0%} to {self.portfolio.genres[first]} and "
+                f"{weights[second]:.0%} to {self.portfolio.genres[second]} for the best risk-adjusted return."
+            )
+        else:
+            strategy = f"Allocate 50% to {safest['genre']} for stability and 20% to {rising_star} for growth."
+        
         insight_text = (
             f"Market Analysis: {top_roi['genre']} leads ROI at {top_roi['avg_roi']:.1f}x. "
             f"Risk Alert: {most_volatile['genre']} shows highest volatility (σ={most_volatile['roi_volatility']:.1f}). "
-            f"Recommended Strategy: Allocate 50% to {safest['genre']} for stability and 20% to {rising_star} for growth."
+            f"Recommended Strategy: {strategy}"
         )
         
         return {
@@ -184,17 +375,75 @@ class DataService:
             "market_phase": "Expansion" if reliable_stats['avg_roi'].mean() > 1.2 else "Consolidation"
         }
         
+    def _recommended_weights(self) -> np.ndarray:
+        """Max-Sharpe genre weights under the default cap, solved once per dataset version"""
+        memo = self._allocation_memo
+        if memo is None or memo[0] != self.version:
+            weights = np.zeros(0)
+            if self.portfolio.genres and len(self.portfolio.genres) * config.PORTFOLIO_MAX_WEIGHT >= 1:
+                weights = self.portfolio.optimize("max_sharpe", self.portfolio.caps(config.PORTFOLIO_MAX_WEIGHT))
+            memo = (self.version, weights)
+            self._allocation_memo = memo
+        return memo[1]
+
     def get_capital_allocation_strategy(self) -> Dict:
         """Generate capital allocation strategy based on current market risk"""
-        # Define modern SaaS style allocation categories
-        allocation = {
-            "Core (Low Risk)": 45,
-            "Growth (Moderate)": 35,
-            "Speculative (High)": 20
+        weights = self._recommended_weights()
+        if not len(weights):
+            return {"Core (Low Risk)": 45, "Growth (Moderate)": 35, "Speculative (High)": 20}
+        
+        # Max-Sharpe weights summed by volatility tercile of the genres
+        low, high = np.quantile(self.portfolio.volatility, [1 / 3, 2 / 3])
+        tier = np.digitize(self.portfolio.volatility, [low, high], right=True)
+        shares = np.bincount(tier, weights=weights, minlength=3) * 100
+        # Whole percentages that still add up to 100 (largest remainder)
+        percents = np.floor(shares).astype(int)
+        percents[np.argsort(-(shares - percents), kind='stable')[:100 - percents.sum()]] += 1
+        return {
+            "Core (Low Risk)": int(percents[0]),
+            "Growth (Moderate)": int(percents[1]),
+            "Speculative (High)": int(percents[2])
         }
-        
-        # Customize labels if needed based on data
-        return allocation
+
+    def optimize_portfolio(self, objective: str = "max_sharpe", max_weight: float = config.PORTFOLIO_MAX_WEIGHT,
+                           caps: Optional[Dict[str, float]] = None, genres: Optional[List[str]] = None,
+                           risk_aversion: float = 1.0, confidence: float = 0.95,
+                           budget: Optional[float] = None) -> Dict:
+        """Genre allocation for an objective under the budget and per-genre caps"""
+        bounds = self.portfolio.caps(max_weight, caps, genres)
+        weights = self.portfolio.optimize(objective, bounds, risk_aversion, confidence)
+        return {
+            "objective": objective,
+            "max_weight": max_weight,
+            "budget": budget,
+            **self.portfolio.describe(weights, confidence, budget)
+        }
+
+    def get_efficient_frontier(self, points: int = 50, max_weight: float = config.PORTFOLIO_MAX_WEIGHT,
+                               caps: Optional[Dict[str, float]] = None,
+                               genres: Optional[List[str]] = None) -> Dict:
+        """Mean-variance efficient frontier, from maximum return to minimum variance"""
+        bounds = self.portfolio.caps(max_weight, caps, genres)
+        frontier = self.portfolio.frontier(bounds, points)
+        best = int(np.argmax(frontier['sharpe']))
+        return {
+            "genres": self.portfolio.genres,
+            "max_weight": max_weight,
+            "max_sharpe_index": best,
+            "points": [
+                {
+                    "expected_roi": round(float(frontier['expected_roi'][i]), 4),
+                    "volatility": round(float(frontier['volatility'][i]), 4),
+                    "sharpe": round(float(frontier['sharpe'][i]), 4),
+                    "weights": [round(float(w), 4) for w in frontier['weights'][i]]
+                }
+                for i in range(points)
+            ]
+        }
+
+    def get_portfolio_inputs(self) -> Dict:
+        """Expected ROI, volatility and correlation of every genre the optimizer allocates to"""
+        return self.portfolio.summary()
 
     def get_ai_recommendation(self) -> Dict:
         """Generate dynamic AI recommendation based on 2019 trends and historical data"""
@@ -360,96 +609,62 @@ class DataService:
     def get_genre_popularity_over_time(self, year_range: Optional[List[int]] = None, 
                                        genres: Optional[List[str]] = None) -> List[Dict]:
         """Get genre popularity trends over time"""
-        data = self.genre_year_stats.copy()
-        
-        if year_range:
-            data = data[(data['year'] >= year_range[0]) & (data['year'] <= year_range[1])]
-        
-        if genres:
-            data = data[data['genre'].isin(genres)]
-        
-        return data[['year', 'genre', 'total_movies', 'avg_rating']].to_dict('records')
+        return self.genre_cube.popularity(year_range, genres)
     
     def get_highest_grossing_per_year(self, year_range: Optional[List[int]] = None) -> List[Dict]:
         """Get highest grossing genre per year"""
-        data = self.genre_year_stats.copy()
-        
-        if year_range:
-            data = data[(data['year'] >= year_range[0]) & (data['year'] <= year_range[1])]
-        
-        # Get top genre per year by box office
-        # We need to find the genre with max box office for each year
-        # The previous implementation had a bug or was slightly off using idxmax on groupby which works but we need to be careful
-        
-        # Group by year and find max total_box_office
-        # We want the whole row
-        idx = data.groupby('year')['total_box_office'].idxmax()
-        top_per_year = data.loc[idx]
-        
-        results = []
-        for _, row in top_per_year.iterrows():
-            year_movies = self.movies[self.movies['year'] == row['year']]
-            
-            # Since a movie can have multiple genres ("Action|Drama"), we check for containment
-            # The genre in row['genre'] comes from the exploded dataset, so it's a single genre
-            genre_movies = year_movies[year_movies['genre'].str.contains(row['genre'], na=False)]
-            
-            top_movie_name = "N/A"
-            if not genre_movies.empty:
-                top_movie = genre_movies.nlargest(1, 'box_office').iloc[0]
-                top_movie_name = top_movie['title']
-            
-            results.append({
-                'year': int(row['year']),
-                'genre': row['genre'],
-                'total_box_office': int(row['total_box_office']),
-                'top_movie': top_movie_name
-            })
-            
-        return results
+        # A movie can have multiple genres ("Action|Drama"); the cube's top movie of a
+        # genre-year is the highest grossing movie whose genre contains that genre
+        return self.genre_cube.highest_grossing(year_range)
     
     def get_top_genres_by_year(self, year: int, limit: int = 3) -> List[Dict]:
         """Get top N highest grossing genres for a specific year"""
-        data = self.genre_year_stats[self.genre_year_stats['year'] == year].copy()
-        
-        if data.empty:
-            return []
-            
-        # Sort by total box office
-        top_genres = data.nlargest(limit, 'total_box_office')
-        
         results = []
-        for i, row in top_genres.iterrows():
-            total_revenue = int(row['total_box_office'])
+        for genre, total_box_office in self.genre_cube.top_genres(year, limit):
+            total_revenue = int(total_box_office)
             
             # Formulate a result
             results.append({
                 'rank': len(results) + 1,
-                'genre': row['genre'],
+                'genre': genre,
                 'total_box_office': total_revenue,
                 'formatted_revenue': f"₹{total_revenue/10000000:.1f}Cr"
             })
             
         return results
     
-    def get_success_rate_by_genre(self, genres: Optional[List[str]] = None) -> List[Dict]:
-        """Get success rates by genre"""
+    def get_success_rate_by_genre(self, genres: Optional[List[str]] = None,
+                                  year_range: Optional[List[int]] = None) -> pd.DataFrame:
+        """Get success rates by genre, optionally over a year window"""
+        if year_range:
+            return pd.DataFrame(
+                self.genre_cube.window_totals(year_range, genres),
+                columns=['genre', 'success_rate', 'total_movies']
+            )
+        
         data = self.genre_overall_stats.copy()
         
         if genres:
             data = data[data['genre'].isin(genres)]
             
         # Add total movies to response for confidence badge
-        return data[['genre', 'success_rate', 'total_movies']].to_dict('records')
+        return data[['genre', 'success_rate', 'total_movies']]
     
-    def get_roi_by_genre(self, genres: Optional[List[str]] = None) -> List[Dict]:
-        """Get average ROI by genre"""
+    def get_roi_by_genre(self, genres: Optional[List[str]] = None,
+                         year_range: Optional[List[int]] = None) -> pd.DataFrame:
+        """Get average ROI by genre, optionally over a year window"""
+        if year_range:
+            return pd.DataFrame(
+                self.genre_cube.window_totals(year_range, genres),
+                columns=['genre', 'avg_roi', 'roi_volatility', 'total_movies']
+            )
+        
         data = self.genre_overall_stats.copy()
         
         if genres:
             data = data[data['genre'].isin(genres)]
         
-        return data[['genre', 'avg_roi', 'roi_volatility', 'total_movies']].to_dict('records')
+        return data[['genre', 'avg_roi', 'roi_volatility', 'total_movies']]
     
     def get_risk_analysis(self) -> List[Dict]:
         """Calculate risk scores and rankings for all genres"""
@@ -493,43 +708,23 @@ class DataService:
             'avg_roi', 'risk_score', 'risk_category', 'confidence', 'total_movies'
         ]].to_dict('records')
     
-    def get_genre_combinations(self) -> Dict:
-        """Analyze genre combinations from multi-genre movies"""
-        # Get movies with multiple genres
-        multi_genre_movies = self.movies[self.movies['genre'].str.contains('|', na=False, regex=False)]
+    def get_risk_overview(self) -> Dict:
+        """Risk analysis for all genres with the industry risk index"""
+        risk_data = self.get_risk_analysis()
         
-        combo_stats = []
-        
-        for genre_combo in multi_genre_movies['genre'].unique():
-            combo_movies = multi_genre_movies[multi_genre_movies['genre'] == genre_combo]
-            
-            # User wants to show all, but flag low confidence
-            # "If sample size small, show confidence warning."
-            
-            success_count = len(combo_movies[combo_movies['success_label'] == 'Hit'])
-            success_rate = (success_count / len(combo_movies)) * 100
-            avg_roi = combo_movies['roi'].mean()
-            total_revenue = combo_movies['box_office'].sum()
-            sample_size = len(combo_movies)
-            
-            combo_stats.append({
-                'combination': genre_combo,
-                'total_movies': sample_size,
-                'success_rate': round(success_rate, 2),
-                'avg_roi': round(avg_roi, 2),
-                'total_revenue': int(total_revenue),
-                'confidence': self._calculate_confidence(sample_size)
-            })
-        
-        # Sort by avg_roi
-        combo_stats_sorted = sorted(combo_stats, key=lambda x: x['avg_roi'], reverse=True)
+        # Calculate industry risk index (average risk score)
+        avg_risk = sum(item['risk_score'] for item in risk_data) / len(risk_data)
         
         return {
-            'top_10': combo_stats_sorted[:10],
-            'bottom_10': combo_stats_sorted[-10:],
-            'all_combinations': combo_stats_sorted
+            "genres": risk_data,
+            "industry_risk_index": round(avg_risk, 2)
         }
     
+    def get_genre_combinations(self, mode: str = 'exact', min_support: int = 1, sort_by: str = 'avg_roi',
+                               order: str = 'desc', limit: Optional[int] = None) -> Dict:
+        """Analyze genre combinations from multi-genre movies"""
+        return self.combinations.query(mode=mode, min_support=min_support, sort_by=sort_by, order=order, limit=limit)
+    
     def get_benchmark_data(self, genre_a: str, genre_b: str) -> Dict:
         """Compare two genres for benchmark dashboard"""
         stats_a = self.genre_overall_stats[self.genre_overall_stats['genre'] == genre_a]
@@ -575,10 +770,23 @@ class DataService:
         return {
             "roi_velocity": round(market_roi, 2),
             "sentiment": sentiment,
-            "top_growing_segment": self.get_strategic_insight().get('rising_star', 'N/A'),
+            "top_growing_segment": self._shared_strategic_insight().get('rising_star', 'N/A'),
             "risk_index": round(self.genre_overall_stats['roi_volatility'].mean(), 2)
         }
 
+    def get_dashboard_bootstrap(self, top_limit: int = 12) -> Dict:
+        """Every Executive Dashboard panel in one payload, sharing the strategic insight"""
+        return {
+            "version": self.version,
+            "summary": self.get_dashboard_summary(),
+            "ai_recommendation": self.get_ai_recommendation(),
+            "market_pulse": self.get_market_pulse(),
+            "strategic_insight": self._shared_strategic_insight(),
+            "capital_allocation": self.get_capital_allocation_strategy(),
+            "top_performers": self.get_top_performing_movies(top_limit),
+            "genres": self.get_all_genres()
+        }
+
     def get_top_performing_movies(self, limit: int = 12) -> List[Dict]:
         """Get top ROI movies for Explorer"""
         # Filter for movies with actual data
@@ -596,7 +804,7 @@ class DataService:
             for _, row in valid_movies.iterrows()
         ]
 
-    async def get_filtered_movies(
+    def get_filtered_movies(
         self, 
         page: int = 1, 
         limit: int = 20, 
@@ -607,58 +815,17 @@ class DataService:
         sort_order: str = "desc"
     ) -> Dict:
         """Filter, sort and paginate movies from the master dataset"""
-        df = self.movies.copy()
-        
-        # Filtering
-        if search:
-            df = df[df['title'].str.contains(search, case=False, na=False)]
-            
-        if genre and genre != "All":
-            df = df[df['genre'].str.contains(genre, case=False, na=False)]
-            
-        if success_label and success_label != "All":
-            df = df[df['success_label'] == success_label]
-            
-        # Sorting
-        ascending = sort_order.lower() == "asc"
-        if sort_by in df.columns:
-            df = df.sort_values(by=sort_by, ascending=ascending)
-        
-        # Pagination
-        total_count = len(df)
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        
-        paginated_df = df.iloc[start_idx:end_idx]
-        
-        # Format results
-        results = []
-        for _, row in paginated_df.iterrows():
-            # Handle genres which might be NaN
-            genres_val = row['genre'] if 'genre' in df.columns else row.get('genres', '')
-            if pd.isna(genres_val):
-                genres_val = ""
-                
-            results.append({
-                "title": row['title'],
-                "year": int(row['year']) if not pd.isna(row['year']) else 0,
-                "genres": genres_val,
-                "roi": round(float(row['roi']), 2) if not pd.isna(row['roi']) else 0.0,
-                "box_office": int(row['box_office']) if not pd.isna(row['box_office']) else 0,
-                "poster_url": row.get('poster_url', '') if not pd.isna(row.get('poster_url')) else '',
-                "imdb_rating": round(float(row['imdb_rating']), 1) if not pd.isna(row.get('imdb_rating', 0)) else 0.0,
-                "success_label": row.get('success_label', 'Unknown') if not pd.isna(row.get('success_label')) else 'Unknown'
-            })
-        
-        return {
-            "movies": results,
-            "total_count": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": int(np.ceil(total_count / limit))
-        }
+        return self.movie_query.query(
+            page=page,
+            limit=limit,
+            search=search,
+            genre=genre,
+            success_label=success_label,
+            sort_by=sort_by,
+            sort_order=sort_order
+        )
 
-    def load_genre_yearly(self) -> List[Dict]:
+    def load_genre_yearly(self) -> pd.DataFrame:
         """Load and clean genre-year statistics"""
         df = self.genre_year_stats.copy()
         numeric_cols = ["total_movies", "avg_rating", "avg_budget", 
@@ -666,15 +833,15 @@ class DataService:
         # Ensure all requested columns exist before conversion
         existing_cols = [c for c in numeric_cols if c in df.columns]
         df[existing_cols] = df[existing_cols].apply(pd.to_numeric, errors="coerce")
-        return df.fillna(0).to_dict('records')
+        return df.fillna(0)
 
-    def load_genre_overall(self) -> List[Dict]:
+    def load_genre_overall(self) -> pd.DataFrame:
         """Load and clean genre-overall statistics"""
         df = self.genre_overall_stats.copy()
         numeric_cols = ["total_movies", "avg_budget", "success_rate", "avg_roi", "roi_volatility"]
         existing_cols = [c for c in numeric_cols if c in df.columns]
         df[existing_cols] = df[existing_cols].apply(pd.to_numeric, errors="coerce")
-        return df.fillna(0).to_dict('records')
+        return df.fillna(0)
 
     def load_risk_data(self) -> pd.DataFrame:
         """Load and prepare risk analysis data"""
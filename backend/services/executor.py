@@ -0,0 +1,190 @@
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import config
+from services.profiling import profiled_call
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when a compute pool has no free worker or queue slot"""
+
+
+class ComputePool:
+    """Bounded thread pool that keeps CPU-bound service calls off the event loop.
+
+    Admission is capped at ``max_workers + max_queue`` calls in flight; beyond
+    that ``run`` fails fast with PoolSaturatedError instead of queueing, so
+    latency of cheap inline endpoints stays flat under heavy load. pandas,
+    NumPy and sklearn release the GIL in their hot loops, which makes threads
+    sufficient here without copying the services into worker processes.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.capacity = max_workers + max_queue
+        self._executor = self._create_executor()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _create_executor(self) -> Executor:
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"cineintel-{self.name}")
+
+    def _acquire(self):
+        """Reserve a slot or reject the call"""
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise PoolSaturatedError(
+                    f"{self.name} pool is saturated ({self.in_flight} calls in flight), retry shortly"
+                )
+            self.in_flight += 1
+
+    def _release(self, _future=None):
+        """Free a slot after the call finishes"""
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on the pool and await its result"""
+        self._acquire()
+        # Carry context variables (e.g. request-scoped settings, the request profile) into the worker thread
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(functools.partial(context.run, profiled_call, fn, *args, **kwargs))
+        except Exception:
+            self._release()
+            raise
+        # The slot is freed when the thread finishes, even if the awaiting request was cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict:
+        """Pool occupancy and counters"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queue_limit": self.max_queue,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+    def shutdown(self):
+        """Stop accepting work and wait for running calls"""
+        self._executor.shutdown(wait=True)
+
+
+class ProcessComputePool(ComputePool):
+    """Bounded pool of worker processes for NumPy loops that hold the GIL.
+
+    Workers are spawned rather than forked, since the server process runs
+    threads, and are started on first use. Functions and arguments must be
+    picklable; request context does not cross into the workers. ``map``
+    admits a whole fan-out as one call, so a simulation cannot be shed
+    halfway through.
+    """
+
+    def _create_executor(self) -> Executor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run a call on a worker process and await its result"""
+        self._acquire()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def map(self, fn: Callable, calls: Sequence[Tuple], window: Optional[int] = None) -> "MappedCalls":
+        """Run fn(*args) for every call, iterating (index, result) pairs as calls finish.
+
+        Admission happens here, so a saturated pool raises before anything
+        runs. At most ``window`` calls (default: one per worker) are queued
+        on the workers at a time.
+        """
+        self._acquire()
+        return MappedCalls(self, fn, calls, window or self.max_workers)
+
+
+class MappedCalls:
+    """Async iterator over the results of ProcessComputePool.map.
+
+    Holds one admission slot until every call has finished or the iterator
+    is closed; closing (or dropping) it early cancels calls not yet started.
+    """
+
+    def __init__(self, pool: ProcessComputePool, fn: Callable, calls: Sequence[Tuple], window: int):
+        self.pool = pool
+        self.fn = fn
+        self.calls = calls
+        self.window = window
+        self.submitted = 0
+        self.pending: Dict[asyncio.Future, int] = {}
+        self.finished: List[Tuple[int, asyncio.Future]] = []
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Tuple[int, Any]:
+        if self.closed:
+            raise StopAsyncIteration
+        try:
+            while not self.finished:
+                while self.submitted < len(self.calls) and len(self.pending) < self.window:
+                    future = self.pool._executor.submit(self.fn, *self.calls[self.submitted])
+                    self.pending[asyncio.wrap_future(future)] = self.submitted
+                    self.submitted += 1
+                if not self.pending:
+                    self.close()
+                    raise StopAsyncIteration
+                done, _ = await asyncio.wait(self.pending, return_when=asyncio.FIRST_COMPLETED)
+                self.finished += sorted((self.pending.pop(future), future) for future in done)
+            index, future = self.finished.pop(0)
+            return index, future.result()
+        except StopAsyncIteration:
+            raise
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        """Cancel calls not yet started and free the admission slot"""
+        if self.closed:
+            return
+        self.closed = True
+        for future in self.pending:
+            future.cancel()
+        self.pool._release()
+
+    async def aclose(self):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+# Analytics and explorer queries
+data_pool = ComputePool("data", config.DATA_POOL_WORKERS, config.DATA_POOL_QUEUE)
+
+# Model inference, kept separate so predictions cannot starve analytics
+ml_pool = ComputePool("ml", config.ML_POOL_WORKERS, config.ML_POOL_QUEUE)
+
+# Monte Carlo simulations; one worker per core unless configured
+simulation_pool = ProcessComputePool(
+    "simulation", config.SIMULATION_POOL_WORKERS or os.cpu_count() or 1, config.SIMULATION_POOL_QUEUE
+)
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+
+# Numeric columns held in the float32 feature matrix
+FEATURE_COLUMNS = ['budget', 'year', 'imdb_rating', 'runtime', 'roi']
+
+BITS_PER_WORD = 64
+
+# Population count of every byte value, used when np.bitwise_count is unavailable
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Count set bits of every uint64 element"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(words.shape + (8,))
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1)
+
+
+class FeatureStore:
+    """Compact NumPy view of the movie catalog, built once at load time"""
+
+    def __init__(self, movies: pd.DataFrame):
+        self.size = len(movies)
+        self.columns = list(FEATURE_COLUMNS)
+        self.column_index = {col: i for i, col in enumerate(self.columns)}
+
+        # Column-major so each feature is a contiguous vector
+        self.matrix = np.asfortranarray(
+            movies[self.columns].to_numpy(dtype=np.float32)
+        )
+        with np.errstate(invalid='ignore'):
+            self.log_budget = np.log1p(self.column('budget'))
+
+        # Genre name -> bit position, and one packed bitset row per movie
+        genre_series = movies['genre']
+        genre_hot = genre_series.fillna('').str.get_dummies(sep='|')
+        genre_hot = genre_hot.loc[:, genre_hot.columns != '']
+        self.genres: List[str] = genre_hot.columns.tolist()
+        self.genre_bits: Dict[str, int] = {g: i for i, g in enumerate(self.genres)}
+        self.words = max(1, -(-len(self.genres) // BITS_PER_WORD))
+
+        hot = genre_hot.to_numpy(dtype=np.uint64)
+        self.genre_bitset = np.zeros((self.size, self.words), dtype=np.uint64)
+        for bit in range(len(self.genres)):
+            word, offset = divmod(bit, BITS_PER_WORD)
+            self.genre_bitset[:, word] |= hot[:, bit] << np.uint64(offset)
+
+        # Exact genre strings as integer codes (-1 for missing), in first-seen order
+        codes, labels = pd.factorize(genre_series)
+        self.genre_codes = codes
+        self.genre_labels = np.asarray(labels, dtype=object)
+        self.multi_genre = genre_series.str.contains('|', na=False, regex=False).to_numpy()
+
+        self.is_hit = (movies['success_label'] == 'Hit').to_numpy()
+
+    def column(self, name: str) -> np.ndarray:
+        """Contiguous float32 vector of one feature"""
+        return self.matrix[:, self.column_index[name]]
+
+    def genre_mask(self, genre: Optional[str]) -> np.ndarray:
+        """Packed bitset for a '|'-separated genre string; unknown genres are ignored"""
+        mask = np.zeros(self.words, dtype=np.uint64)
+        if not genre:
+            return mask
+        for name in set(genre.split('|')):
+            bit = self.genre_bits.get(name)
+            if bit is not None:
+                word, offset = divmod(bit, BITS_PER_WORD)
+                mask[word] |= np.uint64(1) << np.uint64(offset)
+        return mask
+
+    def genre_masks(self, genres: List[Optional[str]]) -> np.ndarray:
+        """Packed bitsets for many genre strings, one row each"""
+        if not genres:
+            return np.zeros((0, self.words), dtype=np.uint64)
+        return np.vstack([self.genre_mask(g) for g in genres])
+
+    def genre_match_counts(self, mask: np.ndarray) -> np.ndarray:
+        """Number of genres each movie shares with the mask"""
+        return popcount(self.genre_bitset & mask).sum(axis=-1)
+
+    def genre_match_matrix(self, masks: np.ndarray) -> np.ndarray:
+        """Shared-genre counts for many masks against every movie (masks x movies)"""
+        return popcount(masks[:, None, :] & self.genre_bitset[None, :, :]).sum(axis=-1)
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+        """Indices of the k best scores, ties broken by position and NaN skipped"""
+        valid = np.flatnonzero(~np.isnan(scores))
+        if len(valid) == 0 or k <= 0:
+            return valid[:0]
+        keyed = -scores[valid] if largest else scores[valid]
+        if len(valid) > k:
+            # Keep every candidate tied with the k-th score so position breaks ties
+            kth = np.partition(keyed, k - 1)[k - 1]
+            valid = valid[keyed <= kth]
+            keyed = keyed[keyed <= kth]
+        order = np.lexsort((valid, keyed))
+        return valid[order[:k]]
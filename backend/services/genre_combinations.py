@@ -0,0 +1,157 @@
+import threading
+from itertools import combinations
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.feature_store import BITS_PER_WORD, FeatureStore, popcount
+
+
+# exact: genre strings as written; canonical: unordered genre sets;
+# pairs/triples: every 2-/3-genre subset of each movie's genres
+COMBINATION_MODES = ['exact', 'canonical', 'pairs', 'triples']
+SORTABLE_METRICS = ['avg_roi', 'success_rate', 'total_movies', 'total_revenue']
+
+
+class GenreCombinationEngine:
+    """Grouped aggregation engine behind /api/combinations.
+
+    Movie-level counts, hits, ROI and revenue are summed once per exact genre
+    string and once per distinct genre set using bincount. Pair and triple
+    statistics are rolled up from the distinct sets, not from the movies, so
+    only the (few) distinct sets are enumerated in Python. Each mode's rows
+    are built on first use and then only filtered and sorted per request.
+    """
+
+    def __init__(self, store: FeatureStore, movies: pd.DataFrame, confidence: Callable[[int], str]):
+        self.store = store
+        self.confidence = confidence
+        roi = movies['roi'].to_numpy(dtype=np.float64)
+        box_office = movies['box_office'].to_numpy(dtype=np.float64)
+        # Per-movie measures summed by every grouping
+        self._measures = np.vstack([
+            np.ones(store.size),
+            store.is_hit.astype(np.float64),
+            np.nan_to_num(roi),
+            (~np.isnan(roi)).astype(np.float64),
+            np.nan_to_num(box_office)
+        ])
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Dict] = {}
+
+    @staticmethod
+    def _sum_by_group(group_ids: np.ndarray, measures: np.ndarray, n_groups: int) -> np.ndarray:
+        """Sum every measure row per group id (measures x groups)"""
+        return np.vstack([np.bincount(group_ids, weights=m, minlength=n_groups) for m in measures])
+
+    def _genre_sets(self):
+        """Distinct genre sets of movies with 2+ genres, in first-seen order, with summed measures"""
+        store = self.store
+        rows = np.flatnonzero(popcount(store.genre_bitset).sum(axis=-1) >= 2)
+        sets, first_seen, inverse = np.unique(
+            store.genre_bitset[rows], axis=0, return_index=True, return_inverse=True
+        )
+        # Renumber np.unique's sorted groups by first appearance
+        order = np.argsort(first_seen, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        totals = self._sum_by_group(rank[inverse.ravel()], self._measures[:, rows], len(sets))
+        members = [self._set_bits(sets[i]) for i in order]
+        return members, totals
+
+    @staticmethod
+    def _set_bits(words: np.ndarray) -> List[int]:
+        """Genre bit positions of one packed bitset"""
+        return [
+            word * BITS_PER_WORD + offset
+            for word, value in enumerate(words.tolist())
+            for offset in range(BITS_PER_WORD) if value >> offset & 1
+        ]
+
+    def _aggregate(self, mode: str):
+        """Labels and summed measures of every group in a mode"""
+        store = self.store
+        if mode == 'exact':
+            rows = np.flatnonzero(store.multi_genre)
+            n_codes = len(store.genre_labels)
+            totals = self._sum_by_group(store.genre_codes[rows], self._measures[:, rows], n_codes)
+            # Codes are numbered in first-seen order, matching the original unique() order
+            present = np.flatnonzero(totals[0])
+            return [store.genre_labels[code] for code in present], totals[:, present]
+
+        members, set_totals = self._genre_sets()
+        if mode == 'canonical':
+            labels = ['|'.join(store.genres[bit] for bit in bits) for bits in members]
+            return labels, set_totals
+
+        # Roll distinct sets up into their k-genre subsets
+        size = 2 if mode == 'pairs' else 3
+        subset_ids: Dict[tuple, int] = {}
+        source, target = [], []
+        for set_index, bits in enumerate(members):
+            for subset in combinations(bits, size):
+                source.append(set_index)
+                target.append(subset_ids.setdefault(subset, len(subset_ids)))
+        totals = self._sum_by_group(
+            np.asarray(target, dtype=np.int64), set_totals[:, source], len(subset_ids)
+        ) if subset_ids else np.zeros((len(self._measures), 0))
+        labels = ['|'.join(store.genres[bit] for bit in subset) for subset in subset_ids]
+        return labels, totals
+
+    def _table(self, mode: str) -> Dict:
+        """Formatted rows and sortable metric arrays of a mode, built once"""
+        table = self._tables.get(mode)
+        if table is not None:
+            return table
+
+        labels, (counts, hits, roi_sums, roi_counts, revenue) = self._aggregate(mode)
+        rows = []
+        for label, sample_size, hit_count, roi_sum, roi_count, revenue_sum in zip(
+            labels, counts, hits, roi_sums, roi_counts, revenue
+        ):
+            sample_size = int(sample_size)
+            # User wants to show all, but flag low confidence
+            # "If sample size small, show confidence warning."
+            success_rate = (hit_count / sample_size) * 100
+            avg_roi = roi_sum / roi_count if roi_count else np.nan
+            rows.append({
+                'combination': label,
+                'total_movies': sample_size,
+                'success_rate': round(float(success_rate), 2),
+                'avg_roi': round(float(avg_roi), 2),
+                'total_revenue': int(revenue_sum),
+                'confidence': self.confidence(sample_size)
+            })
+
+        # Sort on the rounded values the client sees
+        table = {
+            'rows': rows,
+            **{metric: np.array([row[metric] for row in rows], dtype=np.float64) for metric in SORTABLE_METRICS}
+        }
+        with self._lock:
+            self._tables[mode] = table
+        return table
+
+    def query(self, mode: str = 'exact', min_support: int = 1, sort_by: str = 'avg_roi',
+              order: str = 'desc', limit: Optional[int] = None) -> Dict:
+        """Filtered, sorted combination rows; top/bottom 10 are taken before the limit"""
+        if mode not in COMBINATION_MODES:
+            raise ValueError(f"Unknown combination mode '{mode}'")
+        if sort_by not in SORTABLE_METRICS:
+            raise ValueError(f"Cannot sort combinations by '{sort_by}'")
+
+        table = self._table(mode)
+        keep = np.flatnonzero(table['total_movies'] >= min_support)
+        values = table[sort_by][keep]
+        keyed = -values if order.lower() == 'desc' else values
+        # Stable, so ties keep first-seen order; missing values sort last
+        ranked = keep[np.argsort(np.where(np.isnan(keyed), np.inf, keyed), kind='stable')]
+        rows = [table['rows'][i] for i in ranked]
+
+        return {
+            'top_10': rows[:10],
+            'bottom_10': rows[-10:],
+            'all_combinations': rows if limit is None else rows[:limit],
+            'total_combinations': len(rows)
+        }
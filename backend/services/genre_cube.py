@@ -0,0 +1,207 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.genre_stats import GenreStatsEngine
+
+
+# Additive genre-year measures kept as prefix sums along the year axis
+WINDOW_MEASURES = ['movies', 'box_office', 'hits', 'roi_count', 'roi_sum',
+                   'volatility_count', 'volatility_sum', 'volatility_sumsq']
+
+
+def top_movies_by_year(movies: pd.DataFrame, genre: str) -> Dict[int, str]:
+    """Title of the highest grossing movie per year whose 'genre' contains the given name"""
+    mask = movies['genre'].str.contains(genre, na=False) & movies['box_office'].notna() & movies['year'].notna()
+    matches = movies[mask]
+    if matches.empty:
+        return {}
+    years = matches['year'].to_numpy()
+    # Largest box office first within each year; ties keep table order like nlargest
+    order = np.lexsort((np.arange(len(matches)), -matches['box_office'].to_numpy(dtype=np.float64), years))
+    first = order[np.r_[True, years[order][1:] != years[order][:-1]]]
+    titles = matches['title'].to_numpy()
+    return {int(years[i]): titles[i] for i in first}
+
+
+class GenreYearCube:
+    """Dense genre x year arrays behind the /api/genre trend endpoints.
+
+    Cells hold the genre_year_stats values as loaded (so responses match the
+    table exactly) together with hit and ROI moments from the incremental
+    statistics; ROI volatility uses the engine's volatility moments, so the
+    full year range reproduces genre_overall_stats. Additive measures are prefix-summed along the year axis, so
+    totals over any year window and genre subset are two row lookups, and
+    the top movie of every (genre, year) is resolved once at build time.
+    Arrays are year-major: a year window is a contiguous block of rows.
+    """
+
+    def __init__(self, genre_year_stats: pd.DataFrame, stats: GenreStatsEngine, movies: pd.DataFrame,
+                 top_movies: Optional[Dict[str, Dict[int, str]]] = None):
+        self.genres: List[str] = sorted(genre_year_stats['genre'].unique().tolist())
+        self._genre_index = {genre: i for i, genre in enumerate(self.genres)}
+        if len(genre_year_stats):
+            self.first_year = int(genre_year_stats['year'].min())
+            last_year = int(genre_year_stats['year'].max())
+        else:
+            self.first_year, last_year = 0, -1
+        self.years = np.arange(self.first_year, last_year + 1)
+        shape = (len(self.years), len(self.genres))
+
+        rows = genre_year_stats['year'].to_numpy(dtype=np.int64) - self.first_year
+        cols = genre_year_stats['genre'].map(self._genre_index).to_numpy(dtype=np.int64)
+        self.present = np.zeros(shape, dtype=bool)
+        self.present[rows, cols] = True
+        self.total_movies = np.zeros(shape, dtype=np.int64)
+        self.total_movies[rows, cols] = genre_year_stats['total_movies'].to_numpy()
+        self.avg_rating = np.full(shape, np.nan)
+        self.avg_rating[rows, cols] = genre_year_stats['avg_rating'].to_numpy(dtype=np.float64)
+        self.total_box_office = np.zeros(shape)
+        self.total_box_office[rows, cols] = genre_year_stats['total_box_office'].to_numpy(dtype=np.float64)
+
+        cells = {name: np.zeros(shape) for name in WINDOW_MEASURES}
+        cells['movies'][:] = self.total_movies
+        cells['box_office'][:] = self.total_box_office
+        for (year, genre), acc in stats.yearly.items():
+            col = self._genre_index.get(genre)
+            row = year - self.first_year
+            if col is None or not 0 <= row < shape[0]:
+                continue
+            cells['hits'][row, col] = acc.hits
+            cells['roi_count'][row, col] = acc.roi.count
+            cells['roi_sum'][row, col] = acc.roi.mean * acc.roi.count
+        for (year, genre), moments in stats.yearly_volatility.items():
+            col = self._genre_index.get(genre)
+            row = year - self.first_year
+            if col is None or not 0 <= row < shape[0]:
+                continue
+            cells['volatility_count'][row, col] = moments.count
+            cells['volatility_sum'][row, col] = moments.mean * moments.count
+            cells['volatility_sumsq'][row, col] = moments.m2 + moments.mean * moments.mean * moments.count
+        # Leading zero row: the total over rows [a, b) is prefix[b] - prefix[a]
+        self._prefix = {
+            name: np.vstack([np.zeros((1, shape[1])), np.cumsum(values, axis=0)])
+            for name, values in cells.items()
+        }
+
+        # Top-movie lookups only depend on the movie table; reuse them across stats updates
+        self._top_movies = dict(top_movies or {})
+        for genre in self.genres:
+            if genre not in self._top_movies:
+                self._top_movies[genre] = top_movies_by_year(movies, genre)
+        self.top_movie = np.full(shape, None, dtype=object)
+        for col, genre in enumerate(self.genres):
+            for year, title in self._top_movies[genre].items():
+                if 0 <= year - self.first_year < shape[0]:
+                    self.top_movie[year - self.first_year, col] = title
+
+    def rebuild(self, genre_year_stats: pd.DataFrame, stats: GenreStatsEngine, movies: pd.DataFrame) -> "GenreYearCube":
+        """New cube over updated statistics, keeping the resolved top movies"""
+        return GenreYearCube(genre_year_stats, stats, movies, self._top_movies)
+
+    def _year_slice(self, year_range: Optional[List[int]]) -> slice:
+        """Rows of the years within an inclusive [start, end] range"""
+        if not year_range:
+            return slice(0, len(self.years))
+        start = min(max(year_range[0] - self.first_year, 0), len(self.years))
+        end = min(max(year_range[1] - self.first_year + 1, start), len(self.years))
+        return slice(start, end)
+
+    def _genre_columns(self, genres: Optional[List[str]]) -> np.ndarray:
+        """Columns of the known genres among the requested ones, in table order"""
+        if not genres:
+            return np.arange(len(self.genres))
+        return np.array(sorted({self._genre_index[g] for g in genres if g in self._genre_index}), dtype=np.int64)
+
+    def popularity(self, year_range: Optional[List[int]] = None, genres: Optional[List[str]] = None) -> List[Dict]:
+        """Movies and average rating of every genre-year in the window"""
+        years = self._year_slice(year_range)
+        cols = self._genre_columns(genres)
+        rows, picked = np.nonzero(self.present[years][:, cols])
+        rows = rows + years.start
+        cols = cols[picked]
+        return [
+            {
+                'year': int(self.years[r]),
+                'genre': self.genres[c],
+                'total_movies': int(self.total_movies[r, c]),
+                'avg_rating': float(self.avg_rating[r, c])
+            }
+            for r, c in zip(rows.tolist(), cols.tolist())
+        ]
+
+    def highest_grossing(self, year_range: Optional[List[int]] = None) -> List[Dict]:
+        """Top grossing genre of every year in the window with its top movie"""
+        years = self._year_slice(year_range)
+        present = self.present[years]
+        # argmax returns the first maximum, i.e. the first genre in table order
+        best = np.argmax(np.where(present, self.total_box_office[years], -np.inf), axis=1)
+        results = []
+        for offset in np.flatnonzero(present.any(axis=1)).tolist():
+            row, col = years.start + offset, int(best[offset])
+            top_movie = self.top_movie[row, col]
+            results.append({
+                'year': int(self.years[row]),
+                'genre': self.genres[col],
+                'total_box_office': int(self.total_box_office[row, col]),
+                'top_movie': top_movie if top_movie is not None else "N/A"
+            })
+        return results
+
+    def top_genres(self, year: int, limit: int = 3) -> List[Tuple[str, float]]:
+        """(genre, total box office) of the highest grossing genres of a year"""
+        row = year - self.first_year
+        if not 0 <= row < len(self.years):
+            return []
+        cols = np.flatnonzero(self.present[row])
+        ranked = cols[np.argsort(-self.total_box_office[row, cols], kind='stable')[:max(limit, 0)]]
+        return [(self.genres[c], float(self.total_box_office[row, c])) for c in ranked.tolist()]
+
+    def window_totals(self, year_range: Optional[List[int]] = None,
+                      genres: Optional[List[str]] = None) -> List[Dict]:
+        """Per-genre movies, hit rate and ROI over a year window, from the prefix sums"""
+        years = self._year_slice(year_range)
+        cols = self._genre_columns(genres)
+        totals = {
+            name: (prefix[years.stop] - prefix[years.start])[cols]
+            for name, prefix in self._prefix.items()
+        }
+        results = []
+        for i, col in enumerate(cols.tolist()):
+            movies = int(round(totals['movies'][i]))
+            if movies == 0:
+                continue
+            roi_count = int(round(totals['roi_count'][i]))
+            roi_sum = totals['roi_sum'][i]
+            volatility = 0.0
+            volatility_count = int(round(totals['volatility_count'][i]))
+            if volatility_count > 1:
+                volatility_sum = totals['volatility_sum'][i]
+                variance = (totals['volatility_sumsq'][i] - volatility_sum * volatility_sum / volatility_count) \
+                    / (volatility_count - 1)
+                volatility = math.sqrt(max(variance, 0.0))
+            results.append({
+                'genre': self.genres[col],
+                'total_movies': movies,
+                'total_box_office': float(totals['box_office'][i]),
+                'success_rate': float(totals['hits'][i] / movies * 100),
+                'avg_roi': float(roi_sum / roi_count) if roi_count else None,
+                'roi_volatility': volatility
+            })
+        return results
+
+    def full_range_mismatches(self, genre_overall_stats: pd.DataFrame) -> List[str]:
+        """Genres whose totals over every year differ from their genre_overall_stats row"""
+        totals = {row['genre']: row for row in self.window_totals()}
+        mismatched = []
+        for row in genre_overall_stats.to_dict('records'):
+            window = totals.get(row['genre'])
+            if window is None or window['total_movies'] != row['total_movies'] or not all(
+                np.isclose(np.nan if window[col] is None else window[col], row[col],
+                           rtol=1e-6, atol=1e-9, equal_nan=True)
+                for col in ('avg_roi', 'roi_volatility', 'success_rate')
+            ):
+                mismatched.append(row['genre'])
+        return mismatched
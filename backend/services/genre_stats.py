@@ -0,0 +1,351 @@
+import math
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Columns of genre_overall_statistics.csv and genre_year_statistics.csv
+OVERALL_COLUMNS = ['genre', 'total_movies', 'avg_budget', 'success_rate', 'avg_roi', 'roi_volatility']
+YEARLY_COLUMNS = ['year', 'genre', 'total_movies', 'avg_rating', 'avg_budget', 'total_box_office',
+                  'success_rate', 'avg_roi', 'roi_volatility']
+
+GENRE_SEPARATOR = re.compile(r'\s*[,|]\s*')
+
+
+def split_genres(value) -> List[str]:
+    """Genre names of a 'Drama, Romance' or 'Drama|Romance' string.
+
+    Repeated names are kept: the offline pipeline counts a movie once per listed genre.
+    """
+    if not isinstance(value, str):
+        return []
+    return [g for g in GENRE_SEPARATOR.split(value.strip()) if g]
+
+
+def split_volatility_genres(value) -> List[str]:
+    """Genre names of a 'genre' value as the volatility recalculation splits them (on '|' only)"""
+    if not isinstance(value, str):
+        return []
+    return value.replace(', ', '|').replace(',', '|').split('|')
+
+
+class RoiMoments:
+    """Count, mean and sum of squared deviations of ROI values (Welford's update)"""
+
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value: float):
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        # Welford's update run backwards
+        previous_mean = self.mean
+        self.count -= 1
+        self.mean = (previous_mean * (self.count + 1) - value) / self.count
+        self.m2 = max(self.m2 - (value - previous_mean) * (value - self.mean), 0.0)
+
+    def merge(self, other: "RoiMoments"):
+        """Fold another set of moments into this one (Chan et al. pairwise update)"""
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), 0 when undefined"""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class StatsAccumulator:
+    """Running totals of one genre or genre-year group"""
+
+    __slots__ = ('count', 'hits', 'budget_sum', 'box_office_sum', 'rating_count', 'rating_sum', 'roi')
+
+    def __init__(self):
+        self.count = 0
+        self.hits = 0
+        self.budget_sum = 0.0
+        self.box_office_sum = 0.0
+        self.rating_count = 0
+        self.rating_sum = 0.0
+        self.roi = RoiMoments()
+
+    def add(self, movie: Dict):
+        self.count += 1
+        self.hits += movie['hit']
+        self.budget_sum += movie['budget']
+        self.box_office_sum += movie['box_office']
+        if movie['imdb_rating'] is not None:
+            self.rating_count += 1
+            self.rating_sum += movie['imdb_rating']
+        if movie['roi'] is not None:
+            self.roi.add(movie['roi'])
+
+    def remove(self, movie: Dict):
+        if self.count == 0:
+            raise ValueError("Cannot retract a movie from an empty group")
+        self.count -= 1
+        self.hits -= movie['hit']
+        self.budget_sum -= movie['budget']
+        self.box_office_sum -= movie['box_office']
+        if movie['imdb_rating'] is not None:
+            self.rating_count -= 1
+            self.rating_sum -= movie['imdb_rating']
+        if movie['roi'] is not None:
+            self.roi.remove(movie['roi'])
+
+    def merge(self, other: "StatsAccumulator"):
+        """Fold another group's totals into this one"""
+        self.roi.merge(other.roi)
+        self.count += other.count
+        self.hits += other.hits
+        self.budget_sum += other.budget_sum
+        self.box_office_sum += other.box_office_sum
+        self.rating_count += other.rating_count
+        self.rating_sum += other.rating_sum
+
+    def summary(self) -> Dict:
+        """Group statistics as the offline pipeline reports them"""
+        return {
+            'total_movies': self.count,
+            'avg_rating': self.rating_sum / self.rating_count if self.rating_count else np.nan,
+            'avg_budget': self.budget_sum / self.count if self.count else np.nan,
+            'total_box_office': self.box_office_sum,
+            'success_rate': self.hits / self.count * 100 if self.count else np.nan,
+            'avg_roi': self.roi.mean if self.roi.count else np.nan,
+            'roi_volatility': self.roi.std()
+        }
+
+
+class GenreStatsEngine:
+    """Per-genre and per-genre-year statistics maintained incrementally.
+
+    Seeded from the movie table with one grouped aggregation, after which
+    append/retract touch only the accumulators of the movie's genres, so a
+    new release updates total_movies, avg_budget, success_rate, avg_roi and
+    roi_volatility in O(genres per movie). Definitions follow the offline
+    pipeline: genres come from the comma-separated 'genres' column and ROI is
+    defined only for movies with a budget.
+
+    The overall roi_volatility is the exception: it follows the recalculation
+    the service has always applied to the loaded table, over the '|'-split
+    'genre' column with missing ROI counted as 0, so its moments are kept
+    per genre (and per genre-year, for year windows) next to the
+    accumulators and updated by the same append and retract calls.
+    """
+
+    def __init__(self):
+        self.overall: Dict[str, StatsAccumulator] = {}
+        self.yearly: Dict[Tuple[int, str], StatsAccumulator] = {}
+        self.volatility: Dict[str, RoiMoments] = {}
+        self.yearly_volatility: Dict[Tuple[int, str], RoiMoments] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict:
+        # Partial engines are pickled between ingestion workers; the lock stays behind
+        return {'overall': self.overall, 'yearly': self.yearly,
+                'volatility': self.volatility, 'yearly_volatility': self.yearly_volatility}
+
+    def __setstate__(self, state: Dict):
+        self.overall = state['overall']
+        self.yearly = state['yearly']
+        self.volatility = state['volatility']
+        self.yearly_volatility = state['yearly_volatility']
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def movie_record(movie: Dict) -> Dict:
+        """Normalize a movie dict to the fields the accumulators use"""
+        budget = float(movie.get('budget') or 0.0)
+        box_office = float(movie.get('box_office') or 0.0)
+        roi = movie.get('roi')
+        if budget <= 0:
+            roi = None
+        elif roi is None or pd.isna(roi):
+            roi = box_office / budget
+        rating = movie.get('imdb_rating')
+        volatility_roi = movie.get('roi')
+        if volatility_roi is None or pd.isna(volatility_roi):
+            volatility_roi = box_office / budget if budget > 0 else 0.0
+        return {
+            'genres': split_genres(movie.get('genres') or movie.get('genre')),
+            # A movie without a 'genre' field is read like a table without the column
+            'volatility_genres': split_volatility_genres(movie['genre'] if 'genre' in movie else movie.get('genres')),
+            'volatility_roi': float(volatility_roi),
+            'year': int(movie['year']),
+            'budget': budget,
+            'box_office': box_office,
+            'imdb_rating': None if rating is None or pd.isna(rating) else float(rating),
+            'hit': int(movie.get('success_label') == 'Hit'),
+            'roi': None if roi is None else float(roi)
+        }
+
+    @classmethod
+    def from_movies(cls, movies: pd.DataFrame) -> "GenreStatsEngine":
+        """Seed every accumulator from the movie table in one grouped pass"""
+        genre_column = movies['genres'] if 'genres' in movies.columns else movies['genre']
+        has_budget = movies['budget'].fillna(0) > 0
+        exploded = pd.DataFrame({
+            'genre': genre_column.map(split_genres),
+            'year': movies['year'],
+            'hit': (movies['success_label'] == 'Hit').astype(np.int64),
+            'budget': movies['budget'].fillna(0.0),
+            'box_office': movies['box_office'].fillna(0.0),
+            'imdb_rating': movies['imdb_rating'],
+            'roi': movies['roi'].where(has_budget)
+        }).explode('genre').dropna(subset=['genre'])
+
+        engine = cls()
+        for keys, target in ((['genre'], engine.overall), (['year', 'genre'], engine.yearly)):
+            grouped = exploded.groupby(keys, sort=True).agg(
+                count=('hit', 'size'),
+                hits=('hit', 'sum'),
+                budget_sum=('budget', 'sum'),
+                box_office_sum=('box_office', 'sum'),
+                rating_count=('imdb_rating', 'count'),
+                rating_sum=('imdb_rating', 'sum'),
+                roi_count=('roi', 'count'),
+                roi_mean=('roi', 'mean'),
+                roi_var=('roi', 'var')
+            )
+            for key, row in zip(grouped.index, grouped.itertuples(index=False)):
+                acc = StatsAccumulator()
+                acc.count = int(row.count)
+                acc.hits = int(row.hits)
+                acc.budget_sum = float(row.budget_sum)
+                acc.box_office_sum = float(row.box_office_sum)
+                acc.rating_count = int(row.rating_count)
+                acc.rating_sum = float(row.rating_sum)
+                acc.roi = RoiMoments(
+                    int(row.roi_count),
+                    float(row.roi_mean) if row.roi_count else 0.0,
+                    float(row.roi_var) * (row.roi_count - 1) if row.roi_count > 1 else 0.0
+                )
+                target[(int(key[0]), key[1]) if len(keys) == 2 else key] = acc
+
+        volatility = pd.DataFrame({
+            'genre': (movies['genre'] if 'genre' in movies.columns else genre_column).map(split_volatility_genres),
+            'year': movies['year'],
+            'roi': movies['roi'].fillna(0.0)
+        }).explode('genre').dropna(subset=['genre'])
+        for keys, target in ((['genre'], engine.volatility), (['year', 'genre'], engine.yearly_volatility)):
+            grouped = volatility.groupby(keys, sort=True)['roi'].agg(['count', 'mean', 'var'])
+            for key, row in zip(grouped.index, grouped.itertuples(index=False)):
+                count = int(row.count)
+                target[(int(key[0]), key[1]) if len(keys) == 2 else key] = RoiMoments(
+                    count, float(row.mean), float(row.var) * (count - 1) if count > 1 else 0.0
+                )
+        return engine
+
+    def apply(self, append: Iterable[Dict] = (), retract: Iterable[Dict] = ()) -> Tuple[Set[str], Set[Tuple[int, str]]]:
+        """Add and remove movies; returns the genre and (year, genre) keys that changed"""
+        added = [self.movie_record(m) for m in append]
+        removed = [self.movie_record(m) for m in retract]
+        touched_overall: Set[str] = set()
+        touched_yearly: Set[Tuple[int, str]] = set()
+
+        with self._lock:
+            # Check retractions first so a bad request leaves every accumulator untouched
+            balance: Dict[tuple, int] = {}
+            for movie in added:
+                for genre in movie['genres']:
+                    for key in ((genre,), (movie['year'], genre)):
+                        balance[key] = balance.get(key, 0) + 1
+            for movie in removed:
+                for genre in movie['genres']:
+                    for key, groups in (((genre,), self.overall), ((movie['year'], genre), self.yearly)):
+                        group = groups.get(key[0] if len(key) == 1 else key)
+                        balance[key] = balance.get(key, 0) - 1
+                        if (group.count if group else 0) + balance[key] < 0:
+                            raise ValueError(f"Cannot retract more movies than recorded for {'/'.join(map(str, key))}")
+            for movie in added:
+                for genre in movie['volatility_genres']:
+                    for key in (('volatility', genre), ('volatility', movie['year'], genre)):
+                        balance[key] = balance.get(key, 0) + 1
+            for movie in removed:
+                for genre in movie['volatility_genres']:
+                    for key, groups in (((genre,), self.volatility), ((movie['year'], genre), self.yearly_volatility)):
+                        moments = groups.get(key[0] if len(key) == 1 else key)
+                        balance[('volatility', *key)] = balance.get(('volatility', *key), 0) - 1
+                        if (moments.count if moments else 0) + balance[('volatility', *key)] < 0:
+                            raise ValueError(f"Cannot retract more movies than recorded for {'/'.join(map(str, key))}")
+
+            for movie in added:
+                for genre in movie['genres']:
+                    self.overall.setdefault(genre, StatsAccumulator()).add(movie)
+                    self.yearly.setdefault((movie['year'], genre), StatsAccumulator()).add(movie)
+                    touched_overall.add(genre)
+                    touched_yearly.add((movie['year'], genre))
+                for genre in movie['volatility_genres']:
+                    self.volatility.setdefault(genre, RoiMoments()).add(movie['volatility_roi'])
+                    self.yearly_volatility.setdefault((movie['year'], genre), RoiMoments()).add(movie['volatility_roi'])
+                    if genre in self.overall:
+                        touched_overall.add(genre)
+            for movie in removed:
+                for genre in movie['genres']:
+                    self.overall[genre].remove(movie)
+                    self.yearly[(movie['year'], genre)].remove(movie)
+                    touched_overall.add(genre)
+                    touched_yearly.add((movie['year'], genre))
+                for genre in movie['volatility_genres']:
+                    self.volatility[genre].remove(movie['volatility_roi'])
+                    self.yearly_volatility[(movie['year'], genre)].remove(movie['volatility_roi'])
+                    if genre in self.overall:
+                        touched_overall.add(genre)
+        return touched_overall, touched_yearly
+
+    def merge(self, other: "GenreStatsEngine"):
+        """Fold the accumulators of an engine built over other movies into this one"""
+        with self._lock:
+            for groups, other_groups in ((self.overall, other.overall), (self.yearly, other.yearly)):
+                for key, acc in other_groups.items():
+                    groups.setdefault(key, StatsAccumulator()).merge(acc)
+            for groups, other_groups in ((self.volatility, other.volatility),
+                                         (self.yearly_volatility, other.yearly_volatility)):
+                for key, moments in other_groups.items():
+                    groups.setdefault(key, RoiMoments()).merge(moments)
+
+    def overall_row(self, genre: str) -> Optional[Dict]:
+        """genre_overall_statistics row of a genre, None if it has no movies"""
+        acc = self.overall.get(genre)
+        if acc is None or acc.count == 0:
+            return None
+        summary = acc.summary()
+        moments = self.volatility.get(genre)
+        summary['roi_volatility'] = moments.std() if moments else 0.0
+        return {'genre': genre, **{col: summary[col] for col in OVERALL_COLUMNS[1:]}}
+
+    def yearly_row(self, year: int, genre: str) -> Optional[Dict]:
+        """genre_year_statistics row of a genre-year, None if it has no movies"""
+        acc = self.yearly.get((year, genre))
+        if acc is None or acc.count == 0:
+            return None
+        summary = acc.summary()
+        return {'year': year, 'genre': genre, **{col: summary[col] for col in YEARLY_COLUMNS[2:]}}
+
+    def overall_frame(self) -> pd.DataFrame:
+        """Full genre_overall_statistics table"""
+        rows = [self.overall_row(genre) for genre in sorted(self.overall)]
+        return pd.DataFrame([row for row in rows if row], columns=OVERALL_COLUMNS)
+
+    def yearly_frame(self) -> pd.DataFrame:
+        """Full genre_year_statistics table"""
+        rows = [self.yearly_row(*key) for key in sorted(self.yearly)]
+        return pd.DataFrame([row for row in rows if row], columns=YEARLY_COLUMNS)
@@ -0,0 +1,82 @@
+import gzip
+import hashlib
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Request
+
+import config
+
+try:
+    import brotli
+except ImportError:  # optional: responses are offered gzip-only without it
+    brotli = None
+
+
+# Content codings we can produce, in order of preference when the client weighs them equally
+ENCODINGS = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+# (If-None-Match entity tags, Accept-Encoding) of the current request
+conditional_headers: ContextVar[Tuple[List[str], str]] = ContextVar("conditional_headers", default=([], ""))
+
+
+async def read_conditional_headers(request: Request):
+    """App-wide dependency: remember the validators and codings the client sent"""
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = [tag.strip() for tag in if_none_match.split(",") if tag.strip()]
+    conditional_headers.set((tags, request.headers.get("accept-encoding", "")))
+
+
+def entity_tag(key: Tuple) -> str:
+    """Strong ETag of a cached response; the key embeds the dataset version, so a reload changes it"""
+    return '"' + hashlib.sha256(repr(key).encode()).hexdigest()[:24] + '"'
+
+
+def coded_tag(etag: str, encoding: Optional[str]) -> str:
+    """Each content coding is its own representation and gets its own strong tag"""
+    return etag if encoding is None else f'{etag[:-1]}-{encoding}"'
+
+
+def not_modified(etag: str) -> bool:
+    """True when If-None-Match names this response in any of its codings (or is '*')"""
+    tags, _ = conditional_headers.get()
+    if not tags:
+        return False
+    variants = {coded_tag(etag, encoding) for encoding in [None] + ENCODINGS}
+    # If-None-Match uses the weak comparison
+    return any(tag == "*" or tag.removeprefix("W/") in variants for tag in tags)
+
+
+def preferred_encoding() -> Optional[str]:
+    """Best content coding the client accepts, honouring q-values; None for identity"""
+    _, accept_encoding = conditional_headers.get()
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress once at a high level; the result is kept alongside the cached body"""
+    if encoding == "br":
+        return brotli.compress(body, quality=config.BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=config.GZIP_LEVEL, mtime=0)
+
+
+def cache_control() -> str:
+    """Cache-Control of dataset-derived responses: revalidate with the ETag unless a max-age is set"""
+    if config.HTTP_MAX_AGE_SECONDS > 0:
+        return f"public, max-age={config.HTTP_MAX_AGE_SECONDS}, must-revalidate"
+    return "public, no-cache"
@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import pickle
+import shutil
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.data_service import clean_movies, parse_release_dates
+from services.genre_stats import GenreStatsEngine
+from services.snapshot import source_fingerprint
+
+
+# Column order of master_movies_dataset.csv
+MASTER_COLUMNS = [
+    'title', 'year', 'genres', 'budget', 'box_office', 'vote_count', 'runtime', 'production_companies',
+    'release_month', 'poster_url', 'original_language', 'roi', 'success_label', 'genre', 'imdb_rating',
+    'imdb_votes', 'release_date', 'language'
+]
+
+# Filled in by clean_movies when a raw dump does not carry them
+DERIVED_COLUMNS = {'roi', 'success_label', 'genre'}
+
+# TMDB export field names -> master column names
+RAW_COLUMN_ALIASES = {'revenue': 'box_office', 'poster_path': 'poster_url'}
+
+POSTER_BASE_URL = "https://image.tmdb.org/t/p/w500"
+
+DEFAULT_CHUNK_SIZE = 100_000
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def read_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Stream a raw CSV or JSON Lines dump as DataFrames of at most chunk_size rows"""
+    if path.suffix.lower() in ('.jsonl', '.ndjson'):
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False)
+    else:
+        reader = pd.read_csv(path, chunksize=chunk_size, low_memory=False)
+    with reader:
+        yield from reader
+
+
+def _genre_names(value) -> Optional[str]:
+    """Comma-separated genre names from a string, a list of names or a list of {id, name}"""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        names = [g.get('name') if isinstance(g, dict) else g for g in value]
+        return ', '.join(str(n) for n in names if n) or None
+    return value if isinstance(value, str) and value else None
+
+
+def normalize_raw(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Map a raw TMDB-style chunk onto the master dataset columns"""
+    movies = chunk.rename(columns=RAW_COLUMN_ALIASES)
+    if 'genres' in movies.columns:
+        movies['genres'] = movies['genres'].map(_genre_names)
+    if 'title' in movies.columns:
+        # Normalize present titles only; astype(str) would turn a missing one into "nan"
+        titles = movies['title'].dropna().astype(str).str.strip().str.lower()
+        movies['title'] = titles.where(titles != '').reindex(movies.index)
+    if 'poster_url' in movies.columns:
+        relative = movies['poster_url'].astype(str).str.startswith('/')
+        movies.loc[relative, 'poster_url'] = POSTER_BASE_URL + movies.loc[relative, 'poster_url']
+
+    # Year and month come from the release date when the dump has no separate fields
+    if 'release_date' not in movies.columns:
+        movies['release_date'] = np.nan
+    released = parse_release_dates(movies['release_date'])
+    if 'year' not in movies.columns:
+        movies['year'] = released.dt.year
+    if 'release_month' not in movies.columns:
+        movies['release_month'] = released.dt.month
+
+    for column in ['budget', 'box_office', 'vote_count', 'runtime']:
+        values = pd.to_numeric(movies[column], errors='coerce') if column in movies.columns else np.nan
+        movies[column] = pd.Series(values, index=movies.index).fillna(0)
+    movies['year'] = pd.to_numeric(movies['year'], errors='coerce')
+    movies = movies.dropna(subset=['title', 'year'])
+    movies['year'] = movies['year'].astype(np.int64)
+    movies['runtime'] = movies['runtime'].astype(np.int64)
+    return movies.reindex(columns=[c for c in MASTER_COLUMNS if c in movies.columns or c not in DERIVED_COLUMNS])
+
+
+def _process_chunk(index: int, chunk: pd.DataFrame, work_dir: str) -> Tuple[int, int]:
+    """Clean one chunk, write it as a headerless part file and save its partial statistics"""
+    movies = clean_movies(normalize_raw(chunk))
+    movies = movies.reindex(columns=MASTER_COLUMNS)
+    stats = GenreStatsEngine.from_movies(movies)
+
+    part = Path(work_dir) / f"part-{index:06d}"
+    movies.to_csv(f"{part}.csv.tmp", index=False, header=False, date_format='%Y-%m-%d')
+    with open(f"{part}.stats.tmp", 'wb') as f:
+        pickle.dump(stats, f, protocol=pickle.HIGHEST_PROTOCOL)
+    # Stats first: a chunk counts as done only once its .csv exists
+    os.replace(f"{part}.stats.tmp", f"{part}.stats")
+    os.replace(f"{part}.csv.tmp", f"{part}.csv")
+    return index, len(movies)
+
+
+class IngestionPipeline:
+    """Chunked, parallel and resumable ingestion of a raw movie dump.
+
+    The raw file is streamed in chunks; each chunk goes through the same
+    cleaning rules as DataService.load_data on a worker process, which
+    writes the cleaned rows as a part file and the chunk's genre statistics
+    as mergeable accumulators. At most a few chunks per worker are in flight,
+    so memory stays bounded regardless of input size. Completed chunks are
+    recorded in a checkpoint, and a rerun over the same input skips them.
+    Finally the parts are concatenated into master_movies_dataset.csv and the
+    merged accumulators are written as both statistics tables.
+    """
+
+    def __init__(self, source: str, output_dir: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 workers: Optional[int] = None, work_dir: Optional[str] = None):
+        self.source = Path(source)
+        self.output_dir = Path(output_dir)
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.work_dir = Path(work_dir) if work_dir else self.output_dir / ".ingest"
+
+    def _checkpoint_key(self) -> Dict:
+        return {"source": str(self.source.resolve()), **source_fingerprint(self.source), "chunk_size": self.chunk_size}
+
+    def _load_checkpoint(self) -> Dict[int, int]:
+        """Row counts of chunks already completed for this exact input"""
+        path = self.work_dir / CHECKPOINT_FILE
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("input") == self._checkpoint_key():
+                return {
+                    int(i): rows for i, rows in checkpoint["completed"].items()
+                    if (self.work_dir / f"part-{int(i):06d}.csv").exists()
+                }
+            print("⚠️ Input changed since the last checkpoint, starting over")
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        self.work_dir.mkdir(parents=True)
+        return {}
+
+    def _save_checkpoint(self, completed: Dict[int, int]):
+        path = self.work_dir / CHECKPOINT_FILE
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"input": self._checkpoint_key(), "completed": completed}, f)
+        os.replace(tmp_path, path)
+
+    def run(self) -> Dict:
+        """Ingest the whole source and write the three dataset files"""
+        completed = self._load_checkpoint()
+        resumed = len(completed)
+        chunks = 0
+        max_in_flight = self.workers * 2
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            in_flight = set()
+            try:
+                for index, chunk in enumerate(read_chunks(self.source, self.chunk_size)):
+                    chunks = index + 1
+                    if index in completed:
+                        continue
+                    # Backpressure: stop reading until a worker frees up
+                    while len(in_flight) >= max_in_flight:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        completed.update(future.result() for future in done)
+                        self._save_checkpoint(completed)
+                    in_flight.add(pool.submit(_process_chunk, index, chunk, str(self.work_dir)))
+                for future in in_flight:
+                    completed.update([future.result()])
+            finally:
+                # Let running chunks finish and keep them for the next run, even after a failure
+                for future in in_flight:
+                    future.cancel()
+                wait(in_flight)
+                completed.update(
+                    f.result() for f in in_flight if not f.cancelled() and f.exception() is None
+                )
+                self._save_checkpoint(completed)
+
+        stats = self._assemble(chunks)
+        rows = sum(completed[index] for index in range(chunks))
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        print(f"✅ Ingested {rows} movies from {self.source.name} in {chunks} chunks ({resumed} resumed)")
+        return {"movies": rows, "chunks": chunks, "resumed_chunks": resumed,
+                "genres": len(stats.overall), "genre_years": len(stats.yearly)}
+
+    def _assemble(self, chunks: int):
+        """Concatenate the parts in order and merge their statistics"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        movies_path = self.output_dir / "master_movies_dataset.csv"
+        stats = GenreStatsEngine()
+
+        tmp_path = movies_path.with_name(f"{movies_path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8", newline="") as out:
+            out.write(",".join(MASTER_COLUMNS) + "\n")
+            for index in range(chunks):
+                part = self.work_dir / f"part-{index:06d}"
+                with open(f"{part}.csv", encoding="utf-8", newline="") as f:
+                    shutil.copyfileobj(f, out)
+                with open(f"{part}.stats", "rb") as f:
+                    stats.merge(pickle.load(f))
+
+        # Statistics first, so a reader that sees the new movies file also sees matching stats
+        for name, frame in (("genre_year_statistics.csv", stats.yearly_frame()),
+                            ("genre_overall_statistics.csv", stats.overall_frame())):
+            target = self.output_dir / name
+            frame.to_csv(target.with_name(f"{name}.tmp"), index=False)
+            os.replace(target.with_name(f"{name}.tmp"), target)
+        os.replace(tmp_path, movies_path)
+        return stats
+
+
+if __name__ == "__main__":
+    # python -m services.ingest raw_movies.csv --output ../movie-data-pipeline
+    parser = argparse.ArgumentParser(description="Clean a raw movie dump into the CineIntel dataset files")
+    parser.add_argument("source", help="raw CSV or JSON Lines (.jsonl) dump")
+    parser.add_argument("--output", default="../movie-data-pipeline", help="dataset directory to write")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--work-dir", default=None, help="part files and checkpoint (default: <output>/.ingest)")
+    args = parser.parse_args()
+
+    IngestionPipeline(args.source, args.output, args.chunk_size, args.workers, args.work_dir).run()
@@ -0,0 +1,117 @@
+import asyncio
+import hmac
+import time
+from typing import Optional
+
+import config
+from services.metrics import metrics
+from services.profiling import ProfileStore, RequestProfile, current_profile
+
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+
+profile_store = ProfileStore(config.PROFILE_KEEP)
+
+
+class InstrumentationMiddleware:
+    """ASGI middleware recording per-route latency, status and response size.
+
+    Latency runs until the last body chunk is sent, so it includes
+    serialization and streaming. Requests are labelled by their route
+    template (/api/movies/{movie_id}), never the raw path, to keep the
+    number of series bounded.
+
+    Sampling profiles are opt-in: a request with an ``X-Profile: 1`` header
+    and a matching ``X-Admin-Token`` (none without a configured token) is sampled
+    from the start and answered with an ``X-Profile-Id`` header; with a slow
+    threshold set, any request still running after the threshold starts
+    being sampled. At most PROFILE_MAX_ACTIVE profiles sample at a time; a
+    request only takes a slot once its sampling starts. Pool threads join a
+    profile while they run one of its calls. The event loop thread is shared
+    by every request in flight, so only header-triggered profiles sample it,
+    and their loop stacks include whatever else the loop runs meanwhile.
+    Finished profiles are kept in ``profile_store``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.active_profiles = 0
+
+    def _profile_trigger(self, scope) -> Optional[str]:
+        headers = dict(scope["headers"])
+        if headers.get(PROFILE_HEADER, b"").strip() in (b"1", b"true"):
+            token = headers.get(ADMIN_TOKEN_HEADER, b"").decode("latin-1")
+            if config.ADMIN_TOKEN and hmac.compare_digest(token, config.ADMIN_TOKEN):
+                return "header"
+        if config.PROFILE_SLOW_MS > 0:
+            return "slow"
+        return None
+
+    def _start_profile(self, profile: RequestProfile):
+        """Begin sampling if a profile slot is free; the slot is released when the request ends"""
+        if self.active_profiles < config.PROFILE_MAX_ACTIVE:
+            self.active_profiles += 1
+            profile.start()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        method = scope["method"]
+        status = 500
+        size = 0
+        profile = None
+        timer = None
+        trigger = self._profile_trigger(scope)
+        if trigger is not None:
+            profile = RequestProfile(method, scope["path"], trigger, config.PROFILE_INTERVAL_MS / 1000)
+            # Pool threads join via the context
+            token = current_profile.set(profile)
+            if trigger == "header":
+                profile.enter_thread()
+                self._start_profile(profile)
+            else:
+                timer = asyncio.get_running_loop().call_later(
+                    config.PROFILE_SLOW_MS / 1000, self._start_profile, profile
+                )
+
+        async def send_with_metrics(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if profile is not None and profile.sampling and trigger == "header":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (PROFILE_ID_HEADER, str(profile.id).encode())
+                    ]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = scope.get("route")
+            template = route.path if route is not None and hasattr(route, "path") else "unmatched"
+            metrics.http_requests.inc(method, template, str(status))
+            metrics.http_latency.observe(elapsed, method, template)
+            metrics.http_response_size.observe(size, method, template)
+
+            if profile is not None:
+                if timer is not None:
+                    timer.cancel()
+                profile.stop()
+                if trigger == "header":
+                    profile.exit_thread()
+                current_profile.reset(token)
+                if profile.sampling:
+                    self.active_profiles -= 1
+                    profile.route = template
+                    profile.status = status
+                    profile.duration = elapsed
+                    profile_store.add(profile)
+                    print(f"⚠️ Profiled {method} {scope['path']} ({trigger}): {elapsed * 1000:.0f} ms, profile {profile.id}")
@@ -0,0 +1,178 @@
+import bisect
+import functools
+import inspect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+
+# Seconds; service calls range from sub-millisecond lookups to model training
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Bytes; from small KPI payloads to the full explorer and combination tables
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter per label combination"""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, count in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, values)} {_format_value(count)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label combination, in the Prometheus layout"""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...], buckets: Iterable[float]):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            # Index len(buckets) is the +Inf bucket
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = sorted((values, list(series)) for values, series in self._series.items())
+        for values, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(float(bound))
+                labels = _format_labels(self.labels + ("le",), values + (le,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide metrics, rendered in the Prometheus text exposition format.
+
+    Counters and histograms are updated on the request path; gauges (pool
+    occupancy, cache size) are read from their owners at scrape time through
+    registered collectors, so nothing is sampled in the background.
+    """
+
+    def __init__(self):
+        self.http_requests = Counter(
+            "cineintel_http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+        )
+        self.http_latency = Histogram(
+            "cineintel_http_request_duration_seconds", "Time from request to last response byte",
+            ("method", "route"), LATENCY_BUCKETS
+        )
+        self.http_response_size = Histogram(
+            "cineintel_http_response_size_bytes", "Response body size", ("method", "route"), SIZE_BUCKETS
+        )
+        self.service_latency = Histogram(
+            "cineintel_service_call_duration_seconds", "DataService and MLService method latency",
+            ("service", "method"), LATENCY_BUCKETS
+        )
+        self.service_errors = Counter(
+            "cineintel_service_call_errors_total", "Service method calls that raised", ("service", "method")
+        )
+        self.cache_lookups = Counter(
+            "cineintel_response_cache_lookups_total", "Response cache lookups by result", ("method", "result")
+        )
+        self.serialize_latency = Histogram(
+            "cineintel_serialize_duration_seconds", "Time to compute and JSON-encode a cached response",
+            ("method",), LATENCY_BUCKETS
+        )
+        self.payload_size = Histogram(
+            "cineintel_payload_size_bytes", "Serialized size of cached responses", ("method",), SIZE_BUCKETS
+        )
+        self._metrics = [
+            self.http_requests, self.http_latency, self.http_response_size, self.service_latency,
+            self.service_errors, self.cache_lookups, self.serialize_latency, self.payload_size
+        ]
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def add_collector(self, collector: Callable[[], List[str]]):
+        """Register a callable returning exposition lines, evaluated on every scrape"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def gauge_lines(name: str, documentation: str, labels: Tuple[str, ...],
+                samples: Iterable[Tuple[Tuple, float]], kind: str = "gauge") -> List[str]:
+    """Exposition lines for values read at scrape time"""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for values, value in samples:
+        lines.append(f"{name}{_format_labels(labels, values)} {_format_value(value)}")
+    return lines
+
+
+metrics = MetricsRegistry()
+
+
+def instrumented(service: str):
+    """Class decorator timing every public method into cineintel_service_call_duration_seconds"""
+    def decorate(cls):
+        for name, member in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.isfunction(member):
+                continue
+            setattr(cls, name, _timed(service, name, member))
+        return cls
+    return decorate
+
+
+def _timed(service: str, name: str, fn: Callable) -> Callable:
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            metrics.service_errors.inc(service, name)
+            raise
+        finally:
+            metrics.service_latency.observe(time.perf_counter() - started, service, name)
+    return wrapper
@@ -3,21 +3,129 @@ import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+import config
+from services.compiled_forest import CompiledForest
 from services.data_service import DataService
+from services.metrics import instrumented
+from services.model_store import ModelStore
 
 
+# Hyperparameters of the serving forest; part of the artifact key
+MODEL_PARAMS = {
+    'n_estimators': 100,
+    'max_depth': 10,
+    'min_samples_split': 5,
+    'random_state': 42,
+    'class_weight': 'balanced'
+}
+
+# Train/test split used to report accuracy; part of the artifact key
+SPLIT_PARAMS = {
+    'test_size': 0.2,
+    'random_state': 42
+}
+
+NUMERICAL_FEATURES = ['budget', 'year', 'imdb_rating', 'runtime', 'release_month']
+
+# Largest batch scored by the compiled forest; beyond it sklearn's Cython traversal is faster.
+# Both give identical probabilities.
+COMPILED_MAX_ROWS = 1000
+
+# Weights of the similar-movie score (genre overlap, budget, year, rating, runtime)
+SIMILARITY_WEIGHTS = {'genre': 30, 'budget': 25, 'year': 15, 'imdb_rating': 20, 'runtime': 10}
+
+# Upper bound on similarity matrix cells scored at once in batch mode
+SIMILARITY_CHUNK_CELLS = 2_000_000
+
+# Year and IMDb rating the Investment Simulator scores plans at (the rating is the catalog median)
+SIMULATOR_YEAR = 2024
+
+
+def sweep_values(low: float, high: float, steps: int, log: bool = False, integer: bool = False) -> List[float]:
+    """Evenly spaced sweep points from low to high (geometric when log); integers are rounded and deduplicated"""
+    values = np.geomspace(low, high, steps) if log else np.linspace(low, high, steps)
+    if integer:
+        return np.unique(np.round(values).astype(np.int64)).tolist()
+    return values.tolist()
+
+
+@instrumented("ml_service")
 class MLService:
     """Machine Learning service for movie success prediction"""
     
-    def __init__(self, data_service: DataService):
+    def __init__(self, data_service: DataService, model_store: Optional[ModelStore] = None,
+                 model_key: Optional[str] = None):
         self.data_service = data_service
+        self.model_store = model_store or ModelStore()
         self.model = None
+        self.forest: Optional[CompiledForest] = None
+        self.model_key = None
         self.label_encoder = LabelEncoder()
         self.genre_columns = []
         self.feature_names = []
         self.model_accuracy = 0.0
-        self.train_model()
+        self.confusion_matrix = []
+        self.model_info = {'estimator': 'random_forest', 'params': MODEL_PARAMS}
+        self._feature_importance = None
+        
+        # A pinned artifact (a shared build's model) is loaded as is, never retrained
+        if model_key is not None:
+            self.model_key = model_key
+            if not self.load_model():
+                raise FileNotFoundError(f"Model artifact {model_key} not found in {self.model_store.store_dir}")
+            return
+        
+        # A model published by the offline search for this dataset takes precedence
+        dataset_digest = self.data_service.source_digests['movies']
+        self.model_key = self.model_store.published_key(dataset_digest)
+        if self.model_key is not None and self.load_model():
+            return
+        
+        # Cold start is a file load; only refit when the data or hyperparameters change
+        self.model_key = self.model_store.artifact_key(
+            dataset_digest,
+            {'model': MODEL_PARAMS, 'split': SPLIT_PARAMS}
+        )
+        if not self.load_model():
+            self.train_model()
+            self.save_model()
+    
+    def load_model(self) -> bool:
+        """Load the trained model from the artifact store"""
+        artifact = self.model_store.load(self.model_key)
+        if artifact is None:
+            return False
+        
+        self.model = artifact['model']
+        self.forest = CompiledForest.from_estimator(self.model)
+        self.label_encoder = artifact['label_encoder']
+        self.feature_names = artifact['feature_names']
+        self.genre_columns = artifact['genre_columns']
+        self.model_accuracy = artifact['accuracy']
+        self.confusion_matrix = artifact['confusion_matrix']
+        self.model_info = artifact.get('model_info', {'estimator': 'random_forest', 'params': MODEL_PARAMS})
+        self._feature_importance = None
+        
+        print(f"✅ ML Model loaded from artifact {self.model_key} (accuracy: {self.model_accuracy:.2%})")
+        return True
+    
+    def save_model(self):
+        """Persist the trained model to the artifact store"""
+        try:
+            path = self.model_store.save(self.model_key, {
+                'model': self.model,
+                'label_encoder': self.label_encoder,
+                'feature_names': self.feature_names,
+                'genre_columns': self.genre_columns,
+                'accuracy': self.model_accuracy,
+                'confusion_matrix': self.confusion_matrix,
+                'model_info': self.model_info
+            })
+            print(f"✅ ML Model artifact saved to {path}")
+        except Exception as e:
+            # A read-only store should not prevent serving the freshly trained model
+            print(f"⚠️ Could not save model artifact: {e}")
     
     def prepare_features(self, df: pd.DataFrame, is_training: bool = False) -> pd.DataFrame:
         """Prepare features for ML model"""
@@ -34,7 +142,7 @@ class MLService:
         # If training, set the global genre columns and feature names
         if is_training:
             self.genre_columns = [f'genre_{g}' for g in sorted(input_genres)]
-            self.feature_names = self.genre_columns + ['budget', 'year', 'imdb_rating', 'runtime', 'release_month']
+            self.feature_names = self.genre_columns + NUMERICAL_FEATURES
         
         # Create binary columns for genres found in input
         for genre in sorted(input_genres):
@@ -43,54 +151,99 @@ class MLService:
             )
         
         # Fill missing values for numerical cols
-        numerical_cols = ['budget', 'year', 'imdb_rating', 'runtime', 'release_month']
-        for col in numerical_cols:
+        for col in NUMERICAL_FEATURES:
             if col in data.columns:
                 data[col] = data[col].fillna(data[col].median())
         
         return data
     
+    def build_feature_matrix(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Build the model input for many rows at once, aligned to the training features"""
+        # Multi-hot encode genres in one pass instead of one apply per genre
+        genre_names = [col[len('genre_'):] for col in self.genre_columns]
+        dummies = df['genre'].fillna('').str.get_dummies(sep='|')
+        X = dummies.reindex(columns=genre_names, fill_value=0)
+        X.columns = self.genre_columns
+        X.index = df.index
+        
+        # Features absent from the input are zero, as in single predictions
+        for col in NUMERICAL_FEATURES:
+            if col in df.columns:
+                X[col] = df[col].fillna(df[col].median())
+            else:
+                X[col] = 0
+        
+        return X[self.feature_names]
+    
+    def feature_row(self, genre: Optional[str], **values) -> pd.DataFrame:
+        """Model input for a single movie without per-column pandas work; matches build_feature_matrix"""
+        genres = set(genre.split('|')) if isinstance(genre, str) else set()
+        row = [1.0 if col[len('genre_'):] in genres else 0.0 for col in self.genre_columns]
+        # Features absent from the input are zero; missing values stay missing
+        row += [np.nan if values.get(col, 0) is None else values.get(col, 0) for col in NUMERICAL_FEATURES]
+        return pd.DataFrame(np.array([row], dtype=np.float64), columns=self.feature_names)
+    
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        """Class probabilities of feature rows, from the compiled forest when it applies"""
+        if self.forest is not None and len(X) <= COMPILED_MAX_ROWS:
+            return self.forest.predict_proba(X)
+        return self.model.predict_proba(X)
+    
+    def _risk_level(self, hit_prob: float):
+        """Map a hit probability to a risk level and display color"""
+        if hit_prob > 60:
+            return 'Low', '#10b981' # Emerald
+        if hit_prob > 35:
+            return 'Moderate', '#f59e0b' # Amber
+        return 'High', '#ef4444' # Rose
+    
+    def training_split(self) -> Tuple[pd.DataFrame, pd.DataFrame, np.ndarray, np.ndarray]:
+        """Train/test split of the labelled catalog; also fixes the feature layout and label encoding"""
+        movies = self.data_service.movies.copy()
+        
+        # Remove rows with missing critical data
+        movies = movies.dropna(subset=['success_label', 'budget', 'runtime', 'release_month'])
+        
+        # For training, fill IMDb rating if missing
+        movies['imdb_rating'] = movies['imdb_rating'].fillna(movies['imdb_rating'].median())
+        
+        # Prepare features
+        movies_processed = self.prepare_features(movies, is_training=True)
+        X = movies_processed[self.feature_names]
+        
+        # Encode target labels
+        y = self.label_encoder.fit_transform(movies['success_label'])
+        
+        return train_test_split(X, y, stratify=y, **SPLIT_PARAMS)
+    
+    def install_model(self, model, X_test: pd.DataFrame, y_test: np.ndarray, model_info: Dict):
+        """Serve a fitted model, scoring it on the held-out split"""
+        from sklearn.metrics import confusion_matrix
+        
+        # Single-row predictions would pay for a thread pool on every call
+        if 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=None)
+        self.model = model
+        self.forest = CompiledForest.from_estimator(model)
+        self.model_info = model_info
+        self._feature_importance = None
+        
+        # Calculate accuracy
+        self.model_accuracy = self.model.score(X_test, y_test)
+        
+        # Calculate confusion matrix
+        y_pred = self.model.predict(X_test)
+        self.confusion_matrix = confusion_matrix(y_test, y_pred).tolist()
+    
     def train_model(self):
         """Train Random Forest model"""
         try:
-            movies = self.data_service.movies.copy()
-            
-            # Remove rows with missing critical data
-            movies = movies.dropna(subset=['success_label', 'budget', 'runtime', 'release_month'])
-            
-            # For training, fill IMDb rating if missing
-            movies['imdb_rating'] = movies['imdb_rating'].fillna(movies['imdb_rating'].median())
-            
-            # Prepare features
-            movies_processed = self.prepare_features(movies, is_training=True)
-            X = movies_processed[self.feature_names]
-            
-            # Encode target labels
-            y = self.label_encoder.fit_transform(movies['success_label'])
-            
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y
-            )
-            
-            # Train Random Forest
-            self.model = RandomForestClassifier(
-                n_estimators=100,
-                max_depth=10,
-                min_samples_split=5,
-                random_state=42,
-                class_weight='balanced'
-            )
-            
-            self.model.fit(X_train, y_train)
-            
-            # Calculate accuracy
-            self.model_accuracy = self.model.score(X_test, y_test)
+            X_train, X_test, y_train, y_test = self.training_split()
             
-            # Calculate confusion matrix
-            from sklearn.metrics import confusion_matrix
-            y_pred = self.model.predict(X_test)
-            self.confusion_matrix = confusion_matrix(y_test, y_pred).tolist()
+            # Train Random Forest on all cores; the fitted trees do not depend on n_jobs
+            model = RandomForestClassifier(**MODEL_PARAMS, n_jobs=config.TRAIN_JOBS)
+            model.fit(X_train, y_train)
+            self.install_model(model, X_test, y_test, {'estimator': 'random_forest', 'params': MODEL_PARAMS})
             
             print(f"✅ ML Model trained with accuracy: {self.model_accuracy:.2%}")
             print(f"✅ Classes: {self.label_encoder.classes_}")
@@ -100,32 +253,22 @@ class MLService:
             raise
     
     def predict(self, genre: str, budget: float, year: int, 
-                imdb_rating: float, runtime: int) -> Dict:
+                imdb_rating: float, runtime: int, top_n: int = 5) -> Dict:
         """Make prediction for a movie"""
         try:
-            # Create input dataframe
-            input_data = pd.DataFrame([{
-                'genre': genre,
+            inputs = {
                 'budget': budget,
                 'year': year,
                 'imdb_rating': imdb_rating,
                 'runtime': runtime
-            }])
-            
-            # Prepare features (this will create genre columns)
-            input_processed = self.prepare_features(input_data, is_training=False)
-            
-            # Ensure all training features are present
-            for col in self.feature_names:
-                if col not in input_processed.columns:
-                    input_processed[col] = 0
+            }
             
-            # Reorder columns to match training
-            X = input_processed[self.feature_names]
+            # Prepare features aligned to the training columns
+            X = self.feature_row(genre, **inputs)
             
-            # Get prediction probabilities
-            probabilities = self.model.predict_proba(X)[0]
-            prediction = self.model.predict(X)[0]
+            # Get prediction probabilities; the label is their argmax
+            probabilities = self.predict_proba(X)[0]
+            prediction = self.model.classes_[np.argmax(probabilities)]
             
             # Get class names
             classes = self.label_encoder.classes_
@@ -139,20 +282,11 @@ class MLService:
             predicted_label = self.label_encoder.inverse_transform([prediction])[0]
             
             # Calculate expected ROI based on similar movies
-            similar_movies = self.find_similar_movies(genre, budget, year, imdb_rating, runtime)
+            similar_movies = self.find_similar_movies(genre, budget, year, imdb_rating, runtime, top_n=top_n)
             expected_roi = np.mean([m['roi'] for m in similar_movies]) if similar_movies else 0
             
             # Determine risk level
-            hit_prob = prob_dict.get('Hit', 0)
-            if hit_prob > 60:
-                risk_level = 'Low'
-                risk_color = '#10b981' # Emerald
-            elif hit_prob > 35:
-                risk_level = 'Moderate'
-                risk_color = '#f59e0b' # Amber
-            else:
-                risk_level = 'High'
-                risk_color = '#ef4444' # Rose
+            risk_level, risk_color = self._risk_level(prob_dict.get('Hit', 0))
             
             # Get feature importance
             feature_importance = self.get_feature_importance()
@@ -163,7 +297,7 @@ class MLService:
                 f_name = feat['feature']
                 imp = feat['importance']
                 if f_name in ['budget', 'year', 'imdb_rating', 'runtime']:
-                    val = input_data.iloc[0][f_name]
+                    val = inputs[f_name]
                     median = self.data_service.movies[f_name].median()
                     impact = "Positive" if val >= median else "Negative"
                     # Invert for budget if it's too high? 
@@ -174,9 +308,9 @@ class MLService:
                         "impact": impact,
                         "description": f"{f_name.capitalize()} is {'above' if val >= median else 'below'} market median."
                     })
-                else:
+                elif f'genre_{f_name}' in X.columns:
                     # Genre feature
-                    is_active = input_processed.iloc[0][f'genre_{f_name}'] == 1
+                    is_active = X.iloc[0][f'genre_{f_name}'] == 1
                     if is_active:
                         explanations.append({
                             "feature": f_name,
@@ -192,7 +326,7 @@ class MLService:
                 'risk_level': risk_level,
                 'risk_color': risk_color,
                 'explanations': explanations,
-                'similar_movies': similar_movies[:5],
+                'similar_movies': similar_movies,
                 'feature_importance': feature_importance[:10]
             }
             
@@ -209,39 +343,97 @@ class MLService:
                 'feature_importance': []
             }
     
-    def find_similar_movies(self, genre: str, budget: float, year: int,
-                           imdb_rating: float, runtime: int, top_n: int = 5) -> List[Dict]:
-        """Find similar historical movies"""
-        movies = self.data_service.movies.copy()
+    def predict_batch(self, plans: List[Dict]) -> Dict:
+        """Score many investment plans with a single model pass"""
+        input_data = pd.DataFrame(plans, columns=['genre', 'budget', 'year', 'imdb_rating', 'runtime'])
+        X = self.build_feature_matrix(input_data)
         
-        # Calculate similarity score
-        movies['similarity'] = 0
-        
-        # Genre similarity (check if any genre matches)
-        input_genres = set(genre.split('|'))
-        movies['genre_match'] = movies['genre'].apply(
-            lambda x: len(input_genres.intersection(set(str(x).split('|')))) if pd.notna(x) else 0
+        probabilities = self.predict_proba(X)
+        predictions = self.label_encoder.inverse_transform(
+            self.model.classes_[np.argmax(probabilities, axis=1)]
         )
-        movies['similarity'] += movies['genre_match'] * 30
+        expected_rois = self.similar_movie_roi_batch(input_data)
         
-        # Budget similarity (within 50% range gets points)
-        movies['budget_diff'] = abs(movies['budget'] - budget) / budget
-        movies['similarity'] += (1 - movies['budget_diff'].clip(0, 1)) * 25
+        classes = self.label_encoder.classes_
+        percentages = np.round(probabilities * 100, 2)
         
-        # Year proximity (within 3 years gets points)
-        movies['year_diff'] = abs(movies['year'] - year)
-        movies['similarity'] += (1 - (movies['year_diff'] / 10).clip(0, 1)) * 15
+        results = []
+        for i in range(len(input_data)):
+            prob_dict = {classes[j]: float(percentages[i, j]) for j in range(len(classes))}
+            hit_prob = prob_dict.get('Hit', 0)
+            risk_level, risk_color = self._risk_level(hit_prob)
+            results.append({
+                'prediction': predictions[i],
+                'probabilities': prob_dict,
+                'hit_probability': hit_prob,
+                'expected_roi': round(float(expected_rois[i]), 2),
+                'risk_level': risk_level,
+                'risk_color': risk_color
+            })
         
-        # Rating similarity
-        movies['rating_diff'] = abs(movies['imdb_rating'] - imdb_rating)
-        movies['similarity'] += (1 - (movies['rating_diff'] / 5).clip(0, 1)) * 20
+        return {
+            'predictions': results,
+            'count': len(results),
+            'feature_importance': self.get_feature_importance()[:10]
+        }
+    
+    def _similarity_scores(self, genre_match: np.ndarray, budget, year, imdb_rating, runtime) -> np.ndarray:
+        """Weighted similarity of query values against every catalog movie"""
+        store = self.data_service.feature_store
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarity = genre_match * SIMILARITY_WEIGHTS['genre']
+            similarity = similarity + (1 - np.clip(np.abs(store.column('budget') - budget) / budget, 0, 1)) * SIMILARITY_WEIGHTS['budget']
+            similarity += (1 - np.clip(np.abs(store.column('year') - year) / 10, 0, 1)) * SIMILARITY_WEIGHTS['year']
+            similarity += (1 - np.clip(np.abs(store.column('imdb_rating') - imdb_rating) / 5, 0, 1)) * SIMILARITY_WEIGHTS['imdb_rating']
+            similarity += (1 - np.clip(np.abs(store.column('runtime') - runtime) / 100, 0, 1)) * SIMILARITY_WEIGHTS['runtime']
+        return similarity
+    
+    def similar_movie_roi_batch(self, plans: pd.DataFrame, top_n: int = 5) -> np.ndarray:
+        """Mean ROI of the top-N similar movies for every plan, using matrix ops"""
+        store = self.data_service.feature_store
+        expected_roi = np.zeros(len(plans))
+        if store.size == 0 or len(plans) == 0:
+            return expected_roi
         
-        # Runtime similarity
-        movies['runtime_diff'] = abs(movies['runtime'] - runtime)
-        movies['similarity'] += (1 - (movies['runtime_diff'] / 100).clip(0, 1)) * 10
+        # Single predictions average the rounded ROI of their similar movies
+        roi = np.round(self.data_service.movies['roi'].to_numpy(dtype=np.float64), 2)
+        masks = store.genre_masks(plans['genre'].tolist())
+        plan_values = {
+            col: plans[col].to_numpy(dtype=np.float64)[:, None]
+            for col in ['budget', 'year', 'imdb_rating', 'runtime']
+        }
         
-        # Get top N similar movies
-        similar = movies.nlargest(top_n, 'similarity')
+        k = min(top_n, store.size)
+        chunk = max(1, SIMILARITY_CHUNK_CELLS // (store.size * store.words))
+        for start in range(0, len(plans), chunk):
+            rows = slice(start, start + chunk)
+            
+            # Same scoring as find_similar_movies, one row per plan
+            similarity = self._similarity_scores(
+                store.genre_match_matrix(masks[rows]),
+                plan_values['budget'][rows], plan_values['year'][rows],
+                plan_values['imdb_rating'][rows], plan_values['runtime'][rows]
+            )
+            
+            # Movies with missing attributes are never similar (nlargest skips NaN)
+            similarity[np.isnan(similarity)] = -np.inf
+            top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+            valid = np.isfinite(np.take_along_axis(similarity, top, axis=1))
+            
+            roi_sum = np.where(valid, roi[top], 0).sum(axis=1)
+            counts = valid.sum(axis=1)
+            expected_roi[rows] = np.where(counts > 0, roi_sum / np.maximum(counts, 1), 0)
+        
+        return expected_roi
+    
+    def find_similar_movies(self, genre: str, budget: float, year: int,
+                           imdb_rating: float, runtime: int, top_n: int = 5) -> List[Dict]:
+        """Find similar historical movies"""
+        # Exact top-N from the nearest-neighbour index, same weights as the full scan
+        top, scores = self.data_service.similarity_index.query(
+            genre, budget, year, imdb_rating, runtime, top_n=top_n
+        )
+        similar = self.data_service.movies.iloc[top]
         
         return [
             {
@@ -252,9 +444,9 @@ class MLService:
                 'box_office': int(row['box_office']),
                 'roi': round(row['roi'], 2),
                 'success_label': row['success_label'],
-                'similarity_score': round(row['similarity'], 2)
+                'similarity_score': round(float(score), 2)
             }
-            for _, row in similar.iterrows()
+            for (_, row), score in zip(similar.iterrows(), scores)
         ]
     
     def get_feature_importance(self) -> List[Dict]:
@@ -262,6 +454,10 @@ class MLService:
         if self.model is None:
             return []
         
+        # The fitted model never changes, so rank its features only once
+        if self._feature_importance is not None:
+            return list(self._feature_importance)
+        
         importances = self.model.feature_importances_
         
         # Create list of feature importance
@@ -276,15 +472,17 @@ class MLService:
         # Sort by importance
         feature_imp.sort(key=lambda x: x['importance'], reverse=True)
         
-        return feature_imp
+        self._feature_importance = feature_imp
+        return list(feature_imp)
 
     def get_model_transparency(self) -> Dict:
         """Get model transparency metrics"""
         return {
             "accuracy": round(self.model_accuracy * 100, 2),
-            "confusion_matrix": getattr(self, "confusion_matrix", []),
+            "confusion_matrix": self.confusion_matrix,
             "classes": self.label_encoder.classes_.tolist(),
             "feature_importance": self.get_feature_importance()[:10],
+            "model": self.model_info,
             "dataset_info": {
                 "total_samples": len(self.data_service.movies),
                 "features_count": len(self.feature_names)
@@ -296,13 +494,13 @@ class MLService:
         # Predict for Plan A
         pred_a = self.predict(
             plan_a['genre'], plan_a['budget'], plan_a['year'], 
-            plan_a['rating'], plan_a['runtime']
+            plan_a['rating'], plan_a['runtime'], top_n=plan_a.get('top_n', 5)
         )
         
         # Predict for Plan B
         pred_b = self.predict(
             plan_b['genre'], plan_b['budget'], plan_b['year'], 
-            plan_b['rating'], plan_b['runtime']
+            plan_b['rating'], plan_b['runtime'], top_n=plan_b.get('top_n', 5)
         )
         
         # Compare
@@ -328,38 +526,27 @@ class MLService:
             "comparison_note": f"{better_plan} offers better risk-adjusted returns."
         }
 
-    def predict_simulator(self, genre: str, budget: float, runtime: int, release_month: int) -> Dict:
+    def predict_simulator(self, genre: str, budget: float, runtime: int, release_month: int,
+                          top_n: int = 10) -> Dict:
         """Prediction logic for the Investment Simulator (Data-Driven)"""
         try:
             # Current year for prediction context
-            current_year = 2024
+            current_year = SIMULATOR_YEAR
             # Neutral IMDb rating for the model
             median_imdb = self.data_service.movies['imdb_rating'].median()
             
-            # Create input dataframe
-            input_data = pd.DataFrame([{
-                'genre': genre,
-                'budget': budget,
-                'year': current_year,
-                'imdb_rating': median_imdb,
-                'runtime': runtime,
-                'release_month': release_month
-            }])
-            
-            input_processed = self.prepare_features(input_data, is_training=False)
-            for col in self.feature_names:
-                if col not in input_processed.columns:
-                    input_processed[col] = 0
-            
-            X = input_processed[self.feature_names]
-            probabilities = self.model.predict_proba(X)[0]
+            X = self.feature_row(
+                genre, budget=budget, year=current_year, imdb_rating=median_imdb,
+                runtime=runtime, release_month=release_month
+            )
+            probabilities = self.predict_proba(X)[0]
             classes = self.label_encoder.classes_
             prob_dict = {classes[i]: round(float(probabilities[i]) * 100, 2) for i in range(len(classes))}
             
             hit_prob = prob_dict.get('Hit', 0)
             
             # Expected ROI calculation
-            similar_movies = self.find_similar_movies_for_simulator(genre, budget)
+            similar_movies = self.find_similar_movies_for_simulator(genre, budget, top_n=top_n)
             avg_roi = np.mean([m['roi'] for m in similar_movies]) if similar_movies else 0
             
             # Risk score logic
@@ -375,23 +562,61 @@ class MLService:
             print(f"❌ Simulator prediction error: {e}")
             raise
 
-    def find_similar_movies_for_simulator(self, genre: str, budget: float, top_n: int = 10) -> List[Dict]:
-        """Specific similarity logic for simulator using budget clusters"""
-        movies = self.data_service.movies.copy()
+    def predict_simulator_sweep(self, genre: str, budget: float, runtime: int, release_month: int,
+                                budgets: Optional[List[float]] = None, runtimes: Optional[List[int]] = None,
+                                release_months: Optional[List[int]] = None, top_n: int = 10) -> Dict:
+        """Investment Simulator outputs over a budget x runtime x release month grid in one model pass.
+
+        Every cell equals predict_simulator for that plan. Axes left out hold
+        the base plan's value. Expected ROI depends on genre and budget only,
+        so it is returned per budget.
+        """
+        axes = {
+            'budget': list(budgets) if budgets else [budget],
+            'runtime': list(runtimes) if runtimes else [runtime],
+            'release_month': list(release_months) if release_months else [release_month]
+        }
+        grid = np.meshgrid(*(np.asarray(values, dtype=np.float64) for values in axes.values()), indexing='ij')
+        shape = grid[0].shape
         
-        # Genre filter
-        input_genres = set(genre.split('|'))
-        movies['genre_match'] = movies['genre'].apply(
-            lambda x: len(input_genres.intersection(set(str(x).split('|')))) if pd.notna(x) else 0
-        )
-        movies = movies[movies['genre_match'] > 0]
+        # One feature row per cell: the base plan with the swept columns overwritten
+        base = self.feature_row(
+            genre, budget=budget, year=SIMULATOR_YEAR, imdb_rating=self.data_service.movies['imdb_rating'].median(),
+            runtime=runtime, release_month=release_month
+        ).to_numpy()
+        X = np.repeat(base, grid[0].size, axis=0)
+        for column, values in zip(axes, grid):
+            X[:, self.feature_names.index(column)] = values.ravel()
+        probabilities = self.predict_proba(pd.DataFrame(X, columns=self.feature_names))
         
-        if len(movies) == 0:
-            movies = self.data_service.movies.copy()
-            
-        # Budget similarity (log scale for better clustering)
-        movies['budget_dist'] = abs(np.log1p(movies['budget']) - np.log1p(budget))
-        similar = movies.nsmallest(top_n, 'budget_dist')
+        classes = list(self.label_encoder.classes_)
+        if 'Hit' in classes:
+            # Rounded like single predictions, so the grid matches them cell for cell
+            hit = np.array([round(float(p) * 100, 2) for p in probabilities[:, classes.index('Hit')]])
+        else:
+            hit = np.zeros(len(X))
+        risk = np.array([round(100 - float(h), 2) for h in hit])
+        
+        roi = np.round(self.data_service.movies['roi'].to_numpy(dtype=np.float64), 2)
+        expected_roi = []
+        for value in axes['budget']:
+            similar = roi[self.data_service.similarity_index.nearest_budget(genre, value, top_n=top_n)]
+            expected_roi.append(float(round(np.mean(similar), 2)) if len(similar) else 0)
+        
+        return {
+            'genre': genre,
+            'axes': axes,
+            'shape': list(shape),
+            'success_probability': hit.reshape(shape).tolist(),
+            'risk_score': risk.reshape(shape).tolist(),
+            'expected_roi': expected_roi
+        }
+
+    def find_similar_movies_for_simulator(self, genre: str, budget: float, top_n: int = 10) -> List[Dict]:
+        """Specific similarity logic for simulator using budget clusters"""
+        # Genre filter, then the closest budgets on a log scale for better clustering
+        top = self.data_service.similarity_index.nearest_budget(genre, budget, top_n=top_n)
+        similar = self.data_service.movies.iloc[top]
         
         return [
             {
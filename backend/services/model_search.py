@@ -0,0 +1,289 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import joblib
+import numpy as np
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.model_selection import ParameterSampler, StratifiedKFold
+
+import config
+from services.data_service import DEFAULT_DATA_DIR, DataService
+from services.ml_service import MODEL_PARAMS, SPLIT_PARAMS, MLService
+from services.model_store import ModelStore
+
+
+ESTIMATORS = {
+    'random_forest': RandomForestClassifier,
+    'extra_trees': ExtraTreesClassifier
+}
+
+# Hyperparameters sampled per estimator family
+SEARCH_SPACE = {
+    family: {
+        'n_estimators': [100, 200, 300, 500],
+        'max_depth': [6, 8, 10, 14, 20, None],
+        'min_samples_split': [2, 5, 10, 20],
+        'min_samples_leaf': [1, 2, 4],
+        'max_features': ['sqrt', 'log2', 0.5],
+        'class_weight': ['balanced', 'balanced_subsample', None]
+    }
+    for family in ESTIMATORS
+}
+
+# Folds of the training split; part of the fold cache key
+CV_PARAMS = {
+    'n_splits': 5,
+    'shuffle': True,
+    'random_state': 42
+}
+
+FOLDS_DIRNAME = ".folds"
+REPORT_FILE = "search.json"
+
+
+def _evaluate(fold_path: str, estimator: str, params: Dict) -> Dict:
+    """Fit one candidate on one cached fold and score it on the fold's held-out rows"""
+    fold = joblib.load(fold_path, mmap_mode='r')
+    model = ESTIMATORS[estimator](**params)
+    started = time.perf_counter()
+    model.fit(fold['X_train'], fold['y_train'])
+    fit_s = time.perf_counter() - started
+    started = time.perf_counter()
+    accuracy = model.score(fold['X_test'], fold['y_test'])
+    return {'accuracy': float(accuracy), 'fit_s': fit_s, 'score_s': time.perf_counter() - started}
+
+
+class ModelSearch:
+    """Offline cross-validated hyperparameter search over tree ensembles.
+
+    Candidates are sampled from SEARCH_SPACE for each estimator family; the
+    serving configuration (MODEL_PARAMS) is always candidate 0. They are
+    scored by k-fold cross-validation on the training part of the usual
+    train/test split, so the held-out accuracy reported afterwards stays
+    honest. Each (candidate, fold) fit runs on a worker process, and the
+    fold matrices are written once to the model store and memory-mapped by
+    the workers instead of being rebuilt or pickled per task.
+
+    Poor configurations stop early by successive halving: every candidate
+    is scored on the first few folds, then only the better half goes on to
+    twice as many folds, and so on until the survivors have seen every
+    fold (or the time budget runs out). If the best survivor cross-validates
+    at least as well as the current configuration, it is refitted on the
+    whole training split, saved as an artifact and published as the serving
+    model for the dataset. The held-out split plays no part in that choice,
+    so its accuracy stays an unbiased report of the published model.
+    """
+
+    def __init__(self, ml_service: MLService, candidates: int = 24,
+                 families: Sequence[str] = tuple(ESTIMATORS), folds: int = CV_PARAMS['n_splits'],
+                 min_folds: int = 2, keep: float = 0.5, workers: Optional[int] = None,
+                 time_budget: Optional[float] = None, seed: int = 42):
+        self.ml_service = ml_service
+        self.n_candidates = candidates
+        self.families = list(families)
+        self.folds = folds
+        self.min_folds = max(1, min(min_folds, folds))
+        self.keep = keep
+        jobs = workers if workers is not None else config.TRAIN_JOBS
+        self.workers = jobs if jobs > 0 else os.cpu_count() or 1
+        self.time_budget = time_budget
+        self.seed = seed
+
+    def candidates(self) -> List[Dict]:
+        """The serving configuration plus candidates sampled evenly across the families"""
+        specs = [{'estimator': 'random_forest', 'params': dict(MODEL_PARAMS)}]
+        per_family = max(0, self.n_candidates - 1) // max(1, len(self.families))
+        for offset, family in enumerate(self.families):
+            sampler = ParameterSampler(SEARCH_SPACE[family], per_family, random_state=self.seed + offset)
+            specs += [{'estimator': family, 'params': {**params, 'random_state': MODEL_PARAMS['random_state']}}
+                      for params in sampler]
+        return [{'id': i, **spec} for i, spec in enumerate(specs)]
+
+    def cache_folds(self, X_train, y_train: np.ndarray) -> List[Path]:
+        """Write the fold matrices once per dataset, feature layout and fold scheme"""
+        cv_params = {**CV_PARAMS, 'n_splits': self.folds}
+        key = hashlib.sha256(json.dumps({
+            'dataset': self.ml_service.data_service.source_digests['movies'],
+            'features': self.ml_service.feature_names,
+            'split': SPLIT_PARAMS,
+            'cv': cv_params
+        }, sort_keys=True).encode()).hexdigest()[:16]
+        directory = self.ml_service.model_store.store_dir / FOLDS_DIRNAME / key
+        paths = [directory / f"fold-{i}.joblib" for i in range(self.folds)]
+        if all(path.exists() for path in paths):
+            return paths
+
+        directory.mkdir(parents=True, exist_ok=True)
+        X = np.ascontiguousarray(X_train.to_numpy(dtype=np.float64))
+        y = np.asarray(y_train)
+        for path, (train_idx, test_idx) in zip(paths, StratifiedKFold(**cv_params).split(X, y)):
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            # Uncompressed, so the workers can memory-map the arrays
+            joblib.dump({'X_train': X[train_idx], 'y_train': y[train_idx],
+                         'X_test': X[test_idx], 'y_test': y[test_idx]}, tmp_path)
+            os.replace(tmp_path, path)
+        return paths
+
+    def run(self) -> Dict:
+        """Score the candidates with early stopping and return the search report"""
+        started = time.perf_counter()
+        X_train, X_test, y_train, y_test = self.ml_service.training_split()
+        fold_paths = self.cache_folds(X_train, y_train)
+
+        results = {
+            spec['id']: {**spec, 'scores': [], 'fit_s': 0.0, 'score_s': 0.0, 'status': 'complete'}
+            for spec in self.candidates()
+        }
+        alive = list(results)
+        done, rung = 0, self.min_folds
+        print(f"🚀 Searching {len(results)} candidates over {self.folds} folds on {self.workers} workers")
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                futures = {
+                    pool.submit(_evaluate, str(fold_paths[fold]), results[cid]['estimator'], results[cid]['params']): cid
+                    for cid in alive for fold in range(done, rung)
+                }
+                for future in as_completed(futures):
+                    result, outcome = results[futures[future]], future.result()
+                    result['scores'].append(outcome['accuracy'])
+                    result['fit_s'] += outcome['fit_s']
+                    result['score_s'] += outcome['score_s']
+                done = rung
+
+                alive.sort(key=lambda cid: (-np.mean(results[cid]['scores']), results[cid]['fit_s']))
+                best = results[alive[0]]
+                print(f"✅ {len(alive)} candidates scored on {done} folds, best {np.mean(best['scores']):.2%} "
+                      f"({best['estimator']} #{best['id']})")
+                if done == self.folds:
+                    break
+                if self.time_budget is not None and time.perf_counter() - started > self.time_budget:
+                    for cid in alive:
+                        results[cid]['status'] = f"stopped after {done} folds (time budget)"
+                    break
+
+                # Successive halving: only the better part of the field earns more folds
+                survivors = max(1, math.ceil(len(alive) * self.keep))
+                for cid in alive[survivors:]:
+                    results[cid]['status'] = f"pruned after {done} folds"
+                alive = alive[:survivors]
+                rung = min(self.folds, done * 2)
+
+        candidates = []
+        for result in results.values():
+            scores = np.array(result.pop('scores'))
+            candidates.append({
+                **result,
+                'folds': len(scores),
+                'cv_accuracy': float(scores.mean()),
+                'cv_std': float(scores.std()),
+                'fold_accuracy': scores.tolist()
+            })
+        candidates.sort(key=lambda c: (-c['folds'], -c['cv_accuracy'], c['fit_s']))
+        return {
+            'best': candidates[0],
+            'baseline': next(c for c in candidates if c['id'] == 0),
+            'candidates': candidates,
+            'folds': self.folds,
+            'workers': self.workers,
+            'search_s': time.perf_counter() - started,
+            'split': (X_train, X_test, y_train, y_test)
+        }
+
+    def publish(self, report: Dict, force: bool = False) -> Optional[str]:
+        """Refit the best candidate and make it the serving artifact unless it cross-validates worse than the current one"""
+        X_train, X_test, y_train, y_test = report.pop('split')
+        best, baseline = report['best'], report['baseline']
+        ml_service = self.ml_service
+        serving_accuracy = ml_service.model_accuracy
+        report['comparison'] = {
+            'serving_key': ml_service.model_key,
+            'serving_estimator': ml_service.model_info.get('estimator'),
+            'baseline_cv_accuracy': baseline['cv_accuracy'],
+            'candidate_cv_accuracy': best['cv_accuracy'],
+            'forced': force,
+            'published': force or best['cv_accuracy'] >= baseline['cv_accuracy']
+        }
+        if not report['comparison']['published']:
+            # Recorded at the top of the store, so the serving artifact's own report is left alone
+            report_path = ml_service.model_store.store_dir / REPORT_FILE
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            report_path.write_text(json.dumps(report, indent=2, default=str))
+            print(f"⚠️ Kept serving model {ml_service.model_key}: {best['estimator']} #{best['id']} cross-validates "
+                  f"{best['cv_accuracy']:.2%} against {baseline['cv_accuracy']:.2%} for the current configuration; "
+                  f"use --force to publish it. Report written to {report_path}")
+            return None
+
+        params = dict(best['params'])
+        model = ESTIMATORS[best['estimator']](**params, n_jobs=self.workers)
+        started = time.perf_counter()
+        model.fit(X_train, y_train)
+        report['refit_s'] = time.perf_counter() - started
+
+        ml_service.install_model(model, X_test, y_test, {
+            'estimator': best['estimator'],
+            'params': params,
+            'cv_accuracy': round(best['cv_accuracy'], 4),
+            'cv_folds': best['folds'],
+            'searched_candidates': len(report['candidates'])
+        })
+        # Held-out accuracy is reported once the model is chosen, next to that of the model it replaces
+        report['holdout_accuracy'] = ml_service.model_accuracy
+        report['comparison']['serving_holdout_accuracy'] = serving_accuracy
+
+        dataset_digest = ml_service.data_service.source_digests['movies']
+        ml_service.model_key = ml_service.model_store.artifact_key(
+            dataset_digest,
+            {'model': {'estimator': best['estimator'], 'params': params}, 'split': SPLIT_PARAMS}
+        )
+        ml_service.save_model()
+        report_path = ml_service.model_store.artifact_path(ml_service.model_key).with_name(REPORT_FILE)
+        report_path.write_text(json.dumps(report, indent=2, default=str))
+        ml_service.model_store.publish(dataset_digest, ml_service.model_key, {
+            'estimator': best['estimator'],
+            'cv_accuracy': best['cv_accuracy'],
+            'holdout_accuracy': ml_service.model_accuracy,
+            'published_at': time.time()
+        })
+        print(f"✅ Published {best['estimator']} model {ml_service.model_key} "
+              f"(cv {best['cv_accuracy']:.2%}, holdout {ml_service.model_accuracy:.2%})")
+        return ml_service.model_key
+
+
+if __name__ == "__main__":
+    # python -m services.model_search [--data-dir ../movie-data-pipeline] [--candidates 24] [--workers 8]
+    parser = argparse.ArgumentParser(description="Cross-validated model search; publishes the best model for serving")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="movie-data-pipeline directory")
+    parser.add_argument("--store-dir", default=None, help="model artifact store (default: model_artifacts)")
+    parser.add_argument("--candidates", type=int, default=24, help="configurations to try, including the current one")
+    parser.add_argument("--families", default=",".join(ESTIMATORS), help="estimator families to sample from")
+    parser.add_argument("--folds", type=int, default=CV_PARAMS['n_splits'])
+    parser.add_argument("--min-folds", type=int, default=2, help="folds every candidate is scored on before pruning")
+    parser.add_argument("--keep", type=float, default=0.5, help="fraction of candidates kept at each pruning step")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CINEINTEL_TRAIN_JOBS)")
+    parser.add_argument("--time-budget", type=float, default=None, help="stop adding folds after N seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-publish", action="store_true", help="only report, keep serving the current model")
+    parser.add_argument("--force", action="store_true", help="publish even if the current configuration cross-validates better")
+    args = parser.parse_args()
+
+    data_service = DataService(args.data_dir)
+    search = ModelSearch(
+        MLService(data_service, ModelStore(args.store_dir)), args.candidates,
+        [f.strip() for f in args.families.split(",")], args.folds, args.min_folds, args.keep,
+        args.workers, args.time_budget, args.seed
+    )
+    report = search.run()
+    for candidate in report['candidates']:
+        print(f"  #{candidate['id']:<3} {candidate['estimator']:<14} cv {candidate['cv_accuracy']:.2%} "
+              f"± {candidate['cv_std']:.2%} on {candidate['folds']} folds, fit {candidate['fit_s']:.1f}s  "
+              f"{candidate['status']}")
+    if not args.no_publish:
+        search.publish(report, args.force)
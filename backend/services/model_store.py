@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import joblib
+import sklearn
+
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parent.parent / "model_artifacts"
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Compute a SHA-256 digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelStore:
+    """Versioned on-disk store for trained model artifacts"""
+
+    ARTIFACT_FILE = "model.joblib"
+    PUBLISHED_FILE = "published.json"
+
+    def __init__(self, store_dir: Optional[str] = None):
+        self.store_dir = Path(store_dir) if store_dir else DEFAULT_STORE_DIR
+
+    def artifact_key(self, dataset_digest: str, params: Dict) -> str:
+        """Build an artifact key from the training data digest and hyperparameters"""
+        payload = json.dumps({
+            "dataset": dataset_digest,
+            "params": params,
+            # Pickled estimators are only guaranteed to load on the same sklearn version
+            "sklearn": sklearn.__version__
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def artifact_path(self, key: str) -> Path:
+        """Path of the artifact file for a key"""
+        return self.store_dir / key / self.ARTIFACT_FILE
+
+    def load(self, key: str) -> Optional[Dict]:
+        """Load an artifact, memory-mapping its arrays; returns None if missing"""
+        path = self.artifact_path(key)
+        if not path.exists():
+            return None
+        try:
+            return joblib.load(path, mmap_mode='r')
+        except Exception as e:
+            print(f"⚠️ Could not load model artifact {key}: {e}")
+            return None
+
+    def save(self, key: str, artifact: Dict) -> Path:
+        """Persist an artifact atomically so concurrent workers never read a partial file"""
+        path = self.artifact_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        # Uncompressed dumps are required for memory-mapped loading
+        joblib.dump(artifact, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    def _published(self) -> Dict:
+        path = self.store_dir / self.PUBLISHED_FILE
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read published models: {e}")
+            return {}
+
+    def published_key(self, dataset_digest: str) -> Optional[str]:
+        """Artifact published as the serving model for a dataset, if any"""
+        entry = self._published().get(dataset_digest)
+        # An artifact pickled by another sklearn version is not served
+        if entry is None or entry.get("sklearn") != sklearn.__version__:
+            return None
+        return entry["key"]
+
+    def publish(self, dataset_digest: str, key: str, summary: Optional[Dict] = None) -> Path:
+        """Make an artifact the serving model for a dataset; services pick it up on (re)load"""
+        published = self._published()
+        published[dataset_digest] = {"key": key, "sklearn": sklearn.__version__, **(summary or {})}
+        path = self.store_dir / self.PUBLISHED_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(published, indent=2, sort_keys=True, default=str))
+        os.replace(tmp_path, path)
+        return path
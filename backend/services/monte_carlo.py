@@ -0,0 +1,168 @@
+import secrets
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.genre_stats import split_genres
+
+
+# Paths simulated by one worker task; fixed so results do not depend on the number of workers
+CHUNK_PATHS = 25_000
+
+PERCENTILES = [1, 5, 10, 25, 50, 75, 90, 95, 99]
+
+HISTOGRAM_BINS = 40
+
+
+def simulate_chunk(pools: List[np.ndarray], weights: np.ndarray, films: np.ndarray, paths: int,
+                   seed: np.random.SeedSequence) -> np.ndarray:
+    """Portfolio ROI multiple of each simulated slate in one chunk (runs on a worker process).
+
+    Every genre's films get an equal share of the genre's capital, so a slate
+    returns the capital-weighted mean of its films' bootstrapped ROIs.
+    """
+    rng = np.random.default_rng(seed)
+    multiple = np.zeros(paths)
+    for pool, weight, count in zip(pools, weights, films):
+        draws = pool[rng.integers(0, len(pool), size=(paths, count))]
+        multiple += weight * draws.mean(axis=1)
+    return multiple
+
+
+def apportion(weights: np.ndarray, films: int) -> np.ndarray:
+    """Films per genre in proportion to capital, at least one each (largest remainder)"""
+    films = max(films, len(weights))
+    spare = films - len(weights)
+    exact = weights * spare
+    counts = np.floor(exact).astype(np.int64)
+    remainder = spare - counts.sum()
+    counts[np.argsort(-(exact - counts), kind='stable')[:remainder]] += 1
+    return counts + 1
+
+
+class SimulationPlan:
+    """A validated allocation split into seeded, fixed-size chunks of paths"""
+
+    def __init__(self, genres: List[str], weights: np.ndarray, films: np.ndarray, pools: List[np.ndarray],
+                 paths: int, seed: int, budget: Optional[float], confidence: float):
+        self.genres = genres
+        self.weights = weights
+        self.films = films
+        self.pools = pools
+        self.paths = paths
+        self.seed = seed
+        self.budget = budget
+        self.confidence = confidence
+        sizes = [min(CHUNK_PATHS, paths - start) for start in range(0, paths, CHUNK_PATHS)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        self.chunks = [(pools, weights, films, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+    def describe(self) -> Dict:
+        """Allocation as simulated: capital share, films and bootstrap sample size per genre"""
+        return {
+            "paths": self.paths,
+            "chunks": len(self.chunks),
+            "seed": self.seed,
+            "films": int(self.films.sum()),
+            "confidence": self.confidence,
+            "budget": self.budget,
+            "allocation": [
+                {
+                    "genre": genre,
+                    "weight": round(float(weight), 4),
+                    "films": int(count),
+                    "samples": len(pool),
+                    "mean_roi": round(float(pool.mean()), 4)
+                }
+                for genre, weight, count, pool in zip(self.genres, self.weights, self.films, self.pools)
+            ]
+        }
+
+    def summarize(self, multiples: np.ndarray, histogram: bool = False) -> Dict:
+        """Risk statistics of simulated ROI multiples (box office / budget; below 1 is a loss)"""
+        returns = multiples - 1.0
+        cutoff = np.quantile(returns, 1.0 - self.confidence)
+        tail = returns[returns <= cutoff]
+        value_at_risk = -float(cutoff)
+        conditional = -float(tail.mean()) if len(tail) else value_at_risk
+        summary = {
+            "paths": len(multiples),
+            "mean_roi": round(float(multiples.mean()), 4),
+            "median_roi": round(float(np.median(multiples)), 4),
+            "std_roi": round(float(multiples.std()), 4),
+            "probability_of_loss": round(float((multiples < 1.0).mean()) * 100, 2),
+            "var": round(value_at_risk, 4),
+            "cvar": round(conditional, 4),
+            "percentiles": {
+                f"p{p}": round(float(v), 4) for p, v in zip(PERCENTILES, np.percentile(multiples, PERCENTILES))
+            }
+        }
+        if self.budget:
+            # VaR/CVaR as amounts of the slate budget
+            summary["var_amount"] = round(value_at_risk * self.budget, 2)
+            summary["cvar_amount"] = round(conditional * self.budget, 2)
+        if histogram:
+            # The extreme half-percent on each side would flatten every other bin
+            low, high = np.percentile(multiples, [0.5, 99.5])
+            counts, edges = np.histogram(np.clip(multiples, low, high), bins=HISTOGRAM_BINS, range=(low, high))
+            summary["histogram"] = {"edges": np.round(edges, 4).tolist(), "counts": counts.tolist()}
+        return summary
+
+
+class MonteCarloEngine:
+    """Monte Carlo simulation of multi-film slates from bootstrapped genre ROIs.
+
+    Each genre's empirical ROI distribution is the ROI of every movie with a
+    budget that lists the genre, as in the genre statistics. A proposed
+    allocation (capital share per genre) becomes a slate of films: capital
+    is split across genres by weight and across each genre's films evenly,
+    and every simulated path draws each film's ROI with replacement from its
+    genre's pool. Paths are simulated in fixed-size chunks with independent
+    seeds spawned from one SeedSequence, so a seed reproduces the same
+    distribution however the chunks are spread over worker processes.
+    """
+
+    def __init__(self, movies: pd.DataFrame):
+        genre_column = movies['genres'] if 'genres' in movies.columns else movies['genre']
+        has_budget = (movies['budget'].fillna(0) > 0) & np.isfinite(movies['roi'])
+        exploded = pd.DataFrame({
+            # A genre listed twice still contributes the movie once to its pool
+            'genre': genre_column[has_budget].map(lambda value: list(dict.fromkeys(split_genres(value)))),
+            'roi': movies['roi'][has_budget].astype(np.float64)
+        }).explode('genre').dropna(subset=['genre'])
+        self.pools: Dict[str, np.ndarray] = {
+            genre: np.ascontiguousarray(group.to_numpy()) for genre, group in exploded.groupby('genre')['roi']
+        }
+
+    @property
+    def genres(self) -> List[str]:
+        return sorted(self.pools)
+
+    def plan(self, allocation: Dict[str, float], films: int = 10, paths: int = 100_000, seed: Optional[int] = None,
+             budget: Optional[float] = None, confidence: float = 0.95) -> SimulationPlan:
+        """Validate an allocation and split its simulation into chunks; raises ValueError on bad input"""
+        if not allocation:
+            raise ValueError("Allocation is empty")
+        unknown = [genre for genre in allocation if genre not in self.pools]
+        if unknown:
+            raise ValueError(f"No ROI history for {', '.join(unknown)}; known genres: {', '.join(self.genres)}")
+        if not all(np.isfinite(weight) and weight >= 0 for weight in allocation.values()):
+            raise ValueError("Allocation weights must be non-negative numbers")
+        genres = [genre for genre, weight in allocation.items() if weight > 0]
+        if not genres:
+            raise ValueError("At least one allocation weight must be positive")
+        weights = np.array([allocation[genre] for genre in genres], dtype=np.float64)
+        if paths < 1:
+            raise ValueError("At least one path is required")
+        if not 0.5 <= confidence < 1:
+            raise ValueError("Confidence must be in [0.5, 1)")
+        weights /= weights.sum()
+        seed = secrets.randbits(63) if seed is None else seed
+        return SimulationPlan(genres, weights, apportion(weights, films), [self.pools[g] for g in genres],
+                              paths, seed, budget, confidence)
+
+    def simulate(self, plan: SimulationPlan) -> Dict:
+        """Run every chunk in this process and summarize"""
+        multiples = np.concatenate([simulate_chunk(*chunk) for chunk in plan.chunks])
+        return {**plan.describe(), "summary": plan.summarize(multiples, histogram=True)}
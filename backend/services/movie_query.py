@@ -0,0 +1,184 @@
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Sort orders built eagerly at load; any other column is built on first use
+SORTABLE_COLUMNS = ['roi', 'year', 'budget', 'box_office', 'imdb_rating', 'title']
+
+# Longest n-gram held in the title index; longer searches intersect its postings
+TITLE_NGRAM = 3
+
+# Filtered result sets kept for paging and search-as-you-type
+RESULT_CACHE_SIZE = 256
+
+
+class MovieQueryEngine:
+    """Pre-indexed filter/sort/paginate engine behind /api/movies/explore.
+
+    At load time every movie is formatted once as a response row, sort
+    permutations are built per sortable column and direction, and titles are
+    indexed by lowercase 1..3-grams. A query combines boolean masks from the
+    indexes, walks the chosen permutation and slices one page of pre-built
+    rows, so no DataFrame is copied, scanned or sorted per request.
+    """
+
+    def __init__(self, movies: pd.DataFrame):
+        self.size = len(movies)
+        self.movies = movies
+        self.rows = self._build_rows(movies)
+        self._lock = threading.Lock()
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        for column in SORTABLE_COLUMNS:
+            if column in movies.columns:
+                self._build_orders(column)
+        self._identity = np.arange(self.size)
+
+        self._build_title_index(movies['title'])
+
+        # Genre strings are matched by substring, so index the distinct strings
+        genre_codes, genre_labels = pd.factorize(movies['genre'])
+        self._genre_codes = genre_codes
+        self._genre_labels_lower = [str(label).lower() for label in genre_labels]
+        self._label_masks = {
+            label: (movies['success_label'] == label).to_numpy()
+            for label in movies['success_label'].dropna().unique()
+        }
+        self._results: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+
+    @staticmethod
+    def _build_rows(movies: pd.DataFrame) -> List[Dict]:
+        """Format every movie once as an explorer response row"""
+        def column(name, default):
+            if name not in movies.columns:
+                return [default] * len(movies)
+            return movies[name].tolist()
+
+        genres = column('genre', None) if 'genre' in movies.columns else column('genres', None)
+        rows = []
+        for title, year, genre, roi, box_office, poster_url, imdb_rating, label in zip(
+            column('title', None), column('year', np.nan), genres, column('roi', np.nan),
+            column('box_office', np.nan), column('poster_url', ''), column('imdb_rating', 0),
+            column('success_label', None)
+        ):
+            rows.append({
+                "title": title,
+                "year": int(year) if not pd.isna(year) else 0,
+                "genres": genre if not pd.isna(genre) else "",
+                "roi": round(float(roi), 2) if not pd.isna(roi) else 0.0,
+                "box_office": int(box_office) if not pd.isna(box_office) else 0,
+                "poster_url": poster_url if not pd.isna(poster_url) else '',
+                "imdb_rating": round(float(imdb_rating), 1) if not pd.isna(imdb_rating) else 0.0,
+                "success_label": label if not pd.isna(label) else 'Unknown'
+            })
+        return rows
+
+    def _build_orders(self, column: str):
+        """Stable ascending and descending permutations of a column, missing values last"""
+        codes, _ = pd.factorize(self.movies[column], sort=True)
+        missing = codes < 0
+        top = codes.max() + 1 if len(codes) else 0
+        ascending = np.argsort(np.where(missing, top, codes), kind='stable')
+        descending = np.argsort(np.where(missing, top, top - 1 - codes), kind='stable')
+        with self._lock:
+            self._orders[(column, True)] = ascending
+            self._orders[(column, False)] = descending
+
+    def _order(self, sort_by: str, ascending: bool) -> np.ndarray:
+        """Permutation for a sort request; unknown columns keep dataset order"""
+        if sort_by not in self.movies.columns:
+            return self._identity
+        if (sort_by, ascending) not in self._orders:
+            self._build_orders(sort_by)
+        return self._orders[(sort_by, ascending)]
+
+    def _build_title_index(self, titles: pd.Series):
+        """Postings of lowercase title n-grams (n = 1..TITLE_NGRAM)"""
+        self._titles_lower = [t.lower() if isinstance(t, str) else None for t in titles]
+        postings = defaultdict(list)
+        for row, title in enumerate(self._titles_lower):
+            if title is None:
+                continue
+            grams = set()
+            for n in range(1, TITLE_NGRAM + 1):
+                grams.update(title[i:i + n] for i in range(len(title) - n + 1))
+            for gram in grams:
+                postings[gram].append(row)
+        self._title_postings = {gram: np.array(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+    def _title_matches(self, search: str) -> np.ndarray:
+        """Rows whose title contains the search text (case-insensitive)"""
+        needle = search.lower()
+        empty = np.zeros(0, dtype=np.int64)
+        if len(needle) <= TITLE_NGRAM:
+            return self._title_postings.get(needle, empty)
+
+        grams = {needle[i:i + TITLE_NGRAM] for i in range(len(needle) - TITLE_NGRAM + 1)}
+        lists = sorted((self._title_postings.get(g, empty) for g in grams), key=len)
+        candidates = lists[0]
+        for postings in lists[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = np.intersect1d(candidates, postings, assume_unique=True)
+        # n-grams only prove a candidate; confirm the full substring
+        return np.array([row for row in candidates if needle in self._titles_lower[row]], dtype=np.int64)
+
+    def _genre_mask(self, genre: str) -> np.ndarray:
+        """Movies whose genre string contains the term (case-insensitive)"""
+        term = genre.lower()
+        matching = [code for code, label in enumerate(self._genre_labels_lower) if term in label]
+        return np.isin(self._genre_codes, matching)
+
+    def _filtered_order(self, search: Optional[str], genre: Optional[str],
+                        success_label: Optional[str], sort_by: str, ascending: bool) -> np.ndarray:
+        """Row positions of every match in sort order, reused across pages"""
+        key = (search.lower() if search else None, genre.lower() if genre else None, success_label, sort_by, ascending)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return cached
+
+        order = self._order(sort_by, ascending)
+        if search or genre or success_label:
+            mask = np.ones(self.size, dtype=bool)
+            if search:
+                title_mask = np.zeros(self.size, dtype=bool)
+                title_mask[self._title_matches(search)] = True
+                mask &= title_mask
+            if genre:
+                mask &= self._genre_mask(genre)
+            if success_label:
+                mask &= self._label_masks.get(success_label, np.zeros(self.size, dtype=bool))
+            order = order[mask[order]]
+
+        with self._lock:
+            self._results[key] = order
+            while len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return order
+
+    def query(self, page: int = 1, limit: int = 20, search: Optional[str] = None,
+              genre: Optional[str] = None, success_label: Optional[str] = None,
+              sort_by: str = "roi", sort_order: str = "desc") -> Dict:
+        """Filter, sort and paginate the catalog"""
+        if genre == "All":
+            genre = None
+        if success_label == "All":
+            success_label = None
+        order = self._filtered_order(search, genre, success_label, sort_by, sort_order.lower() == "asc")
+
+        total_count = len(order)
+        start_idx = (page - 1) * limit
+        page_rows = order[start_idx:start_idx + limit]
+
+        return {
+            "movies": [self.rows[row] for row in page_rows],
+            "total_count": total_count,
+            "page": page,
+            "limit": limit,
+            "total_pages": int(np.ceil(total_count / limit))
+        }
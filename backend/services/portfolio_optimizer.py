@@ -0,0 +1,244 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linprog
+
+
+# Genres need this many years with an average ROI to be allocated capital
+MIN_YEARS = 8
+
+# Yearly genre ROIs above this quantile of all genre-years are clipped (single hits reach 480x)
+WINSOR_QUANTILE = 0.95
+
+# Years two genres must share before their covariance is estimated; sparser pairs are taken as uncorrelated
+MIN_OVERLAP = 5
+
+# Weight of the identity in the shrunk correlation matrix
+SHRINKAGE = 0.2
+
+# Risk aversions of the frontier, as multiples of (return spread / average variance)
+FRONTIER_AVERSIONS = (1e-2, 1e3)
+
+# Projected-gradient iterations per batched solve and the weight change that counts as converged
+MAX_ITERATIONS = 5000
+TOLERANCE = 1e-10
+
+# Weights below this are reported as zero
+MIN_REPORTED_WEIGHT = 1e-4
+
+OBJECTIVES = ["max_sharpe", "mean_variance", "min_variance", "min_cvar"]
+
+
+def project_capped_simplex(V: np.ndarray, caps: np.ndarray) -> np.ndarray:
+    """Euclidean projection of each row onto {w : sum(w) = 1, 0 <= w <= caps}.
+
+    The projection is clip(v - tau, 0, caps) for the tau that makes the row
+    sum to one. The row sum is piecewise linear in tau with breakpoints at
+    v and v - caps, so tau is found exactly by evaluating it at every
+    breakpoint and interpolating within the bracketing segment.
+    """
+    breaks = np.sort(np.concatenate([V, V - caps], axis=1), axis=1)
+    totals = np.clip(V[:, np.newaxis, :] - breaks[:, :, np.newaxis], 0.0, caps).sum(axis=2)
+    # totals falls from sum(caps) >= 1 at the first breakpoint to 0 at the last
+    segment = np.clip((totals >= 1.0).sum(axis=1) - 1, 0, breaks.shape[1] - 2)
+    rows = np.arange(len(V))
+    low, high = breaks[rows, segment], breaks[rows, segment + 1]
+    f_low, f_high = totals[rows, segment], totals[rows, segment + 1]
+    drop = f_low - f_high
+    tau = low + (f_low - 1.0) * (high - low) / np.where(drop > 0, drop, 1.0)
+    return np.clip(V - tau[:, np.newaxis], 0.0, caps)
+
+
+class PortfolioOptimizer:
+    """Genre allocation solver over the year-by-genre ROI history.
+
+    Built once per dataset version from genre_year_stats: every genre with
+    at least MIN_YEARS of average ROI becomes an asset whose yearly ROI
+    multiples (winsorized, since a single breakout year would otherwise
+    dominate) give its expected ROI and volatility. Correlations are
+    estimated pairwise over shared years, shrunk towards the identity and
+    clipped to the nearest positive semi-definite matrix, giving a
+    genre x genre covariance that every solve reuses. The years in which at
+    least half the genres report an ROI are kept as historical scenarios
+    (missing genres at their mean) for CVaR.
+
+    Allocations are fully invested (weights sum to one) with a cap per
+    genre. Mean-variance problems are solved as a batch: each row of a
+    weight matrix is one risk aversion, and accelerated projected gradient
+    steps update all rows with one matrix product and an exact projection
+    onto the capped simplex. The efficient frontier is one such batch, the
+    max-Sharpe allocation is the best point of a frontier refined once
+    around it, and min-CVaR is the Rockafellar-Uryasev linear program over
+    the scenarios.
+    """
+
+    def __init__(self, genre_year_stats: pd.DataFrame):
+        table = genre_year_stats.pivot_table(index='year', columns='genre', values='avg_roi', aggfunc='mean')
+        table = table.loc[:, table.notna().sum() >= MIN_YEARS]
+        self.genres: List[str] = table.columns.tolist()
+        self.years = int(table.notna().any(axis=1).sum())
+        self.winsor_cap = 0.0
+        self.max_eigenvalue = 0.0
+        if not self.genres:
+            self.mean = np.zeros(0)
+            self.volatility = np.zeros(0)
+            self.covariance = np.zeros((0, 0))
+            self.scenarios = np.zeros((0, 0))
+            return
+
+        observed = table.to_numpy(dtype=np.float64)
+        self.winsor_cap = float(np.nanquantile(observed, WINSOR_QUANTILE))
+        clipped = pd.DataFrame(np.clip(observed, 0.0, self.winsor_cap), columns=self.genres)
+        self.mean = clipped.mean().to_numpy()
+        self.volatility = np.nan_to_num(clipped.std().to_numpy())
+
+        correlation = np.nan_to_num(clipped.corr(min_periods=MIN_OVERLAP).to_numpy())
+        correlation = (1.0 - SHRINKAGE) * correlation + SHRINKAGE * np.eye(len(self.genres))
+        eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+        correlation = (eigenvectors * np.maximum(eigenvalues, 1e-6)) @ eigenvectors.T
+        scale = np.sqrt(np.diag(correlation))
+        correlation /= np.outer(scale, scale)
+        self.covariance = correlation * np.outer(self.volatility, self.volatility)
+        self.max_eigenvalue = float(np.linalg.eigvalsh(self.covariance)[-1])
+
+        rows = clipped.notna().sum(axis=1) * 2 >= len(self.genres)
+        self.scenarios = clipped[rows.to_numpy()].fillna(pd.Series(self.mean, index=self.genres)).to_numpy()
+
+    def caps(self, max_weight: float, caps: Optional[Dict[str, float]] = None,
+             genres: Optional[List[str]] = None) -> np.ndarray:
+        """Upper bound per genre; genres outside the universe are capped at zero. Raises ValueError"""
+        if not self.genres:
+            raise ValueError("Not enough genre-year ROI history to build a portfolio")
+        if not 0 < max_weight <= 1:
+            raise ValueError("max_weight must be in (0, 1]")
+        unknown = [g for g in list(caps or {}) + list(genres or []) if g not in self.genres]
+        if unknown:
+            raise ValueError(f"No ROI history for {', '.join(unknown)}; known genres: {', '.join(self.genres)}")
+        bounds = np.full(len(self.genres), float(max_weight))
+        for genre, cap in (caps or {}).items():
+            if not 0 <= cap <= 1:
+                raise ValueError(f"Cap for {genre} must be in [0, 1]")
+            bounds[self.genres.index(genre)] = min(cap, max_weight)
+        if genres:
+            bounds[[g not in genres for g in self.genres]] = 0.0
+        if bounds.sum() < 1.0 - 1e-9:
+            raise ValueError(f"Caps leave only {bounds.sum():.0%} of the budget allocatable; raise max_weight or the caps")
+        return bounds
+
+    def _aversion_scale(self) -> float:
+        """Risk aversion at which return and variance terms are of similar size"""
+        spread = max(float(self.mean.max() - self.mean.min()), 1e-6)
+        return spread / max(float(np.diag(self.covariance).mean()), 1e-12)
+
+    def solve_mean_variance(self, aversions: np.ndarray, caps: np.ndarray) -> np.ndarray:
+        """Weights maximizing mean - aversion/2 * variance for every aversion at once, shape (k, genres)"""
+        aversions = np.asarray(aversions, dtype=np.float64)[:, np.newaxis]
+        # Step 1/L per row, L = aversion * largest eigenvalue of the covariance
+        steps = 1.0 / (aversions * self.max_eigenvalue)
+        weights = project_capped_simplex(np.tile(caps / caps.sum(), (len(aversions), 1)), caps)
+        momentum, t = weights, np.ones((len(aversions), 1))
+        for _ in range(MAX_ITERATIONS):
+            gradient = self.mean - aversions * (momentum @ self.covariance)
+            updated = project_capped_simplex(momentum + steps * gradient, caps)
+            step = updated - weights
+            # Adaptive restart: drop a row's momentum once it points against its progress
+            restart = np.einsum('ki,ki->k', momentum - updated, step)[:, np.newaxis] > 0
+            t = np.where(restart, 1.0, t)
+            t_next = (1.0 + np.sqrt(1.0 + 4.0 * t * t)) / 2.0
+            momentum = updated + ((t - 1.0) / t_next) * step
+            weights, t = updated, t_next
+            if np.abs(step).max() < TOLERANCE:
+                break
+        return weights
+
+    def solve_min_cvar(self, caps: np.ndarray, confidence: float) -> np.ndarray:
+        """Weights minimizing the historical CVaR of the loss (1 - ROI multiple)"""
+        n, scenarios = len(self.genres), len(self.scenarios)
+        # Variables: weights (n), VaR threshold alpha, excess loss per scenario (s)
+        cost = np.concatenate([np.zeros(n), [1.0], np.full(scenarios, 1.0 / ((1.0 - confidence) * scenarios))])
+        # 1 - r_s . w - alpha <= u_s
+        excess = np.hstack([-self.scenarios, -np.ones((scenarios, 1)), -np.eye(scenarios)])
+        budget = np.concatenate([np.ones(n), [0.0], np.zeros(scenarios)])[np.newaxis, :]
+        bounds = [(0.0, float(cap)) for cap in caps] + [(None, None)] + [(0.0, None)] * scenarios
+        result = linprog(cost, A_ub=excess, b_ub=-np.ones(scenarios), A_eq=budget, b_eq=[1.0],
+                         bounds=bounds, method='highs')
+        if not result.success:
+            raise ValueError(f"CVaR optimization failed: {result.message}")
+        return project_capped_simplex(result.x[np.newaxis, :n], caps)[0]
+
+    def cvar(self, weights: np.ndarray, confidence: float) -> float:
+        """Mean loss of the worst (1 - confidence) share of the historical scenarios"""
+        losses = np.sort(1.0 - self.scenarios @ weights)[::-1]
+        tail = max(1, int(np.ceil(len(losses) * (1.0 - confidence))))
+        return float(losses[:tail].mean())
+
+    def _metrics(self, weights: np.ndarray) -> Dict:
+        """Expected ROI multiple, volatility and Sharpe ratio (excess over break-even) of weight rows"""
+        expected = weights @ self.mean
+        volatility = np.sqrt(np.maximum(np.einsum('ki,ij,kj->k', weights, self.covariance, weights), 0.0))
+        sharpe = (expected - 1.0) / np.where(volatility > 0, volatility, np.nan)
+        return {'expected_roi': expected, 'volatility': volatility, 'sharpe': np.nan_to_num(sharpe, nan=0.0)}
+
+    def frontier(self, caps: np.ndarray, points: int = 50) -> Dict:
+        """Efficient frontier from maximum return to minimum variance in one batched solve"""
+        low, high = FRONTIER_AVERSIONS
+        aversions = self._aversion_scale() * np.logspace(np.log10(low), np.log10(high), points)
+        weights = self.solve_mean_variance(aversions, caps)
+        return {'aversions': aversions, 'weights': weights, **self._metrics(weights)}
+
+    def optimize(self, objective: str, caps: np.ndarray, risk_aversion: float = 1.0,
+                 confidence: float = 0.95) -> np.ndarray:
+        """Weights of one allocation; raises ValueError for an unknown objective"""
+        if objective == "mean_variance":
+            return self.solve_mean_variance(np.array([risk_aversion * self._aversion_scale()]), caps)[0]
+        if objective == "min_variance":
+            return self.solve_mean_variance(np.array([FRONTIER_AVERSIONS[1] * self._aversion_scale()]), caps)[0]
+        if objective == "min_cvar":
+            return self.solve_min_cvar(caps, confidence)
+        if objective == "max_sharpe":
+            # Best point of a coarse frontier, then of a finer batch between its neighbours
+            coarse = self.frontier(caps, 48)
+            best = int(np.argmax(coarse['sharpe']))
+            aversions = coarse['aversions']
+            fine = np.geomspace(aversions[max(best - 1, 0)], aversions[min(best + 1, len(aversions) - 1)], 48)
+            weights = self.solve_mean_variance(fine, caps)
+            return weights[int(np.argmax(self._metrics(weights)['sharpe']))]
+        raise ValueError(f"Unknown objective {objective}; expected one of {', '.join(OBJECTIVES)}")
+
+    def describe(self, weights: np.ndarray, confidence: float = 0.95, budget: Optional[float] = None) -> Dict:
+        """Allocation (largest first) with its expected ROI, volatility, Sharpe ratio and historical CVaR"""
+        metrics = {name: float(values[0]) for name, values in self._metrics(weights[np.newaxis, :]).items()}
+        allocation = []
+        for i in np.argsort(-weights, kind='stable').tolist():
+            if weights[i] < MIN_REPORTED_WEIGHT:
+                continue
+            entry = {
+                'genre': self.genres[i],
+                'weight': round(float(weights[i]), 4),
+                'expected_roi': round(float(self.mean[i]), 4),
+                'volatility': round(float(self.volatility[i]), 4)
+            }
+            if budget:
+                entry['amount'] = round(float(weights[i]) * budget, 2)
+            allocation.append(entry)
+        return {
+            'allocation': allocation,
+            'expected_roi': round(metrics['expected_roi'], 4),
+            'volatility': round(metrics['volatility'], 4),
+            'sharpe': round(metrics['sharpe'], 4),
+            'cvar': round(self.cvar(weights, confidence), 4),
+            'confidence': confidence
+        }
+
+    def summary(self) -> Dict:
+        """Inputs of every solve: genres, expected ROI, volatility and correlation"""
+        volatility = np.where(self.volatility > 0, self.volatility, 1.0)
+        return {
+            'genres': self.genres,
+            'expected_roi': np.round(self.mean, 4).tolist(),
+            'volatility': np.round(self.volatility, 4).tolist(),
+            'correlation': np.round(self.covariance / np.outer(volatility, volatility), 4).tolist(),
+            'years': self.years,
+            'scenarios': len(self.scenarios)
+        }
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from services.executor import PoolSaturatedError
+
+
+# Seconds to wait before retrying an artifact whose pool was saturated by live traffic
+SATURATED_RETRY_SECONDS = 0.5
+
+
+class PrecomputeTask:
+    """One derived artifact to warm: lower priorities run first, gating ones must finish before /ready"""
+
+    def __init__(self, name: str, priority: int, warm: Callable[[], Awaitable], gating: bool = False):
+        self.name = name
+        self.priority = priority
+        self.warm = warm
+        self.gating = gating
+
+
+class PrecomputeScheduler:
+    """Warms the derived analytics of the installed dataset in the background.
+
+    Each artifact is a pure function of the loaded DataService/MLService
+    pair, so it is computed once as soon as the pair is installed instead
+    of by the first request that needs it. Tasks run one at a time in
+    priority order, each on the worker pool its endpoint uses, so the event
+    loop stays free and live requests compete with at most one warm-up
+    call. When a pool is saturated by traffic the task backs off and tries
+    again. Installing a new pair cancels the remaining work and starts over
+    for the new version.
+
+    Readiness is reported per artifact. The service counts as ready once
+    the gating artifacts are warm; slower ones keep warming while it
+    takes traffic.
+    """
+
+    def __init__(self):
+        self.version: Optional[str] = None
+        self.tasks: List[PrecomputeTask] = []
+        self.artifacts: Dict[str, Dict] = {}
+        self._runner: Optional[asyncio.Task] = None
+
+    def start(self, version: str, tasks: List[PrecomputeTask]):
+        """Cancel any warm-up in progress and warm the given tasks for a new version"""
+        self.cancel()
+        self.version = version
+        self.tasks = sorted(tasks, key=lambda task: task.priority)
+        self.artifacts = {
+            task.name: {"state": "pending", "priority": task.priority, "gating": task.gating}
+            for task in self.tasks
+        }
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Installed outside an event loop (scripts, benchmarks): artifacts are computed on demand
+            return
+        self._runner = loop.create_task(self._run(version))
+
+    def cancel(self):
+        """Stop warming; artifacts not yet warm stay pending and are computed on demand"""
+        if self._runner is not None and not self._runner.done():
+            self._runner.cancel()
+        self._runner = None
+
+    async def _run(self, version: str):
+        started = time.perf_counter()
+        for task in self.tasks:
+            artifact = self.artifacts[task.name]
+            artifact["state"] = "warming"
+            task_started = time.perf_counter()
+            try:
+                while True:
+                    try:
+                        await task.warm()
+                        break
+                    except PoolSaturatedError:
+                        await asyncio.sleep(SATURATED_RETRY_SECONDS)
+                artifact["state"] = "ready"
+            except asyncio.CancelledError:
+                artifact["state"] = "pending"
+                raise
+            except Exception as e:
+                # A failed artifact is still served (and retried) on demand
+                artifact["state"] = "failed"
+                artifact["error"] = str(e)
+                print(f"⚠️ Precompute of {task.name} failed: {e}")
+            artifact["seconds"] = round(time.perf_counter() - task_started, 4)
+        ready = sum(a["state"] == "ready" for a in self.artifacts.values())
+        print(f"✅ Precomputed {ready}/{len(self.artifacts)} artifacts for {version} "
+              f"in {time.perf_counter() - started:.2f}s")
+
+    @property
+    def ready(self) -> bool:
+        """True once every gating artifact is warm (or failed, so a bad artifact never blocks traffic)"""
+        return self.version is not None and all(
+            artifact["state"] in ("ready", "failed")
+            for artifact in self.artifacts.values() if artifact["gating"]
+        )
+
+    def status(self) -> Dict:
+        """Readiness of the service and of every artifact"""
+        return {
+            "version": self.version,
+            "ready": self.ready,
+            "warmed": sum(artifact["state"] == "ready" for artifact in self.artifacts.values()),
+            "total": len(self.artifacts),
+            "artifacts": self.artifacts
+        }
+
+
+precompute_scheduler = PrecomputeScheduler()
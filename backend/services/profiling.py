@@ -0,0 +1,162 @@
+import contextvars
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Dict, List, Optional
+
+
+# Profile of the request being handled, carried into pool threads with the context
+current_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+
+MAX_STACK_DEPTH = 64
+
+# Innermost frames of a thread waiting for work (the event loop between requests)
+IDLE_FRAMES = {("selectors.py", "select"), ("selectors.py", "poll")}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}"
+
+
+def _folded_stack(frame) -> str:
+    """Outermost-first 'file:function:line;...' stack of a frame"""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class RequestProfile:
+    """Stack samples of the threads working on one request.
+
+    Pool threads register themselves while they run one of its calls, and
+    the event loop thread is registered for explicitly requested profiles. Sampling
+    only runs between start() and stop(), so a request profiled because it
+    turned out slow costs nothing until it crosses the threshold.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, method: str, path: str, trigger: str, interval: float):
+        self.id = next(self._ids)
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.interval = interval
+        self.route: Optional[str] = None
+        self.status: Optional[int] = None
+        self.started_at = time.time()
+        self.duration: Optional[float] = None
+        self.samples: Counter = Counter()
+        self.sampling = False
+        self._threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def enter_thread(self):
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def exit_thread(self):
+        ident = threading.get_ident()
+        with self._lock:
+            remaining = self._threads.get(ident, 0) - 1
+            if remaining > 0:
+                self._threads[ident] = remaining
+            else:
+                self._threads.pop(ident, None)
+
+    def start(self):
+        """Begin sampling on a background thread"""
+        if self._sampler is not None:
+            return
+        self.sampling = True
+        self._sampler = threading.Thread(target=self._run, name=f"cineintel-profile-{self.id}", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        # No join: the sampler exits within one interval, and the event loop must not wait for it
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads)
+            for ident in threads:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                if (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES:
+                    continue
+                self.samples[_folded_stack(frame)] += 1
+
+    def summary(self) -> Dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "trigger": self.trigger,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 2) if self.duration is not None else None,
+            "interval_ms": round(self.interval * 1000, 2),
+            "samples": sum(self.samples.values())
+        }
+
+    def report(self, top: int = 50) -> Dict:
+        """Summary with the hottest stacks and the functions sampled most often on top of them"""
+        leaves = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return {
+            **self.summary(),
+            "stacks": [{"stack": stack, "samples": count} for stack, count in self.samples.most_common(top)],
+            "hot_functions": [{"frame": frame, "samples": count} for frame, count in leaves.most_common(top)]
+        }
+
+    def folded(self) -> str:
+        """Samples in the folded format read by flamegraph.pl and speedscope"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.items())
+
+
+class ProfileStore:
+    """Most recent request profiles, newest last"""
+
+    def __init__(self, keep: int):
+        self._profiles: deque = deque(maxlen=keep)
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile):
+        with self._lock:
+            self._profiles.append(profile)
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            return [profile.summary() for profile in self._profiles]
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        with self._lock:
+            return next((p for p in self._profiles if p.id == profile_id), None)
+
+
+def profiled_call(fn: Callable, *args, **kwargs):
+    """Run fn, letting the request profile (if any) sample the current thread meanwhile"""
+    profile = current_profile.get()
+    if profile is None:
+        return fn(*args, **kwargs)
+    profile.enter_thread()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profile.exit_thread()
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from services.data_service import DataService, dataset_sources
+from services.ml_service import MLService
+from services.shared_dataset import SharedDataset
+from services.snapshot import source_fingerprint
+
+
+class ReloadInProgressError(RuntimeError):
+    """Raised when a reload is requested while another one is still building"""
+
+
+class SourceWatcher:
+    """Detects settled changes to the dataset CSV files by polling their size and mtime"""
+
+    def __init__(self, data_dir: str):
+        self.data_dir = Path(data_dir)
+        self._baseline = self._fingerprints()
+        self._pending = None
+
+    def _fingerprints(self) -> Dict:
+        return {
+            key: source_fingerprint(path) if path.exists() else None
+            for key, path in dataset_sources(self.data_dir).items()
+        }
+
+    def poll(self) -> bool:
+        """True once the files have changed and stayed unchanged for one more poll"""
+        current = self._fingerprints()
+        if current == self._baseline:
+            self._pending = None
+            return False
+        # A pipeline may still be writing; wait until two polls agree
+        if current != self._pending:
+            self._pending = current
+            return False
+        self._baseline = current
+        self._pending = None
+        return True
+
+
+class DatasetReloader:
+    """Rebuilds the DataService/MLService pair off the request path and swaps it in.
+
+    The new pair is built on a background thread while the current one keeps
+    serving. The swap is a single reference update per route module, so
+    in-flight requests finish on the pair they started with. With a shared
+    dataset the new build is published instead, and every worker (this one
+    included) switches to it through its shared dataset watcher.
+    """
+
+    def __init__(self, install: Callable[[DataService, MLService], None],
+                 shared: Optional[SharedDataset] = None):
+        self.install = install
+        self.shared = shared
+        self.last_reload: Optional[Dict] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def in_progress(self) -> bool:
+        return self._lock.locked()
+
+    @staticmethod
+    def build(data_dir: str) -> Tuple[DataService, MLService]:
+        """Load the dataset and its model; retrains only if the data changed"""
+        data_service = DataService(data_dir)
+        return data_service, MLService(data_service)
+
+    async def reload(self, data_dir: str, trigger: str = "api") -> Dict:
+        """Build a new pair from data_dir and swap (or publish) it"""
+        if self._lock.locked():
+            raise ReloadInProgressError("A dataset reload is already in progress")
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            started = time.perf_counter()
+            print(f"🚀 Reloading dataset from {data_dir} ({trigger})...")
+            data_service, ml_service = await loop.run_in_executor(None, self.build, data_dir)
+            if self.shared is not None:
+                await loop.run_in_executor(None, self.shared.publish, data_service, ml_service)
+                status = "published"
+            else:
+                self.install(data_service, ml_service)
+                status = "reloaded"
+
+            self.last_reload = {
+                "status": status,
+                "trigger": trigger,
+                "version": data_service.version,
+                "model_key": ml_service.model_key,
+                "movies": len(data_service.movies),
+                "duration_seconds": round(time.perf_counter() - started, 3),
+                "completed_at": time.time()
+            }
+            print(f"✅ Dataset {status}: version {data_service.version}, model {ml_service.model_key}")
+            return self.last_reload
+
+    async def watch(self, data_dir: str, interval: float):
+        """Reload whenever the CSV files in data_dir change"""
+        loop = asyncio.get_running_loop()
+        watcher = SourceWatcher(data_dir)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if await loop.run_in_executor(None, watcher.poll):
+                    await self.reload(data_dir, trigger="watcher")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Dataset reload failed: {e}")
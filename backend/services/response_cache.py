@@ -0,0 +1,195 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi.responses import Response
+
+import config
+from services.executor import ComputePool, data_pool
+from services.http_cache import cache_control, coded_tag, compress, entity_tag, not_modified, preferred_encoding
+from services.metrics import metrics
+from services.serialization import COLUMNAR_MEDIA_TYPE, encode_json, response_format
+
+
+def _normalize(value: Any) -> Hashable:
+    """Make an argument hashable and order-insensitive where order carries no meaning"""
+    if isinstance(value, (list, tuple, set)):
+        return tuple(sorted(_normalize(v) for v in value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    return value
+
+
+class ResponseCache:
+    """LRU/TTL cache of pre-serialized JSON bodies keyed by dataset version.
+
+    Compressed variants of a body live in the same entry, so they are
+    evicted and invalidated together with it.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[float, bytes, Dict[str, bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(method: str, version: str, **params) -> Tuple:
+        """Cache key from the method name, normalized arguments and dataset version"""
+        return (method, version, _normalize(params))
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        """Cached body for a key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, body, _ = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return body
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple, body: bytes):
+        """Store a body, evicting the least recently used entries when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, body, {})
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_variant(self, key: Tuple, encoding: str) -> Optional[bytes]:
+        """Compressed body stored with a cached entry, if any"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[2].get(encoding) if entry is not None else None
+
+    def put_variant(self, key: Tuple, encoding: str, data: bytes):
+        """Attach a compressed body to a cached entry (dropped if the entry is gone)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[2][encoding] = data
+
+    def get_or_compute(self, key: Tuple, compute: Callable[[], Any]) -> bytes:
+        """Return the cached body or compute, serialize and cache it"""
+        body = self.get(key)
+        if body is None:
+            body = encode_json(compute())
+            self.put(key, body)
+        return body
+
+    def invalidate(self):
+        """Drop every entry at once, e.g. after the dataset is reloaded"""
+        with self._lock:
+            self._entries = OrderedDict()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+response_cache = ResponseCache(
+    max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.RESPONSE_CACHE_TTL_SECONDS
+)
+
+# Bodies being computed or compressed, so concurrent misses for one key share a single pool call
+_in_flight: Dict[Tuple, "asyncio.Future[bytes]"] = {}
+
+
+async def _single_flight(key: Tuple, start: Callable[[], Awaitable[bytes]], store: Callable[[bytes], None]) -> bytes:
+    """Await the computation already running for a key, or start it and store its result.
+
+    The computation runs as its own task, so a caller that goes away does
+    not cancel it for the others waiting on the same key.
+    """
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(start())
+        _in_flight[key] = task
+
+        def finish(done: "asyncio.Future[bytes]"):
+            if _in_flight.get(key) is done:
+                del _in_flight[key]
+            if not done.cancelled() and done.exception() is None:
+                store(done.result())
+
+        task.add_done_callback(finish)
+    return await asyncio.shield(task)
+
+
+async def cached_json(method: str, version: str, compute: Callable[[], Any],
+                      pool: ComputePool = data_pool, columnar: bool = False, **params) -> Response:
+    """Serve a DataService result from the shared response cache.
+
+    Hits are answered inline; misses are computed and serialized on the pool,
+    once per key however many requests miss it concurrently.
+    Endpoints returning a DataFrame pass columnar=True to honour clients that
+    accept the columnar layout. Responses carry an ETag derived from the
+    cache key (and so from the dataset version): a matching If-None-Match
+    gets 304 without touching the cache, and large bodies are sent gzip- or
+    brotli-compressed from variants compressed once and cached.
+    """
+    layout = response_format.get() if columnar else "records"
+    key = response_cache.make_key(method, version, _layout=layout, **params)
+    etag = entity_tag(key)
+    headers = {
+        "Cache-Control": cache_control(),
+        # Shared caches must not hand a columnar body to a client that asked for records
+        "Vary": "Accept, Accept-Encoding" if columnar else "Accept-Encoding"
+    }
+    if not_modified(etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+
+    body = response_cache.get(key)
+    if body is None:
+        metrics.cache_lookups.inc(method, "miss")
+        body = await _single_flight(
+            key, lambda: pool.run(_compute_and_serialize, method, compute, layout == "columnar"),
+            lambda data: response_cache.put(key, data)
+        )
+    else:
+        metrics.cache_lookups.inc(method, "hit")
+
+    encoding = preferred_encoding() if len(body) >= config.COMPRESS_MIN_BYTES else None
+    if encoding is not None:
+        compressed = response_cache.get_variant(key, encoding)
+        if compressed is None:
+            compressed = await _single_flight(
+                (key, encoding), lambda: pool.run(compress, body, encoding),
+                lambda data: response_cache.put_variant(key, encoding, data)
+            )
+        body = compressed
+        headers["Content-Encoding"] = encoding
+    headers["ETag"] = coded_tag(etag, encoding)
+
+    media_type = COLUMNAR_MEDIA_TYPE if layout == "columnar" else "application/json"
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def _compute_and_serialize(method: str, compute: Callable[[], Any], columnar: bool = False) -> bytes:
+    """Compute a payload and encode it, recording time and size per method"""
+    started = time.perf_counter()
+    body = encode_json(compute(), columnar)
+    metrics.serialize_latency.observe(time.perf_counter() - started, method)
+    metrics.payload_size.observe(len(body), method)
+    return body
@@ -0,0 +1,126 @@
+import datetime
+import json
+import math
+from contextvars import ContextVar
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder is used without it
+    orjson = None
+
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.cineintel.columnar+json"
+
+# Body layout the current request asked for: "records" (default) or "columnar"
+response_format: ContextVar[str] = ContextVar("response_format", default="records")
+
+
+def prefers_columnar(accept: str) -> bool:
+    """True when Accept rates the columnar type above zero and at least as high as JSON, honouring q-values"""
+    weights: Dict[str, float] = {}
+    for item in accept.split(","):
+        media_type, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[media_type.strip().lower()] = quality
+    # Only an explicit mention selects columnar; wildcards stand for plain JSON
+    columnar = weights.get(COLUMNAR_MEDIA_TYPE, 0.0)
+    json_weight = weights.get("application/json", weights.get("application/*", weights.get("*/*", 0.0)))
+    return columnar > 0 and columnar >= json_weight
+
+
+async def negotiate_format(request: Request):
+    """App-wide dependency: remember whether the client accepts columnar tables"""
+    accept = request.headers.get("accept", "")
+    response_format.set("columnar" if prefers_columnar(accept) else "records")
+
+
+def frame_records(df: pd.DataFrame) -> list:
+    """Rows of a frame as dicts, converted column by column instead of cell by cell"""
+    columns = [_column_values(df[name]) for name in df.columns]
+    names = [str(name) for name in df.columns]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def frame_columns(df: pd.DataFrame) -> Dict:
+    """Columnar layout of a frame: {"columns": [...], "data": {column: values}, "length": n}"""
+    return {
+        "columns": [str(name) for name in df.columns],
+        "data": {str(name): _column_values(df[name], arrays=True) for name in df.columns},
+        "length": len(df)
+    }
+
+
+def _column_values(column: pd.Series, arrays: bool = False):
+    """Values of one column; numeric columns stay NumPy arrays when the encoder can take them as-is"""
+    values = column.to_numpy()
+    if arrays and orjson is not None and values.dtype.kind in "biuf":
+        # orjson writes native-endian, contiguous arrays straight from the buffer
+        return np.ascontiguousarray(values)
+    if values.dtype.kind == "M":
+        return [None if pd.isna(v) else v.isoformat() for v in column]
+    return column.tolist()
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not encode natively"""
+    if isinstance(obj, pd.DataFrame):
+        return frame_records(obj)
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.tolist()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, (pd.Timestamp, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _to_builtin(obj: Any) -> Any:
+    """Plain-Python copy of a payload for the stdlib encoder; NaN and infinities become null"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if obj is None or isinstance(obj, (str, bool, int)):
+        return obj
+    if isinstance(obj, dict):
+        return {str(k): _to_builtin(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_builtin(v) for v in obj]
+    return _to_builtin(_default(obj))
+
+
+def encode_json(payload: Any, columnar: bool = False) -> bytes:
+    """JSON bytes of a payload, encoding DataFrames and NumPy values directly.
+
+    NaN and infinities are written as null. With columnar=True a top-level
+    DataFrame is written column by column instead of as a list of records.
+    """
+    if columnar and isinstance(payload, pd.DataFrame):
+        payload = frame_columns(payload)
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_to_builtin(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: encodes with orjson (when installed) and understands DataFrames"""
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
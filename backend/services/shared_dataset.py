@@ -0,0 +1,120 @@
+import asyncio
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from services.data_service import DataService
+from services.ml_service import MLService
+
+
+CURRENT_FILE = "CURRENT.json"
+
+# Published builds kept on disk; older ones may still be mapped by a worker mid-swap
+KEEP_GENERATIONS = 2
+
+
+class SharedDataset:
+    """Dataset and model built once and shared read-only by every uvicorn worker.
+
+    A publisher (the launcher process, or an admin reload) compiles the cleaned
+    tables into a versioned snapshot directory, makes sure the model artifact
+    for that data is in the model store, and then atomically replaces
+    CURRENT.json to point at the new generation. Workers attach by
+    memory-mapping the snapshot and the model artifact, so the column data
+    lives once in the page cache no matter how many workers run, and every
+    worker polls CURRENT.json to swap to a new generation together.
+    """
+
+    def __init__(self, shared_dir: str):
+        self.shared_dir = Path(shared_dir)
+
+    @property
+    def current_path(self) -> Path:
+        return self.shared_dir / CURRENT_FILE
+
+    def read_current(self) -> Optional[Dict]:
+        """Pointer to the published generation, or None before the first publish"""
+        try:
+            with open(self.current_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def publish(self, data_service: DataService, ml_service: MLService) -> Dict:
+        """Publish a built DataService/MLService pair as the current generation"""
+        self.shared_dir.mkdir(parents=True, exist_ok=True)
+        generation = f"{data_service.version}-{ml_service.model_key}"
+        snapshot_dir = self.shared_dir / generation
+        if not snapshot_dir.exists():
+            data_service.write_snapshot(snapshot_dir)
+        if not ml_service.model_store.artifact_path(ml_service.model_key).exists():
+            ml_service.save_model()
+
+        current = {
+            "generation": generation,
+            "version": data_service.version,
+            "model_key": ml_service.model_key,
+            "data_dir": str(data_service.data_dir.resolve()),
+            "published": time.time()
+        }
+        tmp_path = self.current_path.with_name(f"{CURRENT_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        os.replace(tmp_path, self.current_path)
+
+        self._prune(keep={generation})
+        print(f"✅ Published shared dataset generation {generation}")
+        return current
+
+    def _prune(self, keep: set):
+        """Remove old generations beyond KEEP_GENERATIONS"""
+        generations = sorted(
+            (p for p in self.shared_dir.iterdir() if p.is_dir() and not p.name.endswith((".tmp", ".old"))),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True
+        )
+        for path in generations[KEEP_GENERATIONS:]:
+            if path.name not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def attach(self, current: Optional[Dict] = None) -> Tuple[DataService, MLService]:
+        """Open the published generation read-only"""
+        current = current or self.read_current()
+        if current is None:
+            raise FileNotFoundError(f"Nothing published in {self.shared_dir}")
+        data_service = DataService(current["data_dir"], snapshot_dir=self.shared_dir / current["generation"])
+        # Every worker serves the published model; a missing artifact fails the attach instead of retraining
+        ml_service = MLService(data_service, model_key=current["model_key"])
+        return data_service, ml_service
+
+    async def watch(self, generation: str, on_swap: Callable[[DataService, MLService], None],
+                    interval: float = 2.0):
+        """Poll CURRENT.json and hand every newly published generation to on_swap"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                current = await loop.run_in_executor(None, self.read_current)
+                if current is None or current["generation"] == generation:
+                    continue
+                # Attaching maps files and rebuilds indexes; keep it off the event loop
+                services = await loop.run_in_executor(None, self.attach, current)
+                on_swap(*services)
+                generation = current["generation"]
+                print(f"✅ Switched to shared dataset generation {generation}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Could not attach shared dataset: {e}")
+
+
+if __name__ == "__main__":
+    # Publish step: python -m services.shared_dataset <shared_dir> [data_dir]
+    import sys
+
+    shared = SharedDataset(sys.argv[1])
+    data_service = DataService(sys.argv[2]) if len(sys.argv) > 2 else DataService()
+    shared.publish(data_service, MLService(data_service))
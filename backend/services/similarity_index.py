@@ -0,0 +1,176 @@
+import numpy as np
+from typing import List, Optional, Tuple
+
+from services.feature_store import BITS_PER_WORD, FeatureStore, popcount
+
+
+# Numeric dimensions of the similar-movie score with their weight and distance scale.
+# Budget distance is relative to the query budget, so its scale is set per query.
+INDEX_DIMENSIONS = [
+    ('budget', 25, None),
+    ('year', 15, 10),
+    ('imdb_rating', 20, 5),
+    ('runtime', 10, 100),
+]
+GENRE_WEIGHT = 30
+
+# Maximum movies per leaf block
+DEFAULT_LEAF_SIZE = 64
+
+
+class SimilarityIndex:
+    """Exact nearest-neighbour index for the similar-movie lookups.
+
+    Movies are partitioned by their genre bitset and each partition is split
+    into leaf blocks sorted by year, every block carrying a bounding box over
+    the numeric features. A query ranks blocks by the best score they could
+    possibly reach and stops once no remaining block can beat the current
+    top N, so only a fraction of the catalog is scored exactly.
+    """
+
+    def __init__(self, store: FeatureStore, leaf_size: int = DEFAULT_LEAF_SIZE):
+        self.store = store
+        self.leaf_size = leaf_size
+        self._build_blocks()
+        self._build_budget_order()
+
+    def _build_blocks(self):
+        """Group scorable movies into genre partitions and bounded leaf blocks"""
+        store = self.store
+        values = np.column_stack([store.column(name) for name, _, _ in INDEX_DIMENSIONS])
+
+        # Movies with a missing feature never receive a score, so they are not indexed
+        scorable = np.flatnonzero(~np.isnan(values).any(axis=1))
+        keys, partition_of = np.unique(store.genre_bitset[scorable], axis=0, return_inverse=True)
+        partition_of = partition_of.reshape(-1)
+
+        block_rows, block_keys = [], []
+        for partition in range(len(keys)):
+            rows = scorable[partition_of == partition]
+            rows = rows[np.argsort(values[rows, 1], kind='stable')]
+            for start in range(0, len(rows), self.leaf_size):
+                block_rows.append(np.sort(rows[start:start + self.leaf_size]))
+                block_keys.append(keys[partition])
+
+        self.block_rows = block_rows
+        self.block_keys = (
+            np.array(block_keys, dtype=np.uint64).reshape(-1, store.words)
+            if block_keys else np.zeros((0, store.words), dtype=np.uint64)
+        )
+        self.block_values = [values[rows] for rows in block_rows]
+        self.block_lo = np.array([v.min(axis=0) for v in self.block_values]).reshape(-1, len(INDEX_DIMENSIONS))
+        self.block_hi = np.array([v.max(axis=0) for v in self.block_values]).reshape(-1, len(INDEX_DIMENSIONS))
+
+    def _build_budget_order(self):
+        """Movies sorted by log budget, overall and per genre, for the simulator's budget-cluster lookup"""
+        store = self.store
+        log_budget = store.log_budget
+        valid = np.flatnonzero(~np.isnan(log_budget))
+        self.budget_order = valid[np.argsort(log_budget[valid], kind='stable')]
+        self.sorted_log_budget = log_budget[self.budget_order]
+
+        # Genres held by at least one movie, so the no-match fallback needs no catalog scan
+        self.genres_present = np.bitwise_or.reduce(store.genre_bitset, axis=0)
+        # The budget order restricted to each genre, so a one-genre query only visits its own movies
+        self.genre_budget_orders = []
+        for bit in range(len(store.genres)):
+            word, offset = divmod(bit, BITS_PER_WORD)
+            member = (store.genre_bitset[self.budget_order, word] >> np.uint64(offset)) & np.uint64(1)
+            order = self.budget_order[member.astype(bool)]
+            self.genre_budget_orders.append((order, log_budget[order]))
+
+    def _score(self, values: np.ndarray, genre_match: int, query: List[float], scales: List[float]) -> np.ndarray:
+        """Exact similar-movie score of indexed rows"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = genre_match * GENRE_WEIGHT
+            for dim, (_, weight, _) in enumerate(INDEX_DIMENSIONS):
+                score = score + (1 - np.clip(np.abs(values[:, dim] - query[dim]) / scales[dim], 0, 1)) * weight
+        return score
+
+    def query(self, genre: str, budget: float, year: int, imdb_rating: float,
+              runtime: int, top_n: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-N movie positions and scores, identical to a full weighted scan"""
+        if len(self.block_rows) == 0 or top_n <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        # Python scalars keep the arithmetic in float32, exactly like the full scan
+        query = [float(budget), float(year), float(imdb_rating), float(runtime)]
+        scales = [query[0] if scale is None else float(scale) for _, _, scale in INDEX_DIMENSIONS]
+        genre_match = popcount(self.block_keys & self.store.genre_mask(genre)).sum(axis=-1)
+
+        # Best reachable score per block: distance from the query to its bounding box
+        gap = np.maximum(np.maximum(self.block_lo - query, query - self.block_hi), 0)
+        weights = np.array([weight for _, weight, _ in INDEX_DIMENSIONS], dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            closeness = 1 - np.clip(gap / scales, 0, 1)
+        # Small slack covers float32 rounding in the exact scores
+        bounds = genre_match * GENRE_WEIGHT + np.nan_to_num(closeness, nan=1.0) @ weights + 1e-3
+
+        rows_found, scores_found = [], []
+        kth_score = -np.inf
+        found = 0
+        for block in np.argsort(-bounds, kind='stable'):
+            # Ties are broken by catalog position, so only a strictly lower bound is safe to skip
+            if found >= top_n and bounds[block] < kth_score:
+                break
+            scores = self._score(self.block_values[block], genre_match[block], query, scales)
+            rows_found.append(self.block_rows[block])
+            scores_found.append(scores)
+            found += len(scores)
+            if found >= top_n:
+                all_scores = np.concatenate(scores_found)
+                kth_score = np.partition(np.nan_to_num(all_scores, nan=-np.inf), -top_n)[-top_n]
+
+        # Restore catalog order so ties resolve exactly as in a full scan
+        rows = np.concatenate(rows_found)
+        order = np.argsort(rows, kind='stable')
+        rows, scores = rows[order], np.concatenate(scores_found)[order]
+        top = FeatureStore.top_k(scores, top_n)
+        return rows[top], scores[top]
+
+    def nearest_budget(self, genre: Optional[str], budget: float, top_n: int = 10) -> np.ndarray:
+        """Movies closest in log budget among those sharing a genre with the query.
+
+        Falls back to the whole catalog when no movie shares a genre. The search
+        widens a window around the query's position in the budget order until
+        the N nearest matches are settled; a one-genre query searches that
+        genre's own budget order, so no row outside the genre is visited.
+        """
+        store = self.store
+        if len(self.budget_order) == 0 or top_n <= 0:
+            return np.zeros(0, dtype=np.int64)
+
+        mask = store.genre_mask(genre)
+        candidates, sorted_log_budget = self.budget_order, self.sorted_log_budget
+        if not (self.genres_present & mask).any():
+            mask = None
+        elif int(popcount(mask).sum()) == 1:
+            bit = next(store.genre_bits[name] for name in genre.split('|') if name in store.genre_bits)
+            candidates, sorted_log_budget = self.genre_budget_orders[bit]
+            mask = None
+
+        total = len(candidates)
+        target = np.float32(np.log1p(budget))
+        center = int(np.searchsorted(sorted_log_budget, target))
+        width = max(top_n, 16)
+        while True:
+            lo, hi = max(0, center - width), min(total, center + width)
+            rows = candidates[lo:hi]
+            if mask is not None:
+                rows = rows[popcount(store.genre_bitset[rows] & mask).sum(axis=-1) > 0]
+            distances = np.abs(store.log_budget[rows] - target)
+
+            # Anything outside the window is at least this far from the query
+            outside = np.inf
+            if lo > 0:
+                outside = min(outside, abs(sorted_log_budget[lo - 1] - target))
+            if hi < total:
+                outside = min(outside, abs(sorted_log_budget[hi] - target))
+
+            if len(rows) >= top_n:
+                order = np.lexsort((rows, distances))[:top_n]
+                if distances[order[-1]] < outside:
+                    return rows[order]
+            if lo == 0 and hi == total:
+                return rows[np.lexsort((rows, distances))[:top_n]]
+            width *= 2
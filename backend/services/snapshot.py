@@ -0,0 +1,168 @@
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.model_store import file_digest
+
+
+# Bump whenever the layout or DataService's cleaning/derived tables change, so old snapshots are rebuilt
+SNAPSHOT_FORMAT = 3
+SNAPSHOT_DIRNAME = "snapshot"
+MANIFEST_FILE = "manifest.json"
+
+# String columns with at most this share of distinct values are stored as codes + categories
+CATEGORY_MAX_RATIO = 0.5
+
+
+def source_fingerprint(path: Path) -> Dict:
+    """Cheap identity of a source file, used to detect a stale snapshot"""
+    stat = path.stat()
+    return {"name": path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _write_table(df: pd.DataFrame, table_dir: Path) -> Dict:
+    """Write a DataFrame as one .npy file per column"""
+    table_dir.mkdir(parents=True)
+    columns = []
+    for name in df.columns:
+        series = df[name]
+        file_stem = f"c{len(columns)}"
+        entry = {"name": name, "file": f"{file_stem}.npy"}
+
+        if pd.api.types.is_datetime64_any_dtype(series):
+            entry["kind"] = "datetime"
+            entry["unit"] = np.datetime_data(series.dtype)[0]
+            values = series.to_numpy().view(np.int64)
+        elif pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            entry["kind"] = "numeric"
+            values = series.to_numpy()
+        else:
+            codes, categories = pd.factorize(series)
+            unique_ratio = len(categories) / max(len(series), 1)
+            entry["kind"] = "category" if unique_ratio <= CATEGORY_MAX_RATIO else "text"
+            entry["categories"] = f"{file_stem}.json"
+            values = codes.astype(np.int32)
+            with open(table_dir / entry["categories"], "w", encoding="utf-8") as f:
+                json.dump([str(c) for c in categories], f, ensure_ascii=False)
+
+        np.save(table_dir / entry["file"], np.ascontiguousarray(values), allow_pickle=False)
+        columns.append(entry)
+    return {"rows": len(df), "columns": columns}
+
+
+def _read_table(table_dir: Path, spec: Dict, mmap: bool) -> pd.DataFrame:
+    """Rebuild a DataFrame; numeric columns are memory-mapped straight from disk"""
+    data = {}
+    for entry in spec["columns"]:
+        values = np.load(table_dir / entry["file"], mmap_mode="r" if mmap else None, allow_pickle=False)
+        if entry["kind"] == "datetime":
+            data[entry["name"]] = values.view(f"datetime64[{entry['unit']}]")
+        elif entry["kind"] == "numeric":
+            data[entry["name"]] = values
+        else:
+            with open(table_dir / entry["categories"], encoding="utf-8") as f:
+                categories = np.array(json.load(f), dtype=object)
+            codes = np.asarray(values)
+            decoded = np.empty(len(codes), dtype=object)
+            present = codes >= 0
+            decoded[present] = categories[codes[present]]
+            decoded[~present] = np.nan
+            # Same string dtype read_csv would have produced
+            data[entry["name"]] = pd.Series(decoded, copy=False).infer_objects()
+    return pd.DataFrame(data, copy=False)
+
+
+def write_snapshot(snapshot_dir: Path, tables: Dict[str, pd.DataFrame],
+                   sources: Dict[str, Path], digests: Dict[str, str], version: str) -> Path:
+    """Compile cleaned tables into a columnar snapshot, replacing any previous one atomically"""
+    snapshot_dir = Path(snapshot_dir)
+    staging = snapshot_dir.with_name(f"{snapshot_dir.name}.{os.getpid()}.tmp")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "created": time.time(),
+        "version": version,
+        "sources": {
+            key: {**source_fingerprint(path), "digest": digests[key]}
+            for key, path in sources.items()
+        },
+        "tables": {name: _write_table(df, staging / name) for name, df in tables.items()}
+    }
+    with open(staging / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Swap directories so readers see either the old or the new snapshot, never a mix
+    retired = snapshot_dir.with_name(f"{snapshot_dir.name}.{os.getpid()}.old")
+    if snapshot_dir.exists():
+        os.replace(snapshot_dir, retired)
+    os.replace(staging, snapshot_dir)
+    shutil.rmtree(retired, ignore_errors=True)
+    return snapshot_dir
+
+
+def read_manifest(snapshot_dir: Path) -> Optional[Dict]:
+    """Snapshot manifest, or None if there is no usable snapshot"""
+    path = Path(snapshot_dir) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        return None
+    return manifest
+
+
+def is_fresh(manifest: Dict, sources: Dict[str, Path]) -> bool:
+    """Whether the snapshot was compiled from the current source files"""
+    if set(manifest["sources"]) != set(sources):
+        return False
+    for key, path in sources.items():
+        recorded = manifest["sources"][key]
+        if not path.exists() or recorded["name"] != path.name:
+            return False
+        current = source_fingerprint(path)
+        if current["size"] != recorded["size"]:
+            return False
+        # A touched but unchanged file is still fresh
+        if current["mtime_ns"] != recorded["mtime_ns"] and file_digest(path) != recorded["digest"]:
+            return False
+    return True
+
+
+def load_snapshot(snapshot_dir: Path, sources: Dict[str, Path], mmap: bool = True,
+                  verify_sources: bool = True) -> Optional[Dict]:
+    """Load tables from a fresh snapshot; None when missing or stale"""
+    manifest = read_manifest(snapshot_dir)
+    if manifest is None:
+        return None
+    if verify_sources and not is_fresh(manifest, sources):
+        return None
+    tables = {
+        name: _read_table(Path(snapshot_dir) / name, spec, mmap)
+        for name, spec in manifest["tables"].items()
+    }
+    return {
+        "tables": tables,
+        "version": manifest["version"],
+        "digests": {key: src["digest"] for key, src in manifest["sources"].items()}
+    }
+
+
+if __name__ == "__main__":
+    # Compile step: python -m services.snapshot [data_dir]
+    from services.data_service import DataService
+
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "../movie-data-pipeline"
+    service = DataService(data_dir, use_snapshot=False)
+    path = service.write_snapshot()
+    print(f"✅ Snapshot {service.version} written to {path}")
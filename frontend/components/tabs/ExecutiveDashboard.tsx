@@ -27,14 +27,10 @@ export default function ExecutiveDashboard() {
 
   const loadData = async () => {
     try {
-      const [summaryData, pulseData, genresData] = await Promise.all([
-        api.getDashboardSummary(),
-        api.getMarketPulse(),
-        api.getAllGenres(),
-      ]);
-      setSummary(summaryData);
-      setMarketPulse(pulseData);
-      setGenres(genresData.genres || []);
+      const dashboard = await api.getDashboardBootstrap();
+      setSummary(dashboard.summary);
+      setMarketPulse(dashboard.market_pulse);
+      setGenres(dashboard.genres || []);
     } catch (error) {
       console.error("Error loading dashboard:", error);
     } finally {
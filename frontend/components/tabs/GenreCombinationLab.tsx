@@ -14,7 +14,8 @@ export default function GenreCombinationLab() {
 
   const loadData = async () => {
     try {
-      const data = await api.getGenreCombinations();
+      // Only the top/bottom 10 are rendered; the full list stays on the server
+      const data = await api.getGenreCombinations({ limit: 0 });
       setCombinations(data);
     } catch (error) {
       console.error("Error:", error);
@@ -135,7 +136,7 @@ export default function GenreCombinationLab() {
           <h3 className="text-sm font-bold text-gray-400 uppercase mb-4">Global Reach</h3>
           <div className="flex items-center justify-between">
             <div>
-              <p className="text-2xl font-bold text-white">{combinations?.all_combinations?.length || 0}</p>
+              <p className="text-2xl font-bold text-white">{combinations?.total_combinations || 0}</p>
               <p className="text-xs text-gray-500">Unique Combinations Identified</p>
             </div>
           </div>
@@ -25,6 +25,7 @@ export default function InvestmentSimulator() {
     releaseMonth: 12,
   });
   const [prediction, setPrediction] = useState<any>(null);
+  const [sweep, setSweep] = useState<any>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
@@ -44,15 +45,26 @@ export default function InvestmentSimulator() {
   const handlePredict = async () => {
     setLoading(true);
     setPrediction(null);
+    setSweep(null);
     setError(null);
     try {
-      const result = await api.predictInvestment({
+      const request = {
         genre: plan.genre,
         budget: parseFloat(plan.budget),
         runtime: parseInt(plan.runtime),
         release_month: plan.releaseMonth,
-      });
+      };
+      const [result, grid] = await Promise.all([
+        api.predictInvestment(request),
+        // Budget (¼x to 4x) by release month at this runtime, so the heatmap scrubs without more requests
+        api.sweepInvestment({
+          ...request,
+          budget_range: { min: request.budget / 4, max: request.budget * 4, steps: 9, log: true },
+          release_month_range: { min: 1, max: 12, steps: 12 },
+        }).catch(() => null),
+      ]);
       setPrediction(result);
+      setSweep(grid);
     } catch (error) {
       console.error("Prediction failed:", error);
       setError("Failed to initialize neural success projector.");
@@ -61,6 +73,19 @@ export default function InvestmentSimulator() {
     }
   };
 
+  // Scrub to another cell of the sensitivity grid: the KPIs come from the grid, the proxies stay from the last run
+  const selectCell = (budgetIndex: number, monthIndex: number) => {
+    const budget = sweep.axes.budget[budgetIndex];
+    const month = sweep.axes.release_month[monthIndex];
+    setPlan({ ...plan, budget: String(Math.round(budget)), releaseMonth: month });
+    setPrediction({
+      ...prediction,
+      success_probability: sweep.success_probability[budgetIndex][0][monthIndex],
+      risk_score: sweep.risk_score[budgetIndex][0][monthIndex],
+      expected_roi: sweep.expected_roi[budgetIndex],
+    });
+  };
+
   const ProbabilityGauge = ({ value }: { value: number }) => {
     const circumference = 2 * Math.PI * 40;
     const offset = circumference - (value / 100) * circumference;
@@ -211,6 +236,54 @@ export default function InvestmentSimulator() {
                 </div>
               </div>
 
+              {/* Sensitivity Heatmap */}
+              {sweep && (
+                <div className="glass rounded-3xl p-8 border border-white/5">
+                  <div className="flex items-center justify-between mb-6">
+                    <h2 className="text-xl font-bold text-white flex items-center gap-2">
+                      <Calendar className="text-primary" size={20} /> Success Sensitivity
+                    </h2>
+                    <div className="text-[10px] text-gray-500 uppercase tracking-widest font-black">Budget × Release Month</div>
+                  </div>
+                  <div className="overflow-x-auto">
+                    <table className="w-full border-separate border-spacing-1 text-[10px]">
+                      <thead>
+                        <tr>
+                          <th className="text-gray-500 font-black uppercase text-left pr-2">₹ Cr</th>
+                          {sweep.axes.release_month.map((month: number) => (
+                            <th key={month} className="text-gray-500 font-black uppercase">{MONTHS[month - 1].slice(0, 3)}</th>
+                          ))}
+                          <th className="text-gray-500 font-black uppercase pl-2">ROI</th>
+                        </tr>
+                      </thead>
+                      <tbody>
+                        {sweep.axes.budget.map((budget: number, b: number) => (
+                          <tr key={b}>
+                            <td className="text-gray-400 font-black pr-2 whitespace-nowrap">{(budget / 1e7).toFixed(1)}</td>
+                            {sweep.axes.release_month.map((month: number, m: number) => {
+                              const value = sweep.success_probability[b][0][m];
+                              const selected = Math.round(budget) === Math.round(parseFloat(plan.budget)) && month === plan.releaseMonth;
+                              return (
+                                <td
+                                  key={month}
+                                  onClick={() => selectCell(b, m)}
+                                  title={`${value}% success`}
+                                  className={`h-7 rounded-md text-center font-black text-white cursor-pointer transition-transform hover:scale-110 ${selected ? "ring-2 ring-white" : ""}`}
+                                  style={{ backgroundColor: value > 60 ? `rgba(16,185,129,${0.3 + value / 200})` : value > 35 ? `rgba(245,158,11,${0.3 + value / 200})` : `rgba(239,68,68,${0.3 + (100 - value) / 250})` }}
+                                >
+                                  {Math.round(value)}
+                                </td>
+                              );
+                            })}
+                            <td className="text-secondary font-black pl-2">{sweep.expected_roi[b]}x</td>
+                          </tr>
+                        ))}
+                      </tbody>
+                    </table>
+                  </div>
+                </div>
+              )}
+
               {/* Similar Movies Cluster */}
               <div className="glass rounded-3xl p-8 border border-white/5 relative overflow-hidden group">
                 <div className="absolute top-0 right-0 p-8 opacity-5">
@@ -1,6 +1,7 @@
 "use client";
 
 import { useState, useEffect } from "react";
+import { api } from "@/lib/api";
 import { PieChart, Pie, Cell, ResponsiveContainer, Tooltip as RechartsTooltip, Legend } from "recharts";
 import { Shield, TrendingUp, AlertTriangle, Info, Zap } from "lucide-react";
 
@@ -8,29 +9,59 @@ export default function PortfolioOptimizer() {
     const [riskLevel, setRiskLevel] = useState(50);
     const [allocation, setAllocation] = useState<any[]>([]);
     const [insights, setInsights] = useState<string>("");
+    const [frontier, setFrontier] = useState<any>(null);
+    const [simulation, setSimulation] = useState<any>(null);
 
     useEffect(() => {
-        // Simulated dynamic allocation based on risk slider
-        const calculateAllocation = (risk: number) => {
-            const highRisk = Math.min(60, risk * 0.8);
-            const safe = Math.max(10, 100 - risk * 1.2);
-            const moderate = 100 - highRisk - safe;
-
-            return [
-                { name: "Safe Haven (Low Risk)", value: Math.round(safe), color: "#10b981" },
-                { name: "Growth (Moderate)", value: Math.round(moderate), color: "#6366f1" },
-                { name: "Speculative (High Risk)", value: Math.round(highRisk), color: "#f43f5e" },
-            ];
-        };
-
-        setAllocation(calculateAllocation(riskLevel));
-
         // Fetch AI insights for the strategy
         fetch("http://localhost:8000/api/dashboard/strategic-insight")
             .then(res => res.json())
             .then(data => setInsights(data.text))
             .catch(err => console.error(err));
-    }, [riskLevel]);
+
+        // Efficient frontier of genre allocations, solved once on the server
+        api.getEfficientFrontier({ points: 21 })
+            .then(setFrontier)
+            .catch(err => console.error(err));
+    }, []);
+
+    useEffect(() => {
+        if (!frontier) return;
+
+        // The slider walks the frontier from minimum variance (0) to maximum return (100)
+        const points = frontier.points;
+        const point = points[points.length - 1 - Math.round((riskLevel / 100) * (points.length - 1))];
+        const colors = ["#10b981", "#6366f1", "#f43f5e", "#f59e0b", "#06b6d4", "#a855f7", "#84cc16", "#ec4899"];
+        setAllocation(
+            frontier.genres
+                .map((genre: string, i: number) => ({ name: genre, value: Math.round(point.weights[i] * 100) }))
+                .filter((item: any) => item.value > 0)
+                .sort((a: any, b: any) => b.value - a.value)
+                .map((item: any, i: number) => ({ ...item, color: colors[i % colors.length] }))
+        );
+    }, [riskLevel, frontier]);
+
+    useEffect(() => {
+        if (allocation.length === 0) return;
+
+        // Simulate the slate once the slider settles; progress lines refine the figures as paths finish
+        const controller = new AbortController();
+        const timer = setTimeout(() => {
+            const weights = Object.fromEntries(allocation.map((item) => [item.name, item.value]));
+            api.simulatePortfolio({ allocation: weights, paths: 200000 }, (message) => {
+                if (message.summary) setSimulation(message);
+            }, controller.signal).catch(err => {
+                if (!controller.signal.aborted) console.error(err);
+            });
+        }, 300);
+
+        return () => {
+            clearTimeout(timer);
+            controller.abort();
+        };
+    }, [allocation]);
+
+    const summary = simulation?.summary;
 
     return (
         <div className="space-y-8 page-transition">
@@ -121,17 +152,23 @@ export default function PortfolioOptimizer() {
                     <div className="grid grid-cols-1 md:grid-cols-3 gap-4 w-full mt-8">
                         <div className="glass-card p-4 text-center">
                             <p className="text-[10px] text-gray-500 font-bold uppercase mb-1">Expected ROI</p>
-                            <p className="text-xl font-bold text-emerald-400">{(1.2 + (riskLevel / 100) * 0.8).toFixed(2)}x</p>
+                            <p className="text-xl font-bold text-emerald-400">{summary ? `${summary.mean_roi.toFixed(2)}x` : "—"}</p>
                         </div>
                         <div className="glass-card p-4 text-center">
                             <p className="text-[10px] text-gray-500 font-bold uppercase mb-1">Success Prob.</p>
-                            <p className="text-xl font-bold text-primary">{Math.round(75 - (riskLevel / 100) * 20)}%</p>
+                            <p className="text-xl font-bold text-primary">{summary ? `${Math.round(100 - summary.probability_of_loss)}%` : "—"}</p>
                         </div>
                         <div className="glass-card p-4 text-center">
                             <p className="text-[10px] text-gray-500 font-bold uppercase mb-1">Volatility</p>
-                            <p className="text-xl font-bold text-rose-400">{(0.4 + (riskLevel / 100) * 1.2).toFixed(1)}σ</p>
+                            <p className="text-xl font-bold text-rose-400">{summary ? `${summary.std_roi.toFixed(1)}σ` : "—"}</p>
                         </div>
                     </div>
+
+                    {summary && (
+                        <p className="text-[10px] text-gray-500 font-bold uppercase tracking-wider mt-4">
+                            95% VaR {(summary.var * 100).toFixed(1)}% · CVaR {(summary.cvar * 100).toFixed(1)}% · {simulation.completed_paths.toLocaleString()} of {simulation.total_paths.toLocaleString()} paths
+                        </p>
+                    )}
                 </div>
             </div>
         </div>
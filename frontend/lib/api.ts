@@ -2,8 +2,31 @@
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
+const COLUMNAR_MEDIA_TYPE = 'application/vnd.cineintel.columnar+json';
+
+// Statistics tables are fetched column by column (smaller, cheaper to encode) and rebuilt into rows
+async function fetchTable(path: string, errorMessage: string) {
+  const res = await fetch(`${API_BASE_URL}${path}`, {
+    headers: { Accept: `${COLUMNAR_MEDIA_TYPE}, application/json` },
+  });
+  if (!res.ok) throw new Error(errorMessage);
+  const body = await res.json();
+  if (!res.headers.get('content-type')?.startsWith(COLUMNAR_MEDIA_TYPE)) return body;
+  return Array.from({ length: body.length }, (_, i) =>
+    Object.fromEntries(body.columns.map((column: string) => [column, body.data[column][i]]))
+  );
+}
+
 export const api = {
   // Dashboard endpoints
+  // Summary, AI recommendation, market pulse, strategic insight, capital allocation,
+  // top performers and the genre list in a single round-trip
+  async getDashboardBootstrap(limit: number = 12) {
+    const res = await fetch(`${API_BASE_URL}/api/dashboard/bootstrap?limit=${limit}`);
+    if (!res.ok) throw new Error('Failed to fetch dashboard');
+    return res.json();
+  },
+
   async getDashboardSummary() {
     const res = await fetch(`${API_BASE_URL}/api/dashboard/summary`);
     if (!res.ok) throw new Error('Failed to fetch dashboard summary');
@@ -78,15 +101,11 @@ export const api = {
   },
 
   async getGenreYearly() {
-    const res = await fetch(`${API_BASE_URL}/api/genre/yearly`);
-    if (!res.ok) throw new Error('Failed to fetch genre yearly stats');
-    return res.json();
+    return fetchTable('/api/genre/yearly', 'Failed to fetch genre yearly stats');
   },
 
   async getGenreOverall() {
-    const res = await fetch(`${API_BASE_URL}/api/genre/overall`);
-    if (!res.ok) throw new Error('Failed to fetch genre overall stats');
-    return res.json();
+    return fetchTable('/api/genre/overall', 'Failed to fetch genre overall stats');
   },
 
   async getAllGenres() {
@@ -103,9 +122,7 @@ export const api = {
 
   // Risk endpoints
   async getRiskData() {
-    const res = await fetch(`${API_BASE_URL}/api/risk/genre`);
-    if (!res.ok) throw new Error('Failed to fetch risk data');
-    return res.json();
+    return fetchTable('/api/risk/genre', 'Failed to fetch risk data');
   },
 
   async getRiskAnalysis() {
@@ -115,8 +132,15 @@ export const api = {
   },
 
   // Combinations endpoint
-  async getGenreCombinations() {
-    const res = await fetch(`${API_BASE_URL}/api/combinations`);
+  async getGenreCombinations(options: { mode?: string, limit?: number, minSupport?: number, sortBy?: string, order?: string } = {}) {
+    const params = new URLSearchParams();
+    if (options.mode) params.append('mode', options.mode);
+    if (options.limit !== undefined) params.append('limit', options.limit.toString());
+    if (options.minSupport) params.append('min_support', options.minSupport.toString());
+    if (options.sortBy) params.append('sort_by', options.sortBy);
+    if (options.order) params.append('order', options.order);
+
+    const res = await fetch(`${API_BASE_URL}/api/combinations?${params}`);
     if (!res.ok) throw new Error('Failed to fetch genre combinations');
     return res.json();
   },
@@ -132,6 +156,22 @@ export const api = {
     return res.json();
   },
 
+  // Simulator outputs over budget/runtime/release-month ranges in one request, for local scrubbing
+  async sweepInvestment(data: {
+    genre: string; budget: number; runtime: number; release_month: number;
+    budget_range?: { min: number; max: number; steps: number; log?: boolean };
+    runtime_range?: { min: number; max: number; steps: number };
+    release_month_range?: { min: number; max: number; steps: number };
+  }) {
+    const res = await fetch(`${API_BASE_URL}/api/predict/simulator/sweep`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(data),
+    });
+    if (!res.ok) throw new Error('Failed to compute sensitivity grid');
+    return res.json();
+  },
+
   async predictMovie(data: {
     genre: string;
     budget: number;
@@ -228,5 +268,64 @@ export const api = {
     );
     if (!res.ok) throw new Error('Failed to fetch benchmark data');
     return res.json();
+  },
+
+  // Portfolio endpoints
+  async getEfficientFrontier(body: { points?: number; max_weight?: number; caps?: Record<string, number>; genres?: string[] } = {}) {
+    const res = await fetch(`${API_BASE_URL}/api/portfolio/frontier`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body),
+    });
+    if (!res.ok) throw new Error('Failed to fetch efficient frontier');
+    return res.json();
+  },
+
+  async optimizePortfolio(body: {
+    objective?: 'max_sharpe' | 'mean_variance' | 'min_variance' | 'min_cvar';
+    max_weight?: number; caps?: Record<string, number>; genres?: string[];
+    risk_aversion?: number; confidence?: number; budget?: number;
+  } = {}) {
+    const res = await fetch(`${API_BASE_URL}/api/portfolio/optimize`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body),
+    });
+    if (!res.ok) throw new Error('Failed to optimize portfolio');
+    return res.json();
+  },
+
+  // Monte Carlo simulation of a genre allocation; onUpdate receives each NDJSON line
+  // (plan, progress..., result) as it streams in, and the final result is returned
+  async simulatePortfolio(
+    body: { allocation: Record<string, number>; films?: number; paths?: number; seed?: number; budget?: number; confidence?: number },
+    onUpdate?: (message: any) => void,
+    signal?: AbortSignal
+  ) {
+    const res = await fetch(`${API_BASE_URL}/api/portfolio/simulate`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body),
+      signal,
+    });
+    if (!res.ok || !res.body) throw new Error('Failed to run portfolio simulation');
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+    let result = null;
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffered += decoder.decode(value, { stream: true });
+      const lines = buffered.split('\n');
+      buffered = lines.pop() ?? '';
+      for (const line of lines.filter(Boolean)) {
+        const message = JSON.parse(line);
+        if (message.type === 'error') throw new Error(message.detail);
+        if (message.type === 'result') result = message;
+        onUpdate?.(message);
+      }
+    }
+    return result;
   }
 };